@@ -0,0 +1,781 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+from openai import AsyncOpenAI
+from config import Config
+from nova_client import (Deadline, DeadlineExceeded, NovaClient, RunTimeoutError, TimeoutResult,
+                         build_async_http_client, timeout_errors)
+from nova_credentials import resolve_api_key, resolve_assistant_id
+from nova_metrics import UsageTracker, process_usage
+from nova_prompt import PromptBuilder
+from nova_scheduler import RequestScheduler, process_scheduler
+
+
+class AsyncNovaClient:
+    """
+    An asyncio client for the NOVA OpenAI Assistant, built on AsyncOpenAI.
+
+    Mirrors the NovaClient surface with awaitable methods. Several clients can
+    share one AsyncOpenAI instance (and its connection pool) so that many
+    conversations run concurrently on a single event loop:
+
+        base = AsyncNovaClient()
+        conversations = [base.new_conversation() for _ in range(100)]
+        replies = await asyncio.gather(*(c.send_message(p) for c, p in zip(conversations, prompts)))
+    """
+
+    TERMINAL_RUN_STATUSES = NovaClient.TERMINAL_RUN_STATUSES
+
+    def __init__(self, api_key: Optional[str] = None, assistant_id: Optional[str] = None,
+                 base_url: Optional[str] = None, use_streaming_runs: bool = Config.RUN_STREAMING,
+                 client: Optional[AsyncOpenAI] = None, scheduler: Optional[RequestScheduler] = None):
+        """
+        Initialize the async NOVA client.
+
+        Args:
+            api_key (str, optional): OpenAI API key. Resolved like NovaClient when not provided.
+            assistant_id (str, optional): OpenAI Assistant ID. Resolved like NovaClient when not provided.
+            base_url (str, optional): Alternative API endpoint, e.g. a local fake OpenAI server.
+            use_streaming_runs (bool): Consume the run event stream instead of polling run status.
+            client (AsyncOpenAI, optional): Existing client whose connection pool should be shared.
+            scheduler (RequestScheduler, optional): Rate limits and retries applied to every request.
+                                                  Defaults to the process-wide one in nova_scheduler,
+                                                  so async and sync traffic share one budget.
+        """
+        self.api_key = api_key if client is not None else resolve_api_key(api_key)
+        self.base_url = base_url or Config.OPENAI_BASE_URL
+
+        self.scheduler = scheduler if scheduler is not None else process_scheduler
+        if client is not None:
+            self.client = client
+        else:
+            client_options = {"api_key": self.api_key}
+            if self.base_url:
+                client_options["base_url"] = self.base_url
+            # Requests share the scheduler, which also takes over the SDK's retries
+            http_client = build_async_http_client(self.scheduler)
+            if http_client is not None:
+                client_options["http_client"] = http_client
+                client_options["max_retries"] = 0
+            self.client = AsyncOpenAI(**client_options)
+
+        self.use_streaming_runs = use_streaming_runs
+        self.assistant_name = "NOVA"
+        self.assistant_id = resolve_assistant_id(assistant_id)
+
+        # Static prompt prefix, built once so it is byte-identical across requests
+        self.prompt_builder = PromptBuilder.from_config(f"You are {self.assistant_name}, a helpful AI assistant.")
+
+        # Initialize thread for conversations
+        self.thread_id = None
+
+        # Token and cost counters for this conversation
+        self.usage = UsageTracker()
+
+        # Most recent health check result per mode, and checks in flight
+        self._health_results: Dict[str, tuple] = {}
+        self._health_flights: Dict[str, asyncio.Future] = {}
+
+        # Timing of the most recent assistant run and streamed reply
+        self.last_run_stats: Dict[str, Any] = {}
+        self.last_stream_stats: Dict[str, Any] = {}
+
+    def new_conversation(self) -> "AsyncNovaClient":
+        """
+        Create another conversation that shares this client's connection pool.
+
+        Returns:
+            AsyncNovaClient with its own thread and the same AsyncOpenAI client
+        """
+        return AsyncNovaClient(
+            api_key=self.api_key,
+            assistant_id=self.assistant_id,
+            base_url=self.base_url,
+            use_streaming_runs=self.use_streaming_runs,
+            client=self.client,
+            scheduler=self.scheduler
+        )
+
+    async def close(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    async def __aenter__(self) -> "AsyncNovaClient":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def health_check(self, mode: str = "ready", max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Check if the NOVA client is properly configured and can connect to OpenAI.
+
+        Args:
+            mode (str): "live" only checks local configuration, "ready" checks API and
+                        assistant access without generating tokens, and "deep" sends a real
+                        (billable) chat completion as well
+            max_age (float, optional): Reuse a previous result of the same mode that is at most
+                                       this many seconds old. Defaults to
+                                       Config.HEALTH_CHECK_INTERVAL for "ready" and 0 for "deep".
+
+        Returns:
+            Dict containing health status, configuration info and per-dependency latency
+        """
+        if mode == "live":
+            return {
+                "status": "healthy",
+                "mode": mode,
+                "assistant_name": self.assistant_name,
+                "assistant_id": self.assistant_id,
+                "api_connected": None,
+                "checks": {},
+                "cached": False
+            }
+        if mode not in ("ready", "deep"):
+            raise ValueError(f"Unknown health check mode: {mode}")
+
+        if max_age is None:
+            max_age = Config.HEALTH_CHECK_INTERVAL if mode == "ready" else 0
+
+        cached = self._health_results.get(mode)
+        if cached is not None and time.monotonic() - cached[1] <= max_age:
+            return dict(cached[0], cached=True)
+
+        # Concurrent probes (e.g. from several load balancers) share one check
+        flight = self._health_flights.get(mode)
+        if flight is None:
+            flight = self._health_flights[mode] = asyncio.ensure_future(self._run_health_check(mode))
+            flight.add_done_callback(lambda _: self._health_flights.pop(mode, None))
+        return dict(await asyncio.shield(flight))
+
+    async def _run_health_check(self, mode: str) -> Dict[str, Any]:
+        """
+        Probe each dependency concurrently, timing it, and cache the combined result.
+
+        Args:
+            mode (str): "ready" or "deep", see health_check
+
+        Returns:
+            Dict containing health status and per-dependency results
+        """
+        checks = {}
+
+        async def probe(name, call):
+            started = time.perf_counter()
+            try:
+                value = await call
+                checks[name] = {"ok": True, "latency_ms": (time.perf_counter() - started) * 1000}
+                return value
+            except Exception as e:
+                checks[name] = {"ok": False, "latency_ms": (time.perf_counter() - started) * 1000, "error": str(e)}
+                return None
+
+        if mode == "deep":
+            # Test basic API connection with a real completion
+            api = self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "Hello"}],
+                max_tokens=10
+            )
+        else:
+            # Retrieving a model proves credentials and connectivity without generating tokens
+            api = self.client.models.retrieve(Config.DEFAULT_MODEL)
+        _, assistant = await asyncio.gather(
+            probe("api", api),
+            probe("assistant", self.client.beta.assistants.retrieve(self.assistant_id))
+        )
+
+        healthy = all(check["ok"] for check in checks.values())
+        result = {
+            "status": "healthy" if healthy else "unhealthy",
+            "mode": mode,
+            "assistant_name": assistant.name if assistant is not None else self.assistant_name,
+            "assistant_id": self.assistant_id,
+            "api_connected": checks["api"]["ok"],
+            "checks": checks,
+            "cached": False
+        }
+        if assistant is not None:
+            result["model"] = assistant.model
+        if not healthy:
+            result["error"] = "; ".join(
+                f"{name}: {check['error']}" for name, check in checks.items() if not check["ok"]
+            )
+
+        self._health_results[mode] = (result, time.monotonic())
+        return result
+
+    async def get_or_create_assistant(self) -> str:
+        """
+        Get the existing assistant or create a new one if it doesn't exist.
+
+        Returns:
+            str: The assistant ID
+        """
+        try:
+            assistant = await self.client.beta.assistants.retrieve(self.assistant_id)
+            return assistant.id
+        except Exception:
+            assistant = await self.client.beta.assistants.create(
+                name=self.assistant_name,
+                instructions=f"You are {self.assistant_name}, a helpful AI assistant. You are knowledgeable, friendly, and always ready to help with any questions or tasks.",
+                model="gpt-4o-mini",
+                tools=[{"type": "code_interpreter"}]
+            )
+            return assistant.id
+
+    async def create_thread(self, deadline: Optional[Deadline] = None) -> str:
+        """
+        Create a new conversation thread.
+
+        Args:
+            deadline (Deadline, optional): Time budget of the request creating the thread
+
+        Returns:
+            str: The thread ID
+        """
+        thread = await self.client.beta.threads.create(**(deadline.options() if deadline is not None else {}))
+        self.thread_id = thread.id
+        return thread.id
+
+    async def list_assistants(self) -> List[Dict[str, Any]]:
+        """
+        List all available assistants.
+
+        Returns:
+            List of assistant information
+        """
+        try:
+            assistants = await self.client.beta.assistants.list()
+            return [
+                {
+                    "id": assistant.id,
+                    "name": assistant.name,
+                    "model": assistant.model,
+                    "created_at": assistant.created_at
+                }
+                for assistant in assistants.data
+            ]
+        except Exception as e:
+            print(f"Error listing assistants: {e}")
+            return []
+
+    async def set_assistant_by_id(self, assistant_id: str) -> bool:
+        """
+        Set the assistant by ID.
+
+        Args:
+            assistant_id (str): The assistant ID to use
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            await self.client.beta.assistants.retrieve(assistant_id)
+            self.assistant_id = assistant_id
+            return True
+        except Exception as e:
+            print(f"Error setting assistant: {e}")
+            return False
+
+    async def get_assistant_info(self) -> Optional[Dict[str, Any]]:
+        """
+        Get information about the current assistant.
+
+        Returns:
+            Dict containing assistant information or None if error
+        """
+        try:
+            assistant = await self.client.beta.assistants.retrieve(self.assistant_id)
+            return {
+                "id": assistant.id,
+                "name": assistant.name,
+                "model": assistant.model,
+                "instructions": assistant.instructions,
+                "created_at": assistant.created_at
+            }
+        except Exception as e:
+            print(f"Error getting assistant info: {e}")
+            return None
+
+    async def _run_assistant(self, thread_id: str, deadline: Optional[Deadline] = None):
+        """
+        Start a run on a thread and wait until it reaches a terminal status.
+
+        If the deadline passes, or the task is cancelled while waiting, the run
+        is cancelled upstream so it stops consuming tokens and releases the thread.
+
+        Args:
+            thread_id (str): The thread to run the assistant on
+            deadline (Deadline, optional): Time budget of the request; Config.TIMEOUT from now by default
+
+        Returns:
+            The final run object
+
+        Raises:
+            RunTimeoutError: If the deadline passes before the run finishes
+        """
+        deadline = deadline or Deadline()
+        started = time.perf_counter()
+        mode = "poll"
+        run = None
+
+        try:
+            if self.use_streaming_runs:
+                stream = await self.client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=self.assistant_id,
+                    stream=True,
+                    **deadline.options()
+                )
+                mode = "stream"
+                async for kind, value in self._iter_run_stream(stream, deadline):
+                    if kind == "run":
+                        run = value
+
+            if run is None:
+                run = await self.client.beta.threads.runs.create(
+                    thread_id=thread_id,
+                    assistant_id=self.assistant_id,
+                    **deadline.options()
+                )
+
+            run, polls = await self._poll_run(thread_id, run, deadline)
+        except timeout_errors() as e:
+            result = await self._abandon_run(thread_id, run, deadline)
+            self.last_run_stats = {
+                "mode": mode,
+                "wall_time": time.perf_counter() - started,
+                "status": "timed_out",
+                "run_id": result.run_id,
+                "timeout": result
+            }
+            raise RunTimeoutError(result) from e
+        except BaseException:
+            # Failed, or the task was cancelled: do not leave the run going upstream
+            await self._abandon_run(thread_id, run, deadline)
+            raise
+
+        self._record_usage(run.model, run.usage)
+
+        self.last_run_stats = {
+            "mode": mode,
+            "polls": polls,
+            "wall_time": time.perf_counter() - started,
+            "status": run.status,
+            "run_id": run.id
+        }
+        return run
+
+    async def _abandon_run(self, thread_id: Optional[str], run, deadline: Deadline) -> TimeoutResult:
+        """
+        Cancel a run that is still queued or in progress and describe how far it got.
+
+        Args:
+            thread_id (str): The thread the run belongs to
+            run: The last run object seen, or None if the run was not started
+            deadline (Deadline): The request's deadline
+
+        Returns:
+            TimeoutResult: Run details and whether it was cancelled
+        """
+        cancelled = False
+        if run is not None and run.status in ('queued', 'in_progress'):
+            try:
+                await self.client.beta.threads.runs.cancel(
+                    thread_id=thread_id,
+                    run_id=run.id,
+                    timeout=Config.RUN_CANCEL_TIMEOUT
+                )
+                cancelled = True
+            except Exception as e:
+                print(f"Error cancelling run: {e}")
+        return TimeoutResult(
+            thread_id=thread_id,
+            run_id=run.id if run is not None else None,
+            status=run.status if run is not None else None,
+            elapsed=deadline.elapsed(),
+            timeout=deadline.timeout,
+            cancelled=cancelled
+        )
+
+    async def _iter_run_stream(self, stream, deadline: Optional[Deadline] = None) -> AsyncIterator[tuple]:
+        """
+        Translate a run event stream into ``("delta", text)`` and ``("run", run)`` items.
+
+        Args:
+            stream: The async event stream returned by ``runs.create(stream=True)``
+            deadline (Deadline, optional): Stop with DeadlineExceeded once it has passed
+        """
+        try:
+            async for event in stream:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"Deadline of {deadline.timeout:g}s exceeded")
+                name = getattr(event, "event", "")
+                if name == "thread.message.delta":
+                    for part in event.data.delta.content or []:
+                        text = getattr(part, "text", None)
+                        if text is not None and text.value:
+                            yield "delta", text.value
+                elif name.startswith("thread.run.") and not name.startswith("thread.run.step."):
+                    yield "run", event.data
+                    if event.data.status in self.TERMINAL_RUN_STATUSES:
+                        break
+        finally:
+            await stream.close()
+
+    async def _poll_run(self, thread_id: str, run, deadline: Optional[Deadline] = None):
+        """
+        Poll a run until it leaves the queued/in-progress states, with adaptive backoff.
+
+        Args:
+            thread_id (str): The thread the run belongs to
+            run: The run object to poll
+            deadline (Deadline, optional): Time budget of the request; Config.TIMEOUT from now by default
+
+        Returns:
+            Tuple of (final run object, number of polls made)
+
+        Raises:
+            DeadlineExceeded: If the run is still going when the deadline passes
+        """
+        deadline = deadline or Deadline()
+        polls = 0
+        interval = Config.RUN_POLL_INITIAL_INTERVAL
+        while run.status in ['queued', 'in_progress', 'cancelling']:
+            await asyncio.sleep(min(interval, deadline.remaining()))
+            interval = min(interval * Config.RUN_POLL_BACKOFF, Config.RUN_POLL_MAX_INTERVAL)
+            run = await self.client.beta.threads.runs.retrieve(
+                thread_id=thread_id,
+                run_id=run.id,
+                **deadline.options()
+            )
+            polls += 1
+        return run, polls
+
+    async def _latest_assistant_reply(self, thread_id: str, deadline: Optional[Deadline] = None) -> Optional[str]:
+        messages = await self.client.beta.threads.messages.list(
+            thread_id=thread_id,
+            **(deadline.options() if deadline is not None else {})
+        )
+        for msg in messages.data:
+            if msg.role == "assistant":
+                return msg.content[0].text.value
+        return None
+
+    async def _send_message_to_assistant(self, message: str) -> Any:
+        """
+        Send a message to the specific assistant using the Assistants API.
+
+        Args:
+            message (str): The message to send
+
+        Returns:
+            str: The assistant's response, or a TimeoutResult if the deadline passed
+        """
+        deadline = Deadline()
+        run = None
+        try:
+            if not self.thread_id:
+                await self.create_thread(deadline)
+
+            await self.client.beta.threads.messages.create(
+                thread_id=self.thread_id,
+                role="user",
+                content=message,
+                **deadline.options()
+            )
+
+            run = await self._run_assistant(self.thread_id, deadline)
+
+            if run.status == 'completed':
+                reply = await self._latest_assistant_reply(self.thread_id, deadline)
+                return reply if reply is not None else "No response received from assistant."
+            else:
+                return f"Assistant run failed with status: {run.status}"
+
+        except RunTimeoutError as e:
+            return e.result
+        except timeout_errors():
+            return await self._abandon_run(self.thread_id, run, deadline)
+        except Exception as e:
+            return f"Error communicating with assistant: {str(e)}"
+
+    async def _send_message_to_chat(self, message: str, model: str = "gpt-4o-mini", temperature: float = 0.7) -> str:
+        """
+        Send a message using the Chat Completions API.
+
+        Returns:
+            str: The assistant's response
+        """
+        try:
+            response = await self.client.chat.completions.create(
+                model=model,
+                messages=self.prompt_builder.build(message),
+                temperature=temperature,
+                **self.prompt_builder.request_options()
+            )
+
+            self._record_usage(response.model or model, response.usage)
+            return response.choices[0].message.content
+
+        except Exception as e:
+            return f"Error communicating with chat API: {str(e)}"
+
+    async def send_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7) -> Any:
+        """
+        Send a message to NOVA.
+
+        Args:
+            message (str): The message to send
+            use_assistant (bool): Whether to use the specific assistant or general chat
+            model (str): The model to use (for chat completions)
+            temperature (float): The temperature setting (for chat completions)
+
+        Returns:
+            The assistant's response as a string, or a TimeoutResult if an assistant
+            run missed its deadline (Config.TIMEOUT) and was cancelled
+        """
+        if use_assistant:
+            return await self._send_message_to_assistant(message)
+        else:
+            return await self._send_message_to_chat(message, model, temperature)
+
+    async def stream_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7) -> AsyncIterator[str]:
+        """
+        Send a message to NOVA and yield the response token by token.
+
+        Args:
+            message (str): The message to send
+            use_assistant (bool): Whether to use the specific assistant or general chat
+            model (str): The model to use (for chat completions)
+            temperature (float): The temperature setting (for chat completions)
+
+        Yields:
+            str: Text deltas of the assistant's response
+        """
+        deadline = Deadline()
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        run = None
+        try:
+            if use_assistant:
+                if not self.thread_id:
+                    await self.create_thread(deadline)
+                await self.client.beta.threads.messages.create(
+                    thread_id=self.thread_id,
+                    role="user",
+                    content=message,
+                    **deadline.options()
+                )
+                stream = await self.client.beta.threads.runs.create(
+                    thread_id=self.thread_id,
+                    assistant_id=self.assistant_id,
+                    stream=True,
+                    **deadline.options()
+                )
+                async for kind, value in self._iter_run_stream(stream, deadline):
+                    if kind == "run":
+                        run = value
+                        continue
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
+                    chunks += 1
+                    yield value
+
+                if run is None:
+                    yield "No response received from assistant."
+                    return
+                run, _ = await self._poll_run(self.thread_id, run, deadline)
+                self._record_usage(run.model, run.usage)
+                if run.status != 'completed':
+                    yield f"Assistant run failed with status: {run.status}"
+                elif first_token_at is None:
+                    reply = await self._latest_assistant_reply(self.thread_id, deadline)
+                    if reply is not None:
+                        first_token_at = time.perf_counter()
+                        yield reply
+            else:
+                stream = await self.client.chat.completions.create(
+                    model=model,
+                    messages=self.prompt_builder.build(message),
+                    temperature=temperature,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    **self.prompt_builder.request_options()
+                )
+                usage = None
+                try:
+                    async for chunk in stream:
+                        # The final chunk carries usage and no choices
+                        if getattr(chunk, "usage", None) is not None:
+                            usage = chunk.usage
+                        if not chunk.choices:
+                            continue
+                        text = chunk.choices[0].delta.content
+                        if text:
+                            if first_token_at is None:
+                                first_token_at = time.perf_counter()
+                            chunks += 1
+                            yield text
+                finally:
+                    await stream.close()
+                self._record_usage(model, usage)
+
+        except timeout_errors() as e:
+            if not use_assistant:
+                yield f"Error communicating with chat API: {str(e)}"
+            else:
+                yield str(await self._abandon_run(self.thread_id, run, deadline))
+        except (GeneratorExit, asyncio.CancelledError):
+            # The caller stopped reading or the task was cancelled; stop the run as well
+            if use_assistant:
+                await self._abandon_run(self.thread_id, run, deadline)
+            raise
+        except Exception as e:
+            if use_assistant:
+                await self._abandon_run(self.thread_id, run, deadline)
+            api = "assistant" if use_assistant else "chat API"
+            yield f"Error communicating with {api}: {str(e)}"
+        finally:
+            self.last_stream_stats = {
+                "mode": "assistant" if use_assistant else "chat",
+                "ttft": first_token_at - started if first_token_at else None,
+                "total_time": time.perf_counter() - started,
+                "chunks": chunks
+            }
+
+    def clear_conversation(self):
+        """Clear the current conversation thread."""
+        self.thread_id = None
+
+    async def iter_conversation_history(self, order: str = "asc") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over the conversation history of the current thread, page by page.
+
+        Args:
+            order (str): "asc" for oldest first, "desc" for newest first
+
+        Yields:
+            Conversation messages as role/content/timestamp dicts
+        """
+        if not self.thread_id:
+            return
+
+        async for msg in self.client.beta.threads.messages.list(thread_id=self.thread_id, order=order, limit=100):
+            if msg.role in ["user", "assistant"]:
+                content = msg.content[0].text.value if msg.content else ""
+                yield {
+                    "role": msg.role,
+                    "content": content,
+                    "timestamp": msg.created_at
+                }
+
+    async def get_conversation_history(self) -> List[Dict[str, str]]:
+        """
+        Get the conversation history from the current thread.
+
+        Returns:
+            List of conversation messages, newest first
+        """
+        try:
+            return [msg async for msg in self.iter_conversation_history(order="desc")]
+        except Exception as e:
+            print(f"Error getting conversation history: {e}")
+            return []
+
+    async def export_conversation(self, filename: str = None) -> str:
+        """
+        Export the conversation history to a file.
+
+        Supports the same formats as NovaClient.export_conversation: ``.jsonl``
+        (optionally ``.jsonl.gz``) files are written one message per line,
+        oldest first, while pages are still being fetched; ``.json`` files keep
+        the legacy single-document format.
+
+        Args:
+            filename (str): The filename to save to (optional, defaults to a timestamped .jsonl)
+
+        Returns:
+            str: The filename where the conversation was saved
+        """
+        if not filename:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            filename = f"nova_conversation_{timestamp}.jsonl"
+
+        if not NovaClient._is_jsonl(filename):
+            history = await self.get_conversation_history()
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=2, ensure_ascii=False)
+            return filename
+
+        with NovaClient._open_text(filename, 'w') as f:
+            async for msg in self.iter_conversation_history(order="asc"):
+                f.write(json.dumps(msg, ensure_ascii=False))
+                f.write("\n")
+
+        return filename
+
+    async def import_conversation(self, filename: str, overflow: str = "append") -> bool:
+        """
+        Import a conversation history from a JSON or JSONL file.
+
+        Like NovaClient.import_conversation, the new thread is created together
+        with its messages in a single request, and histories longer than
+        ``Config.THREAD_SEED_MESSAGE_LIMIT`` are handled according to ``overflow``.
+
+        Args:
+            filename (str): The filename to load from
+            overflow (str): "append" (the default) keeps every message as-is and adds the ones
+                            beyond the limit one request at a time, so the import round-trips;
+                            "pack" folds the oldest messages into transcript messages so the
+                            import stays a single request, at the cost of rewriting them
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            messages, remaining = NovaClient._seed_messages(NovaClient._load_history(filename), overflow)
+
+            # Create the thread already seeded with the history
+            thread = await self.client.beta.threads.create(messages=messages)
+            self.thread_id = thread.id
+
+            for msg in remaining:
+                await self.client.beta.threads.messages.create(
+                    thread_id=thread.id,
+                    role=msg["role"],
+                    content=msg["content"]
+                )
+
+            return True
+
+        except Exception as e:
+            print(f"Error importing conversation: {e}")
+            return False
+
+    def _record_usage(self, model: Optional[str], usage: Any):
+        """Add one request to this conversation's and the process-wide usage counters."""
+        self.usage.record(model, usage)
+        process_usage.record(model, usage)
+
+    async def get_usage_stats(self) -> Dict[str, Any]:
+        """
+        Get usage statistics for the current session.
+
+        Returns:
+            Dict containing usage statistics, with process-wide totals under "process"
+        """
+        stats = self.usage.snapshot()
+        stats["process"] = process_usage.snapshot()
+        return stats
+
+    def __str__(self) -> str:
+        """String representation of the async NOVA client."""
+        return f"AsyncNovaClient(assistant_id={self.assistant_id}, thread_id={self.thread_id})"
+
+    def __repr__(self) -> str:
+        """Detailed string representation of the async NOVA client."""
+        return f"AsyncNovaClient(assistant_id={self.assistant_id}, thread_id={self.thread_id}, api_connected={self.client is not None})"
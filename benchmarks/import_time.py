@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for NovaClient.
+
+Runs each stage in a fresh interpreter and reports its wall time, peak
+resident memory and which heavy dependencies it loaded, as JSON. With
+--compare the same stages are measured on another git revision, so the
+effect of import changes can be seen side by side.
+
+Stages:
+    interpreter  Python start-up alone, the floor for the others
+    import       ``import nova_client``, e.g. a worker that only needs its types
+    client       Importing and constructing a NovaClient (no network calls)
+    streamlit    ``import streamlit``, for reference
+
+Usage:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 10 --compare HEAD~1 --output imports.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+STAGES = {
+    "interpreter": "pass",
+    "import": "import nova_client",
+    "client": "import nova_client; nova_client.NovaClient(api_key='sk-benchmark')",
+    "streamlit": "import streamlit",
+}
+
+HEAVY_MODULES = ("openai", "httpx", "streamlit", "pandas", "numpy", "pyarrow")
+
+# Runs in the child: times the stage, then reports peak RSS and loaded modules
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+exec(compile(sys.argv[1], "<stage>", "exec"))
+seconds = time.perf_counter() - started
+try:
+    import resource
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_kb = max_rss // 1024 if sys.platform == "darwin" else max_rss
+except ImportError:
+    max_rss_kb = None
+heavy = [name for name in sys.argv[2].split(",") if name in sys.modules]
+print(json.dumps({"seconds": seconds, "max_rss_kb": max_rss_kb, "modules": len(sys.modules), "heavy": heavy}))
+"""
+
+
+def git_revision(rev: str = "HEAD") -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", rev], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_stage(code: str, cwd: str) -> Dict[str, Any]:
+    """Measure one stage in a fresh interpreter, including its start-up."""
+    env = dict(os.environ, PYTHONPATH=cwd, OPENAI_API_KEY="sk-benchmark",
+               OPENAI_ASSISTANT_ID="asst_benchmark", NOVA_THREAD_POOL_SIZE="0")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD, code, ",".join(HEAVY_MODULES)],
+        cwd=cwd, env=env, capture_output=True, text=True
+    )
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "failed"}
+    measurement = json.loads(result.stdout.strip().splitlines()[-1])
+    measurement["process_seconds"] = total
+    return measurement
+
+
+def bench_stages(cwd: str, stages: List[str], repeat: int) -> Dict[str, Any]:
+    results = {}
+    for stage in stages:
+        runs = [run_stage(STAGES[stage], cwd) for _ in range(repeat)]
+        errors = [run["error"] for run in runs if "error" in run]
+        if errors:
+            results[stage] = {"error": errors[0]}
+            continue
+        results[stage] = {
+            "median_seconds": statistics.median(run["seconds"] for run in runs),
+            "median_process_seconds": statistics.median(run["process_seconds"] for run in runs),
+            "max_rss_mb": (statistics.median(run["max_rss_kb"] for run in runs) / 1024
+                           if runs[0]["max_rss_kb"] is not None else None),
+            "modules": runs[0]["modules"],
+            "heavy_modules": runs[0]["heavy"]
+        }
+    return results
+
+
+def extract_revision(rev: str, target: str):
+    """Write the tree of ``rev`` to ``target`` without touching the working copy."""
+    archive = subprocess.run(["git", "archive", "--format=tar", rev], cwd=ROOT, capture_output=True, check=True)
+    with tempfile.TemporaryFile() as f:
+        f.write(archive.stdout)
+        f.seek(0)
+        with tarfile.open(fileobj=f) as tar:
+            tar.extractall(target)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure NovaClient cold-start time and memory.")
+    parser.add_argument("--stages", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per stage")
+    parser.add_argument("--compare", metavar="REV", help="Also measure this git revision, e.g. HEAD~1")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args)
+        },
+        "results": {}
+    }
+
+    print("Measuring working tree...", file=sys.stderr)
+    report["results"]["current"] = bench_stages(ROOT, args.stages, args.repeat)
+    if args.compare:
+        print(f"Measuring {args.compare}...", file=sys.stderr)
+        with tempfile.TemporaryDirectory() as target:
+            extract_revision(args.compare, target)
+            report["results"][git_revision(args.compare)] = bench_stages(target, args.stages, args.repeat)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
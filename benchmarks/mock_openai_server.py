@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenAI Chat Completions and Assistants endpoints.
+
+Used by the benchmark suite so NovaClient can be measured without spending
+money against the live API. Latency, run queueing time and error rates are
+configurable.
+
+Usage:
+    python benchmarks/mock_openai_server.py --port 8765 --latency 0.02 --run-time 0.3
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 python run_streamlit.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class MockSettings:
+    """Behaviour knobs for the mock server."""
+    latency: float = 0.0          # Added to every HTTP response
+    run_time: float = 0.2         # Time a run spends queued/in progress
+    error_rate: float = 0.0       # Fraction of requests answered with HTTP 500
+    rate_limit_rate: float = 0.0  # Fraction of requests answered with HTTP 429
+    retry_after: float = 0.1      # Retry-After sent with 429 responses
+    token_delay: float = 0.0      # Delay between streamed deltas
+    chunks: int = 8               # Number of deltas per streamed reply
+
+
+class MockState:
+    """In-memory assistants, threads, messages and runs."""
+
+    def __init__(self, settings: MockSettings):
+        self.settings = settings
+        self.lock = threading.Lock()
+        self.assistants: Dict[str, Dict[str, Any]] = {}
+        self.threads: Dict[str, Dict[str, Any]] = {}
+        self.messages: Dict[str, List[Dict[str, Any]]] = {}
+        self.runs: Dict[str, Dict[str, Any]] = {}
+        self.request_counts: Dict[str, int] = {}
+        self.clock = 0
+
+    def count(self, key: str):
+        with self.lock:
+            self.request_counts[key] = self.request_counts.get(key, 0) + 1
+
+    def timestamp(self) -> int:
+        # Strictly increasing so message ordering is deterministic
+        with self.lock:
+            self.clock = max(self.clock + 1, int(time.time()))
+            return self.clock
+
+    def assistant(self, assistant_id: str) -> Dict[str, Any]:
+        with self.lock:
+            if assistant_id not in self.assistants:
+                self.assistants[assistant_id] = {
+                    "id": assistant_id,
+                    "object": "assistant",
+                    "created_at": int(time.time()),
+                    "name": "NOVA",
+                    "description": None,
+                    "model": "gpt-4o-mini",
+                    "instructions": "You are NOVA, an AI message crafter.",
+                    "tools": [],
+                    "metadata": {},
+                    "top_p": 1.0,
+                    "temperature": 1.0,
+                    "response_format": "auto"
+                }
+            return self.assistants[assistant_id]
+
+    def new_thread(self) -> Dict[str, Any]:
+        thread = {
+            "id": f"thread_{uuid.uuid4().hex[:24]}",
+            "object": "thread",
+            "created_at": int(time.time()),
+            "metadata": {},
+            "tool_resources": None
+        }
+        with self.lock:
+            self.threads[thread["id"]] = thread
+            self.messages[thread["id"]] = []
+        return thread
+
+    def add_message(self, thread_id: str, role: str, content: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+        message = {
+            "id": f"msg_{uuid.uuid4().hex[:24]}",
+            "object": "thread.message",
+            "created_at": self.timestamp(),
+            "thread_id": thread_id,
+            "role": role,
+            "content": [{"type": "text", "text": {"value": content, "annotations": []}}],
+            "assistant_id": None,
+            "run_id": run_id,
+            "attachments": [],
+            "metadata": {},
+            "status": "completed",
+            "incomplete_details": None,
+            "completed_at": None,
+            "incomplete_at": None
+        }
+        with self.lock:
+            self.messages[thread_id].append(message)
+        return message
+
+
+def reply_for(prompt: str) -> str:
+    """Build a deterministic NOVA-style payload for a prompt."""
+    topic = (prompt or "your campaign").strip().splitlines()[0][:60]
+    return json.dumps({
+        "messages": [
+            {"message": f"Variant A for {topic}"},
+            {"message": f"Variant B for {topic}"}
+        ],
+        "cta": "Book a call today"
+    })
+
+
+def split_chunks(text: str, count: int) -> List[str]:
+    size = max(1, len(text) // max(1, count))
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+def usage_for(prompt_text: str, reply: str) -> Dict[str, Any]:
+    prompt_tokens = max(1, len(prompt_text) // 4)
+    completion_tokens = max(1, len(reply) // 4)
+    return {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "total_tokens": prompt_tokens + completion_tokens,
+        "prompt_tokens_details": {"cached_tokens": 0}
+    }
+
+
+def make_handler(state: MockState):
+    settings = state.settings
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        # -- plumbing -------------------------------------------------------
+
+        def _body(self) -> Dict[str, Any]:
+            length = int(self.headers.get("Content-Length") or 0)
+            if not length:
+                return {}
+            return json.loads(self.rfile.read(length) or b"{}")
+
+        def _send_json(self, payload: Any, status: int = 200, headers: Optional[Dict[str, str]] = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _start_sse(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+        def _sse(self, data: Any, event: Optional[str] = None):
+            lines = ""
+            if event:
+                lines += f"event: {event}\n"
+            lines += f"data: {data if isinstance(data, str) else json.dumps(data)}\n\n"
+            self.wfile.write(lines.encode("utf-8"))
+            self.wfile.flush()
+
+        def _injected_failure(self) -> bool:
+            roll = random.random()
+            if roll < settings.rate_limit_rate:
+                self._send_json(
+                    {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                    status=429,
+                    headers={"Retry-After": str(settings.retry_after)}
+                )
+                return True
+            if roll < settings.rate_limit_rate + settings.error_rate:
+                self._send_json({"error": {"message": "Injected server error", "type": "server_error"}}, status=500)
+                return True
+            return False
+
+        def _dispatch(self, method: str):
+            parsed = urlparse(self.path)
+            path = parsed.path.rstrip("/")
+            if path.startswith("/v1"):
+                path = path[3:]
+            query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+            body = self._body() if method == "POST" else {}
+
+            if settings.latency:
+                time.sleep(settings.latency)
+            route = re.sub(r"/(asst|thread|run|msg)_[A-Za-z0-9]+", r"/{\1}", path)
+            state.count(f"{method} {route}")
+            if self._injected_failure():
+                return
+
+            for pattern, handler_method, handler in ROUTES:
+                if handler_method != method:
+                    continue
+                match = re.fullmatch(pattern, path)
+                if match:
+                    return handler(self, body, query, *match.groups())
+            self._send_json({"error": {"message": f"No route for {method} {path}"}}, status=404)
+
+        def do_GET(self):
+            self._dispatch("GET")
+
+        def do_POST(self):
+            self._dispatch("POST")
+
+        def do_DELETE(self):
+            self._dispatch("DELETE")
+
+        # -- models ---------------------------------------------------------
+
+        def list_models(self, body, query):
+            self._send_json({"object": "list", "data": [
+                {"id": "gpt-4o-mini", "object": "model", "created": 0, "owned_by": "mock"}
+            ]})
+
+        def get_model(self, body, query, model_id):
+            self._send_json({"id": model_id, "object": "model", "created": 0, "owned_by": "mock"})
+
+        # -- chat completions -----------------------------------------------
+
+        def chat_completions(self, body, query):
+            messages = body.get("messages", [])
+            prompt = messages[-1]["content"] if messages else ""
+            prompt_text = "".join(str(m.get("content", "")) for m in messages)
+            reply = reply_for(prompt)
+            usage = usage_for(prompt_text, reply)
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            model = body.get("model", "gpt-4o-mini")
+
+            if not body.get("stream"):
+                return self._send_json({
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop"
+                    }],
+                    "usage": usage
+                })
+
+            self._start_sse()
+            base = {"id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": model}
+            for piece in split_chunks(reply, settings.chunks):
+                if settings.token_delay:
+                    time.sleep(settings.token_delay)
+                self._sse(dict(base, choices=[{"index": 0, "delta": {"content": piece}, "finish_reason": None}]))
+            self._sse(dict(base, choices=[{"index": 0, "delta": {}, "finish_reason": "stop"}]))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                self._sse(dict(base, choices=[], usage=usage))
+            self._sse("[DONE]")
+
+        # -- assistants -----------------------------------------------------
+
+        def list_assistants(self, body, query):
+            state.assistant("asst_XTd5ExJ9KUTLyrFkzkzPZa2f")
+            with state.lock:
+                data = list(state.assistants.values())
+            self._send_json({"object": "list", "data": data, "first_id": None, "last_id": None, "has_more": False})
+
+        def get_assistant(self, body, query, assistant_id):
+            self._send_json(state.assistant(assistant_id))
+
+        def create_assistant(self, body, query):
+            assistant = state.assistant(f"asst_{uuid.uuid4().hex[:24]}")
+            assistant.update({k: v for k, v in body.items() if k in ("name", "model", "instructions")})
+            self._send_json(assistant)
+
+        # -- threads and messages -------------------------------------------
+
+        def create_thread(self, body, query):
+            thread = state.new_thread()
+            for message in body.get("messages") or []:
+                state.add_message(thread["id"], message["role"], message["content"])
+            self._send_json(thread)
+
+        def delete_thread(self, body, query, thread_id):
+            with state.lock:
+                state.threads.pop(thread_id, None)
+                state.messages.pop(thread_id, None)
+            self._send_json({"id": thread_id, "object": "thread.deleted", "deleted": True})
+
+        def create_message(self, body, query, thread_id):
+            if thread_id not in state.messages:
+                return self._send_json({"error": {"message": "No thread found"}}, status=404)
+            self._send_json(state.add_message(thread_id, body["role"], body["content"]))
+
+        def list_messages(self, body, query, thread_id):
+            if thread_id not in state.messages:
+                return self._send_json({"error": {"message": "No thread found"}}, status=404)
+            with state.lock:
+                items = list(state.messages[thread_id])
+            if query.get("order", "desc") == "desc":
+                items.reverse()
+            ids = [m["id"] for m in items]
+            if query.get("after") in ids:
+                items = items[ids.index(query["after"]) + 1:]
+            elif query.get("before") in ids:
+                items = items[:ids.index(query["before"])]
+            if query.get("run_id"):
+                items = [m for m in items if m["run_id"] == query["run_id"]]
+            limit = int(query.get("limit", 20))
+            page = items[:limit]
+            self._send_json({
+                "object": "list",
+                "data": page,
+                "first_id": page[0]["id"] if page else None,
+                "last_id": page[-1]["id"] if page else None,
+                "has_more": len(items) > limit
+            })
+
+        # -- runs -----------------------------------------------------------
+
+        def _run_object(self, run: Dict[str, Any]) -> Dict[str, Any]:
+            elapsed = time.time() - run["started"]
+            if run["status"] in ("queued", "in_progress"):
+                if elapsed >= settings.run_time:
+                    self._complete_run(run)
+                elif elapsed >= settings.run_time / 2:
+                    run["status"] = "in_progress"
+            elif run["status"] == "cancelling":
+                run["status"] = "cancelled"
+            return {k: v for k, v in run.items() if k not in ("started", "prompt")}
+
+        def _complete_run(self, run: Dict[str, Any]):
+            with state.lock:
+                if run["status"] == "completed":
+                    return
+                run["status"] = "completed"
+                run["completed_at"] = int(time.time())
+            reply = reply_for(run["prompt"])
+            state.add_message(run["thread_id"], "assistant", reply, run_id=run["id"])
+            run["usage"] = usage_for(run["prompt"], reply)
+
+        def create_run(self, body, query, thread_id):
+            if thread_id not in state.messages:
+                return self._send_json({"error": {"message": "No thread found"}}, status=404)
+            with state.lock:
+                history = state.messages[thread_id]
+                prompt = next((m["content"][0]["text"]["value"] for m in reversed(history) if m["role"] == "user"), "")
+            assistant = state.assistant(body.get("assistant_id", "asst_mock"))
+            run = {
+                "id": f"run_{uuid.uuid4().hex[:24]}",
+                "object": "thread.run",
+                "created_at": int(time.time()),
+                "thread_id": thread_id,
+                "assistant_id": assistant["id"],
+                "status": "queued",
+                "model": assistant["model"],
+                "instructions": assistant["instructions"],
+                "tools": [],
+                "metadata": {},
+                "parallel_tool_calls": True,
+                "response_format": body.get("response_format", "auto"),
+                "usage": None,
+                "started": time.time(),
+                "prompt": prompt
+            }
+            with state.lock:
+                state.runs[run["id"]] = run
+
+            if not body.get("stream"):
+                return self._send_json(self._run_object(run))
+
+            self._start_sse()
+            self._sse(self._run_object(run), event="thread.run.created")
+            time.sleep(settings.run_time / 2)
+            run["status"] = "in_progress"
+            self._sse(self._run_object(run), event="thread.run.in_progress")
+            time.sleep(settings.run_time / 2)
+
+            reply = reply_for(prompt)
+            message_id = f"msg_{uuid.uuid4().hex[:24]}"
+            for piece in split_chunks(reply, settings.chunks):
+                if settings.token_delay:
+                    time.sleep(settings.token_delay)
+                self._sse({
+                    "id": message_id,
+                    "object": "thread.message.delta",
+                    "delta": {"content": [{"index": 0, "type": "text", "text": {"value": piece}}]}
+                }, event="thread.message.delta")
+            self._complete_run(run)
+            self._sse(self._run_object(run), event="thread.run.completed")
+            self._sse("[DONE]", event="done")
+
+        def get_run(self, body, query, thread_id, run_id):
+            run = state.runs.get(run_id)
+            if not run:
+                return self._send_json({"error": {"message": "No run found"}}, status=404)
+            self._send_json(self._run_object(run))
+
+        def cancel_run(self, body, query, thread_id, run_id):
+            run = state.runs.get(run_id)
+            if not run:
+                return self._send_json({"error": {"message": "No run found"}}, status=404)
+            if run["status"] in ("queued", "in_progress"):
+                run["status"] = "cancelling"
+            self._send_json(self._run_object(run))
+
+    ROUTES = [
+        (r"/models", "GET", Handler.list_models),
+        (r"/models/([^/]+)", "GET", Handler.get_model),
+        (r"/chat/completions", "POST", Handler.chat_completions),
+        (r"/assistants", "GET", Handler.list_assistants),
+        (r"/assistants", "POST", Handler.create_assistant),
+        (r"/assistants/([^/]+)", "GET", Handler.get_assistant),
+        (r"/threads", "POST", Handler.create_thread),
+        (r"/threads/([^/]+)", "DELETE", Handler.delete_thread),
+        (r"/threads/([^/]+)/messages", "POST", Handler.create_message),
+        (r"/threads/([^/]+)/messages", "GET", Handler.list_messages),
+        (r"/threads/([^/]+)/runs", "POST", Handler.create_run),
+        (r"/threads/([^/]+)/runs/([^/]+)", "GET", Handler.get_run),
+        (r"/threads/([^/]+)/runs/([^/]+)/cancel", "POST", Handler.cancel_run),
+    ]
+    return Handler
+
+
+class MockOpenAIServer:
+    """A threaded mock server that can be started and stopped from code."""
+
+    def __init__(self, settings: Optional[MockSettings] = None, host: str = "127.0.0.1", port: int = 0):
+        self.settings = settings or MockSettings()
+        self.state = MockState(self.settings)
+        self.httpd = ThreadingHTTPServer((host, port), make_handler(self.state))
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local mock OpenAI server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--run-time", type=float, default=0.2, help="Seconds a run stays queued/in progress")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests failing with 429")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed deltas")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        run_time=args.run_time,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        token_delay=args.token_delay
+    )
+    server = MockOpenAIServer(settings, host=args.host, port=args.port)
+    print(f"Mock OpenAI server listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+
+
+if __name__ == "__main__":
+    main()
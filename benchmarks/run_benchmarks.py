@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for NovaClient.
+
+Starts the local mock OpenAI server, runs each scenario against it and
+prints the results as JSON so runs can be compared over time.
+
+Scenarios:
+    latency     Per-call latency of every mode (chat, chat stream, assistant poll/stream)
+    throughput  send_many throughput at several concurrency levels
+    polling     Time spent waiting on runs beyond the server-side run time
+    history     Full/incremental history reads, export and import of a long thread
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --scenarios latency polling --latency 0.02 --run-time 0.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mock_openai_server import MockOpenAIServer, MockSettings  # noqa: E402
+from nova_client import NovaClient  # noqa: E402
+from nova_metrics import process_instrumentation  # noqa: E402
+
+ASSISTANT_ID = "asst_benchmark"
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Count, mean and percentiles (in milliseconds) of a list of durations in seconds."""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": ordered[-1] * 1000
+    }
+
+
+def request_delta(server: MockOpenAIServer, before: Dict[str, int]) -> Dict[str, int]:
+    """Requests the server received since ``before`` was copied from its counters."""
+    after = dict(server.state.request_counts)
+    return {key: after[key] - before.get(key, 0) for key in sorted(after) if after[key] != before.get(key, 0)}
+
+
+def new_client(server: MockOpenAIServer, **kwargs) -> NovaClient:
+    return NovaClient(api_key="benchmark", assistant_id=ASSISTANT_ID, base_url=server.base_url, **kwargs)
+
+
+def bench_latency(server: MockOpenAIServer, iterations: int) -> Dict[str, Any]:
+    """Sequential per-call latency for each mode, on one conversation per mode."""
+    poll_client = new_client(server, use_streaming_runs=False)
+    stream_client = new_client(server, use_streaming_runs=True)
+    results = {}
+
+    def measure(name: str, call: Callable[[], Any], ttft: Callable[[], Any] = None):
+        before = dict(server.state.request_counts)
+        samples, first_tokens = [], []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            call()
+            samples.append(time.perf_counter() - started)
+            if ttft is not None and ttft() is not None:
+                first_tokens.append(ttft())
+        results[name] = {"latency": summarize(samples), "requests": request_delta(server, before)}
+        if ttft is not None:
+            results[name]["ttft"] = summarize(first_tokens)
+
+    chat_session = poll_client.session()
+    measure("chat", lambda: chat_session.send_message("Write a subject line", use_assistant=False))
+    measure(
+        "chat_stream",
+        lambda: "".join(chat_session.stream_message("Write a subject line", use_assistant=False)),
+        lambda: chat_session.last_stream_stats.get("ttft")
+    )
+
+    poll_session = poll_client.session()
+    measure("assistant_poll", lambda: poll_session.send_message("Write a subject line"))
+
+    stream_session = stream_client.session()
+    measure("assistant_stream", lambda: stream_session.send_message("Write a subject line"))
+
+    delta_session = stream_client.session()
+    measure(
+        "assistant_stream_message",
+        lambda: "".join(delta_session.stream_message("Write a subject line")),
+        lambda: delta_session.last_stream_stats.get("ttft")
+    )
+    return results
+
+
+def bench_throughput(server: MockOpenAIServer, requests: int, concurrency: List[int]) -> Dict[str, Any]:
+    """send_many throughput for chat and assistant mode at each concurrency level."""
+    nova = new_client(server)
+    results = {}
+    for mode in ("chat", "assistant"):
+        results[mode] = {}
+        for workers in concurrency:
+            before = dict(server.state.request_counts)
+            prompts = (f"Prompt {i}" for i in range(requests))
+            started = time.perf_counter()
+            outcomes = list(nova.send_many(prompts, use_assistant=mode == "assistant", max_workers=workers))
+            wall_time = time.perf_counter() - started
+            errors = sum(1 for outcome in outcomes if outcome["error"])
+            results[mode][str(workers)] = {
+                "requests": len(outcomes),
+                "errors": errors,
+                "wall_time_s": wall_time,
+                "throughput_rps": len(outcomes) / wall_time if wall_time else 0.0,
+                "latency": summarize([outcome["elapsed"] for outcome in outcomes]),
+                "http_requests": request_delta(server, before)
+            }
+    return results
+
+
+def bench_polling(server: MockOpenAIServer, iterations: int, run_times: List[float]) -> Dict[str, Any]:
+    """Wait overhead of polled versus streamed runs for several server-side run times."""
+    original_run_time = server.settings.run_time
+    results = {}
+    try:
+        for run_time in run_times:
+            server.settings.run_time = run_time
+            results[str(run_time)] = {}
+            for mode, streaming in (("poll", False), ("stream", True)):
+                session = new_client(server, use_streaming_runs=streaming).session()
+                before = dict(server.state.request_counts)
+                overheads, polls = [], []
+                for _ in range(iterations):
+                    session.send_message("Write a subject line")
+                    stats = session.last_run_stats
+                    overheads.append(max(0.0, stats["wall_time"] - run_time))
+                    polls.append(stats["polls"])
+                results[str(run_time)][mode] = {
+                    "overhead": summarize(overheads),
+                    "mean_polls": sum(polls) / len(polls),
+                    "requests": request_delta(server, before)
+                }
+    finally:
+        server.settings.run_time = original_run_time
+    return results
+
+
+def bench_history(server: MockOpenAIServer, messages: int) -> Dict[str, Any]:
+    """History reads, export and import of one thread with ``messages`` messages."""
+    nova = new_client(server)
+    session = nova.session()
+    nova.create_thread(session)
+    for i in range(messages):
+        nova.client.beta.threads.messages.create(
+            thread_id=session.thread_id,
+            role="user" if i % 2 == 0 else "assistant",
+            content=f"Message {i}: " + "lorem ipsum " * 20
+        )
+
+    results = {"messages": messages}
+
+    def measure(name: str, call: Callable[[], Any], **extra):
+        before = dict(server.state.request_counts)
+        started = time.perf_counter()
+        call()
+        results[name] = {"time_ms": (time.perf_counter() - started) * 1000,
+                         "requests": request_delta(server, before), **extra}
+
+    measure("history_full", lambda: session.get_conversation_history(incremental=False))
+    measure("history_incremental_first", lambda: session.get_conversation_history())
+    measure("history_incremental_refresh", lambda: session.get_conversation_history())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in ("json", "jsonl", "jsonl.gz"):
+            path = os.path.join(tmp, f"history.{extension}")
+            measure(f"export_{extension.replace('.', '_')}", lambda: session.export_conversation(path))
+            results[f"export_{extension.replace('.', '_')}"]["bytes"] = os.path.getsize(path)
+
+        jsonl_path = os.path.join(tmp, "history.jsonl")
+        measure("import_jsonl", lambda: nova.session().import_conversation(jsonl_path))
+    return results
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NovaClient against a local mock OpenAI server.")
+    parser.add_argument("--scenarios", nargs="+", default=["latency", "throughput", "polling", "history"],
+                        choices=["latency", "throughput", "polling", "history"])
+    parser.add_argument("--iterations", type=int, default=20, help="Calls per mode in latency/polling scenarios")
+    parser.add_argument("--requests", type=int, default=64, help="Prompts per throughput measurement")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--run-times", type=float, nargs="+", default=[0.1, 0.5], help="Run times for the polling scenario")
+    parser.add_argument("--history-messages", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.01, help="Seconds added to every mock response")
+    parser.add_argument("--run-time", type=float, default=0.2, help="Seconds a mock run stays queued/in progress")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of mock requests failing with 429")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed deltas")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    settings = MockSettings(
+        latency=args.latency,
+        run_time=args.run_time,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        token_delay=args.token_delay
+    )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": asdict(settings),
+            "args": vars(args)
+        },
+        "results": {}
+    }
+
+    with MockOpenAIServer(settings) as server:
+        for scenario in args.scenarios:
+            print(f"Running {scenario}...", file=sys.stderr)
+            if scenario == "latency":
+                report["results"]["latency"] = bench_latency(server, args.iterations)
+            elif scenario == "throughput":
+                report["results"]["throughput"] = bench_throughput(server, args.requests, args.concurrency)
+            elif scenario == "polling":
+                report["results"]["polling"] = bench_polling(server, args.iterations, args.run_times)
+            elif scenario == "history":
+                report["results"]["history"] = bench_history(server, args.history_messages)
+
+    # Per-stage latencies recorded by NovaClient's instrumentation over the whole run
+    report["results"]["stages"] = {
+        name: {key: value for key, value in stats.items() if key not in ("name", "mode")}
+        for name, stats in process_instrumentation.latency_stats().items()
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import json
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -18,7 +19,97 @@ class Config:
     
     # API Settings
     MAX_TOKENS = 4000
-    TIMEOUT = 30
+    TIMEOUT = float(os.getenv('NOVA_TIMEOUT', '30'))  # Deadline of one request, in seconds
+    RUN_CANCEL_TIMEOUT = 5
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL')
+    
+    # HTTP connection pool (shared by every session in a process)
+    HTTP_MAX_CONNECTIONS = int(os.getenv('NOVA_HTTP_MAX_CONNECTIONS', '100'))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv('NOVA_HTTP_MAX_KEEPALIVE', '20'))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv('NOVA_HTTP_KEEPALIVE_EXPIRY', '30'))
+    
+    # Assistant run settings
+    RUN_STREAMING = True
+    RUN_POLL_INITIAL_INTERVAL = 0.05
+    RUN_POLL_MAX_INTERVAL = 1.0
+    RUN_POLL_BACKOFF = 1.5
+    
+    # Conversation history
+    HISTORY_PAGE_SIZE = 100
+    
+    # Limits of threads.create(messages=...) used for bulk imports
+    THREAD_SEED_MESSAGE_LIMIT = 32
+    THREAD_MESSAGE_MAX_CHARS = 256000
+    
+    # Empty assistant threads kept ready for new conversations (0 disables the pool)
+    THREAD_POOL_SIZE = int(os.getenv('NOVA_THREAD_POOL_SIZE', '4'))
+    THREAD_POOL_LOW_WATER = 2
+    THREAD_POOL_MAX_AGE = 3600
+    
+    # Chat session persistence
+    SESSION_STORE_PATH = os.getenv('NOVA_SESSION_STORE_PATH', 'nova_sessions.db')
+    
+    # Constrain NOVA replies to the messages/cta JSON schema
+    STRUCTURED_OUTPUT = os.getenv('NOVA_STRUCTURED_OUTPUT', '').lower() in ('1', 'true', 'yes')
+    
+    # Streamlit transcript rendering
+    TRANSCRIPT_WINDOW = 40
+    RENDER_CACHE_SIZE = 4096
+    
+    # Local conversation memory for chat-completions mode
+    CHAT_MEMORY_TOKEN_BUDGET = int(os.getenv('NOVA_CHAT_MEMORY_TOKENS', '3000'))
+    CHAT_MEMORY_STRATEGY = os.getenv('NOVA_CHAT_MEMORY_STRATEGY', 'truncate')
+    CHAT_MEMORY_SUMMARY_MODEL = "gpt-4o-mini"
+    CHAT_MEMORY_SUMMARY_TOKENS = 300
+    
+    # Static chat prompt prefix (kept byte-identical so upstream prompt caching applies)
+    CHAT_INSTRUCTIONS = os.getenv('NOVA_CHAT_INSTRUCTIONS', '')
+    CHAT_EXAMPLES_PATH = os.getenv('NOVA_CHAT_EXAMPLES_PATH')
+    PROMPT_CACHE_KEY_ENABLED = os.getenv('NOVA_PROMPT_CACHE_KEY', '1').lower() not in ('0', 'false', 'no')
+    
+    # Bulk sending
+    BULK_MAX_WORKERS = 8
+    
+    # Response cache for stateless chat mode (opt-in)
+    RESPONSE_CACHE_ENABLED = os.getenv('NOVA_RESPONSE_CACHE', '').lower() in ('1', 'true', 'yes')
+    RESPONSE_CACHE_SIZE = 1024
+    RESPONSE_CACHE_TTL = 3600
+    RESPONSE_CACHE_PATH = os.getenv('NOVA_RESPONSE_CACHE_PATH')
+    RESPONSE_CACHE_DISK_SIZE = 100000
+    
+    # Share one upstream call between identical stateless chat requests in flight
+    COALESCE_REQUESTS = os.getenv('NOVA_COALESCE_REQUESTS', '1').lower() not in ('0', 'false', 'no')
+    
+    # Shared request scheduler: per-minute budgets (0 = unlimited) and retries of 429s/5xx
+    RATE_LIMIT_RPM = float(os.getenv('NOVA_RATE_LIMIT_RPM', '0'))
+    RATE_LIMIT_TPM = float(os.getenv('NOVA_RATE_LIMIT_TPM', '0'))
+    RATE_LIMIT_BURST_SECONDS = 10
+    RATE_LIMIT_COMPLETION_TOKENS = 500
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv('NOVA_RATE_LIMIT_MAX_RETRIES', '4'))
+    RATE_LIMIT_BACKOFF_BASE = 0.5
+    RATE_LIMIT_BACKOFF_MAX = 30
+    RATE_LIMIT_RETRY_AFTER_MAX = float(os.getenv('NOVA_RATE_LIMIT_RETRY_AFTER_MAX', '60'))  # Longest Retry-After honoured
+    
+    # Assistant metadata cache
+    METADATA_CACHE_TTL = 300
+    METADATA_CACHE_SIZE = 256
+    
+    # Price table for cost estimates: model -> (input, output) USD per million tokens.
+    # Override with a JSON object in NOVA_MODEL_PRICES.
+    MODEL_PRICES = json.loads(os.getenv('NOVA_MODEL_PRICES', 'null')) or {
+        "gpt-4o-mini": (0.15, 0.60),
+        "gpt-4o": (2.50, 10.00),
+        "gpt-4.1-mini": (0.40, 1.60),
+        "gpt-4.1": (2.00, 8.00),
+        "gpt-3.5-turbo": (0.50, 1.50)
+    }
+    
+    # Latency instrumentation (spans and per-stage histograms)
+    INSTRUMENTATION_ENABLED = os.getenv('NOVA_INSTRUMENTATION', '1').lower() not in ('0', 'false', 'no')
+    LATENCY_SAMPLE_SIZE = 2048
+    
+    # Health checks
+    HEALTH_CHECK_INTERVAL = float(os.getenv('NOVA_HEALTH_CHECK_INTERVAL', '15'))
     
     # Validation
     @classmethod
@@ -0,0 +1,468 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional
+from config import Config
+
+
+class _Flight:
+    """A call in progress that other callers can wait on."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+
+
+class _StreamFlight:
+    """A stream in progress whose items other callers can replay and follow."""
+
+    __slots__ = ("condition", "items", "done", "error", "abandoned", "followers")
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.abandoned = False  # The stream stopped without finishing or failing
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait and receive the same result (or exception). ``stream``
+    does the same for iterators, so followers receive items as they arrive.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._counters = {"leaders": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run ``fn`` for ``key`` unless an identical call is already in flight.
+
+        Args:
+            key: Identifies calls that may share a result
+            fn: Zero-argument callable producing the result
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters["leaders"] += 1
+            else:
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.event.set()
+
+    def stream(self, key: Hashable, fn: Callable[[], Iterator[Any]]) -> Iterator[Any]:
+        """
+        Iterate ``fn()`` for ``key`` unless an identical stream is already in flight.
+
+        Callers joining a stream in flight first receive the items produced so
+        far, then the rest as the leader produces them. If the leader stops
+        iterating early while followers are attached, the rest of the stream
+        is drained for them in a background thread. If the stream is abandoned
+        before producing anything, followers start their own ``fn()``.
+
+        Args:
+            key: Identifies streams that may share their items
+            fn: Zero-argument callable returning the iterator
+
+        Yields:
+            Items of the (possibly shared) stream
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _StreamFlight()
+                self._counters["leaders"] += 1
+            else:
+                flight.followers += 1
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            try:
+                retry = yield from self._follow(flight)
+            finally:
+                with self._lock:
+                    flight.followers -= 1
+            if retry:
+                yield from self.stream(key, fn)
+            return
+
+        iterator = None
+        try:
+            iterator = iter(fn())
+            for item in iterator:
+                self._publish(flight, item)
+                yield item
+        except GeneratorExit:
+            # The leader's consumer went away; finish the stream for any followers
+            with self._lock:
+                handed_off = flight.followers > 0
+                if not handed_off:
+                    del self._flights[key]
+            if handed_off:
+                threading.Thread(target=self._drain, args=(key, flight, iterator),
+                                 name="single-flight-drain", daemon=True).start()
+            else:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+                self._finish(key, flight, abandoned=True)
+            raise
+        except Exception as e:
+            self._finish(key, flight, error=e)
+            raise
+        except BaseException:
+            self._finish(key, flight, abandoned=True)
+            raise
+        else:
+            self._finish(key, flight)
+
+    def _drain(self, key: Hashable, flight: _StreamFlight, iterator: Iterator[Any]):
+        """Produce the rest of an abandoned leader's stream for its followers."""
+        try:
+            for item in iterator:
+                self._publish(flight, item)
+        except Exception as e:
+            self._finish(key, flight, error=e)
+        except BaseException:
+            self._finish(key, flight, abandoned=True)
+            raise
+        else:
+            self._finish(key, flight)
+
+    @staticmethod
+    def _publish(flight: _StreamFlight, item: Any):
+        with flight.condition:
+            flight.items.append(item)
+            flight.condition.notify_all()
+
+    def _finish(self, key: Hashable, flight: _StreamFlight, error: Optional[BaseException] = None,
+                abandoned: bool = False):
+        with self._lock:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+        with flight.condition:
+            flight.error = error
+            flight.abandoned = abandoned
+            flight.done = True
+            flight.condition.notify_all()
+
+    @staticmethod
+    def _follow(flight: _StreamFlight) -> Iterator[Any]:
+        """Replay and follow a flight; returns True if the caller should start its own stream."""
+        seen = 0
+        while True:
+            with flight.condition:
+                while seen == len(flight.items) and not flight.done:
+                    flight.condition.wait()
+                items = flight.items[seen:]
+                done = flight.done
+            seen += len(items)
+            yield from items
+            if done:
+                if flight.error is not None:
+                    raise flight.error
+                if flight.abandoned:
+                    if not seen:
+                        return True
+                    raise RuntimeError("Shared stream was abandoned")
+                return False
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get coalescing counters.
+
+        Returns:
+            Dict with leader calls, coalesced calls and the coalesced ratio
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._flights)
+        total = stats["leaders"] + stats["coalesced"]
+        stats["coalesced_ratio"] = stats["coalesced"] / total if total else 0.0
+        return stats
+
+
+class MetadataCache:
+    """
+    TTL cache for rarely changing API objects such as assistant definitions.
+
+    Loads for the same key are coalesced, so concurrent sessions asking for
+    the same object trigger at most one upstream fetch. Failed loads are not
+    cached.
+    """
+
+    def __init__(self, ttl: float = Config.METADATA_CACHE_TTL, max_entries: int = Config.METADATA_CACHE_SIZE):
+        """
+        Initialize the metadata cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid
+            max_entries (int): Maximum number of cached objects
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._generation = 0
+        self._counters = {"hits": 0, "misses": 0, "loads": 0, "invalidations": 0}
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for ``key``, loading it on a miss.
+
+        Args:
+            key: Cache key
+            loader: Zero-argument callable fetching the value upstream
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] <= self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return entry[0]
+            self._counters["misses"] += 1
+
+        return self._flights.do(key, lambda: self._load(key, loader))
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        with self._lock:
+            generation = self._generation
+            self._counters["loads"] += 1
+        value = loader()
+        with self._lock:
+            # Do not resurrect an entry that was invalidated while loading
+            if generation == self._generation:
+                self._entries[key] = (value, time.monotonic())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Drop one entry, or every entry when no key is given.
+
+        Args:
+            key: The key to drop (optional)
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+            self._generation += 1
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hits, misses, upstream loads, coalesced loads, invalidations and size
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+        stats["coalesced"] = self._flights.stats()["coalesced"]
+        return stats
+
+
+class ResponseCache:
+    """
+    Exact-match cache for stateless chat replies.
+
+    Entries live in an in-memory LRU tier and, when ``path`` is given, in an
+    SQLite file that survives restarts. Both tiers honour the same TTL.
+    """
+
+    def __init__(self, max_entries: int = Config.RESPONSE_CACHE_SIZE, ttl: Optional[float] = Config.RESPONSE_CACHE_TTL,
+                 path: Optional[str] = Config.RESPONSE_CACHE_PATH, max_disk_entries: int = Config.RESPONSE_CACHE_DISK_SIZE):
+        """
+        Initialize the response cache.
+
+        Args:
+            max_entries (int): Maximum number of entries kept in memory
+            ttl (float, optional): Seconds an entry stays valid; None keeps entries forever
+            path (str, optional): SQLite file for the persistent tier; memory only when omitted
+            max_disk_entries (int): Maximum number of entries kept on disk
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+        self._db = None
+        self._disk_writes = 0
+
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_responses_created ON responses(created_at)")
+            self._db.commit()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, message: str,
+                 response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build the cache key for a chat request.
+
+        Returns:
+            str: Hex digest identifying the request inputs
+        """
+        inputs = [model, temperature, system_prompt, message]
+        if response_format is not None:
+            inputs.append(response_format)
+        payload = json.dumps(inputs, ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl is not None and now - created_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached reply.
+
+        Args:
+            key (str): Key from ``make_key``
+
+        Returns:
+            The cached reply, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at, now):
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    self._counters["memory_hits"] += 1
+                    return value
+                del self._entries[key]
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    self._store_memory(key, row[0], row[1])
+                    self._counters["hits"] += 1
+                    self._counters["disk_hits"] += 1
+                    return row[0]
+
+            self._counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str):
+        """
+        Store a reply in every tier.
+
+        Args:
+            key (str): Key from ``make_key``
+            value (str): The reply to cache
+        """
+        now = time.time()
+        with self._lock:
+            self._store_memory(key, value, now)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, now)
+                )
+                # Pruning scans the table, so only do it every so often
+                self._disk_writes += 1
+                if self._disk_writes % 100 == 0:
+                    self._prune_disk(now)
+                self._db.commit()
+
+    def _store_memory(self, key: str, value: str, created_at: float):
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _prune_disk(self, now: float):
+        if self.ttl is not None:
+            self._db.execute("DELETE FROM responses WHERE created_at < ?", (now - self.ttl,))
+        self._db.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY created_at DESC LIMIT ?)",
+            (self.max_disk_entries,)
+        )
+
+    def clear(self):
+        """Remove every entry from both tiers."""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hits, misses, hit rate, per-tier hits, evictions and size
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["size"] = len(self._entries)
+            if self._db is not None:
+                stats["disk_size"] = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        """Close the persistent tier."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,20 +1,260 @@
 import os
+import gzip
 import json
+import threading
 import time
-from typing import Dict, List, Optional, Any
-from openai import OpenAI
+from collections import deque
+from dataclasses import asdict, dataclass
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any
 from dotenv import load_dotenv
-import streamlit as st
+from config import Config
+from nova_cache import MetadataCache, ResponseCache, SingleFlight
+from nova_credentials import resolve_api_key, resolve_assistant_id
+from nova_memory import ChatMemory, estimate_message_tokens
+from nova_prompt import PromptBuilder
+from nova_scheduler import PRIORITY_LOW, RequestScheduler, process_scheduler
+from nova_thread_pool import WarmThreadPool
+from nova_output import NOVA_RESPONSE_FORMAT, NovaPayload, StreamingPayloadParser
+from nova_metrics import (Instrumentation, UsageTracker, process_instrumentation, process_usage,
+                          render_prometheus, render_prometheus_coalescing, render_prometheus_latency,
+                          render_prometheus_scheduler)
 
 # Load environment variables
 load_dotenv()
 
+class RunFailedError(RuntimeError):
+    """Raised when an assistant run ends in a status other than completed."""
+    
+    def __init__(self, status: str):
+        super().__init__(f"Assistant run failed with status: {status}")
+        self.status = status
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request's deadline passes before its next API call or wait."""
+
+class Deadline:
+    """Time budget of one request, shared by all of its API calls and waits."""
+    
+    def __init__(self, timeout: float = Config.TIMEOUT):
+        """
+        Start the deadline.
+        
+        Args:
+            timeout (float): Seconds the whole request may take
+        """
+        self.timeout = timeout
+        self.started = time.monotonic()
+        self.expires_at = self.started + timeout
+    
+    def remaining(self) -> float:
+        """Seconds left, 0 once the deadline has passed."""
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+    
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+    
+    def options(self) -> Dict[str, float]:
+        """
+        Request options bounding an API call by the time left.
+        
+        Raises:
+            DeadlineExceeded: If no time is left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.timeout:g}s exceeded")
+        return {"timeout": remaining}
+
+@dataclass
+class TimeoutResult:
+    """Outcome of an assistant request whose deadline passed before its run finished."""
+    
+    thread_id: Optional[str]
+    run_id: Optional[str]
+    status: Optional[str]  # Last run status seen, None if no run was started
+    elapsed: float
+    timeout: float
+    cancelled: bool  # Whether the run was cancelled upstream
+    timed_out: bool = True
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+    
+    def __str__(self) -> str:
+        outcome = " and was cancelled" if self.cancelled else ""
+        return f"Assistant run timed out after {self.elapsed:.1f}s (limit {self.timeout:g}s){outcome}."
+
+class RunTimeoutError(RunFailedError):
+    """Raised when an assistant request does not finish before its deadline."""
+    
+    def __init__(self, result: TimeoutResult):
+        RuntimeError.__init__(self, str(result))
+        self.status = "timed_out"
+        self.result = result
+
+@lru_cache(maxsize=None)
+def timeout_errors() -> tuple:
+    """
+    Exceptions meaning a request ran out of time: its deadline passing, an API
+    call timing out, or a stream read timing out mid-run.
+    
+    Built on first use, so importing this module does not load the OpenAI SDK.
+    """
+    from openai import APITimeoutError
+    try:
+        from httpx import TimeoutException
+    except ImportError:
+        TimeoutException = APITimeoutError
+    return (DeadlineExceeded, APITimeoutError, TimeoutException)
+
+def _http_limits():
+    import httpx
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY
+    )
+
+def build_http_client(scheduler: Optional[RequestScheduler] = None):
+    """
+    Build the pooled HTTP client used by NovaClient.
+    
+    Keep-alive and pool limits come from Config. With a scheduler every request
+    passes through its rate limits and retries. Returns None (use the SDK
+    default) when httpx is not importable.
+    """
+    try:
+        import httpx
+        from openai import DefaultHttpxClient
+        from nova_transport import SchedulingTransport
+    except ImportError:
+        return None
+    
+    limits = _http_limits()
+    if scheduler is None:
+        return DefaultHttpxClient(limits=limits)
+    return DefaultHttpxClient(transport=SchedulingTransport(httpx.HTTPTransport(limits=limits), scheduler))
+
+def build_async_http_client(scheduler: Optional[RequestScheduler] = None):
+    """
+    Build the pooled HTTP client used by AsyncNovaClient.
+    
+    The async counterpart of build_http_client: the same limits, and the same
+    scheduler queue shared with sync clients. Returns None when httpx is not
+    importable.
+    """
+    try:
+        import httpx
+        from openai import DefaultAsyncHttpxClient
+        from nova_transport import AsyncSchedulingTransport
+    except ImportError:
+        return None
+    
+    limits = _http_limits()
+    if scheduler is None:
+        return DefaultAsyncHttpxClient(limits=limits)
+    return DefaultAsyncHttpxClient(
+        transport=AsyncSchedulingTransport(httpx.AsyncHTTPTransport(limits=limits), scheduler)
+    )
+
+class HistorySync:
+    """Locally held copy of a thread's messages, extended incrementally."""
+    
+    def __init__(self, thread_id: str):
+        self.thread_id = thread_id
+        self.messages: List[Dict[str, Any]] = []
+        self.last_id: Optional[str] = None
+
+    def add(self, msg):
+        """Append a message object from the API and advance the cursor."""
+        self.last_id = msg.id
+        if msg.role in ["user", "assistant"]:
+            content = msg.content[0].text.value if msg.content else ""
+            self.messages.append({
+                "role": msg.role,
+                "content": content,
+                "timestamp": msg.created_at
+            })
+
+class NovaSession:
+    """
+    Conversation state for one user of a (possibly shared) NovaClient.
+    
+    A session only holds its thread ID and the timings of its last reply; the
+    OpenAI client and its connection pool stay on the NovaClient, so one
+    client can serve any number of sessions.
+    """
+    
+    def __init__(self, nova: "NovaClient", thread_id: Optional[str] = None):
+        self.nova = nova
+        self.thread_id = thread_id
+        self.history_sync: Optional[HistorySync] = None
+        self.usage = UsageTracker()
+        self.chat_memory = nova.new_chat_memory()
+        self.last_run_stats: Dict[str, Any] = {}
+        self.last_stream_stats: Dict[str, Any] = {}
+
+    def send_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                     structured: bool = False, use_memory: bool = False) -> Any:
+        """Send a message to NOVA within this session. See NovaClient.send_message."""
+        return self.nova.send_message(message, use_assistant, model, temperature, session=self,
+                                      structured=structured, use_memory=use_memory)
+
+    def stream_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                       structured: bool = False, use_memory: bool = False) -> Iterator[str]:
+        """Stream a reply from NOVA within this session. See NovaClient.stream_message."""
+        return self.nova.stream_message(message, use_assistant, model, temperature, session=self,
+                                        structured=structured, use_memory=use_memory)
+
+    def clear_conversation(self):
+        """Clear the current conversation thread and chat-mode memory."""
+        self.thread_id = None
+        self.chat_memory.clear()
+
+    def get_conversation_history(self, incremental: bool = True) -> List[Dict[str, str]]:
+        """Get the conversation history of this session's thread."""
+        return self.nova.get_conversation_history(session=self, incremental=incremental)
+
+    def export_conversation(self, filename: str = None) -> str:
+        """Export this session's conversation history to a JSON file."""
+        return self.nova.export_conversation(filename, session=self)
+
+    def import_conversation(self, filename: str) -> bool:
+        """Import a conversation history into a new thread for this session."""
+        return self.nova.import_conversation(filename, session=self)
+
+    def get_usage_stats(self) -> Dict[str, Any]:
+        """Get token and cost counters for this session and the whole process."""
+        return self.nova.get_usage_stats(session=self)
+
+    def __repr__(self) -> str:
+        return f"NovaSession(assistant_id={self.nova.assistant_id}, thread_id={self.thread_id})"
+
 class NovaClient:
     """
     A Python client for interacting with the NOVA OpenAI Assistant.
+    
+    The client itself doubles as the default conversation (``thread_id``).
+    Servers with many users should share one client per process via
+    ``NovaClient.shared()`` and give each user a ``NovaSession``.
     """
     
-    def __init__(self, api_key: Optional[str] = None, assistant_id: Optional[str] = None):
+    _shared_instance: Optional["NovaClient"] = None
+    _shared_lock = threading.Lock()
+    
+    TERMINAL_RUN_STATUSES = ('completed', 'failed', 'cancelled', 'expired', 'incomplete', 'requires_action')
+    
+    def __init__(self, api_key: Optional[str] = None, assistant_id: Optional[str] = None,
+                 base_url: Optional[str] = None, use_streaming_runs: bool = Config.RUN_STREAMING,
+                 response_cache: Optional[ResponseCache] = None, instrumentation: Optional[Instrumentation] = None,
+                 prompt_builder: Optional[PromptBuilder] = None, scheduler: Optional[RequestScheduler] = None,
+                 thread_pool_size: int = 0):
         """
         Initialize the NOVA client.
         
@@ -23,65 +263,212 @@ class NovaClient:
                                    will try to load from environment variables or use default.
             assistant_id (str, optional): Your specific OpenAI Assistant ID. If not provided,
                                         will try to load from environment or use default.
+            base_url (str, optional): Alternative API endpoint, e.g. a local fake OpenAI server.
+            use_streaming_runs (bool): Consume the run event stream instead of polling run status.
+            response_cache (ResponseCache, optional): Cache for stateless chat replies. Enabled with
+                                                    default settings when NOVA_RESPONSE_CACHE is set.
+            instrumentation (Instrumentation, optional): Receiver of per-stage timing spans.
+                                                       Defaults to the process-wide one in nova_metrics.
+            prompt_builder (PromptBuilder, optional): Assembles chat-mode requests. Defaults to the
+                                                    system prompt plus Config.CHAT_INSTRUCTIONS/CHAT_EXAMPLES_PATH.
+            scheduler (RequestScheduler, optional): Rate limits and retries applied to every request.
+                                                  Defaults to the process-wide one in nova_scheduler.
+            thread_pool_size (int): Empty assistant threads to keep ready for new conversations.
+                                  Off by default; the Streamlit app passes Config.THREAD_POOL_SIZE.
         """
         # Try multiple sources for API key
-        self.api_key = (
-            api_key or 
-            os.getenv('OPENAI_API_KEY') or 
-            st.secrets.get('OPENAI_API_KEY')
-        )
+        self.api_key = resolve_api_key(api_key)
         
-        if not self.api_key:
-            raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
-        
-        self.client = OpenAI(api_key=self.api_key)
+        self.base_url = base_url or Config.OPENAI_BASE_URL
+        client_options = {"api_key": self.api_key}
+        if self.base_url:
+            client_options["base_url"] = self.base_url
+        # Requests share one scheduler, which also takes over the SDK's retries
+        self.scheduler = scheduler if scheduler is not None else process_scheduler
+        http_client = build_http_client(self.scheduler)
+        if http_client is not None:
+            client_options["http_client"] = http_client
+            client_options["max_retries"] = 0
+        # Chat calls keep the SDK's default timeout; assistant requests pass their Deadline per call
+        # Imported here: the SDK is the bulk of the import time, and only a client needs it
+        from openai import OpenAI
+        self.client = OpenAI(**client_options)
+        self.use_streaming_runs = use_streaming_runs
         self.assistant_name = "NOVA"
+        self.system_prompt = f"You are {self.assistant_name}, a helpful AI assistant."
+        
+        # Static prompt prefix, built once so it is byte-identical across requests
+        self.prompt_builder = prompt_builder or PromptBuilder.from_config(self.system_prompt)
+        
+        # Exact-match cache for chat completions (opt-in)
+        if response_cache is None and Config.RESPONSE_CACHE_ENABLED:
+            response_cache = ResponseCache()
+        self.response_cache = response_cache
+        
+        # Per-stage latency spans and histograms
+        self.instrumentation = instrumentation if instrumentation is not None else process_instrumentation
+        
+        # Assistant definitions change rarely; cache lookups for a few minutes
+        self.metadata_cache = MetadataCache()
+        
+        # Most recent health check result per mode
+        self._health_results: Dict[str, tuple] = {}
+        self._health_lock = threading.Lock()
+        self._health_flights = SingleFlight()
+        
+        # Empty threads created in the background, so new conversations start without threads.create
+        self.thread_pool: Optional[WarmThreadPool] = None
+        if thread_pool_size > 0:
+            self.thread_pool = WarmThreadPool(self._create_pooled_thread, self._delete_thread, size=thread_pool_size)
+        
+        # Identical stateless chat requests in flight share one upstream call
+        self.coalesce_requests = Config.COALESCE_REQUESTS
+        self._chat_flights = SingleFlight()
         
         # Try multiple sources for assistant ID
-        self.assistant_id = (
-            assistant_id or 
-            os.getenv('OPENAI_ASSISTANT_ID') or 
-            st.secrets.get('OPENAI_ASSISTANT_ID') or
-            "asst_XTd5ExJ9KUTLyrFkzkzPZa2f"  # Your specific assistant ID
-        )
+        self.assistant_id = resolve_assistant_id(assistant_id)
         
         # Initialize thread for conversations
         self.thread_id = None
+        self.history_sync: Optional[HistorySync] = None
+        
+        # Token and cost counters for this client's own conversation
+        self.usage = UsageTracker()
+        
+        # Local history for chat-completions mode (used with use_memory=True)
+        self.chat_memory = self.new_chat_memory()
+        
+        # Outcomes of structured (schema-constrained) replies
+        self._structured_counters = {"replies": 0, "schema_violations": 0}
+        self._structured_lock = threading.Lock()
+        
+        # Timing of the most recent assistant run and streamed reply
+        self.last_run_stats: Dict[str, Any] = {}
+        self.last_stream_stats: Dict[str, Any] = {}
 
-    def health_check(self) -> Dict[str, Any]:
+    @classmethod
+    def shared(cls, **kwargs) -> "NovaClient":
         """
-        Check if the NOVA client is properly configured and can connect to OpenAI.
+        Get the process-wide NovaClient, creating it on first use.
+        
+        All callers share one OpenAI client and HTTP connection pool. Keyword
+        arguments are only used when the shared client is first created.
         
         Returns:
-            Dict containing health status and configuration info
+            NovaClient: The shared client
         """
-        try:
-            # Test basic API connection
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": "Hello"}],
-                max_tokens=10
-            )
-            
-            # Test assistant access
-            assistant = self.client.beta.assistants.retrieve(self.assistant_id)
+        with cls._shared_lock:
+            if cls._shared_instance is None:
+                cls._shared_instance = cls(**kwargs)
+            return cls._shared_instance
+
+    def session(self, thread_id: Optional[str] = None) -> NovaSession:
+        """
+        Create a per-user conversation handle backed by this client.
+        
+        Args:
+            thread_id (str, optional): Existing thread to continue
             
+        Returns:
+            NovaSession: The new session
+        """
+        return NovaSession(self, thread_id)
+
+    def health_check(self, mode: str = "ready", max_age: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Check if the NOVA client is properly configured and can connect to OpenAI.
+        
+        Args:
+            mode (str): "live" only checks local configuration, "ready" checks API and
+                        assistant access without generating tokens, and "deep" sends a real
+                        (billable) chat completion as well
+            max_age (float, optional): Reuse a previous result of the same mode that is at most
+                                       this many seconds old. Defaults to
+                                       Config.HEALTH_CHECK_INTERVAL for "ready" and 0 for "deep".
+        
+        Returns:
+            Dict containing health status, configuration info and per-dependency latency
+        """
+        if mode == "live":
             return {
                 "status": "healthy",
-                "assistant_name": assistant.name,
-                "assistant_id": self.assistant_id,
-                "api_connected": True,
-                "model": assistant.model
-            }
-            
-        except Exception as e:
-            return {
-                "status": "unhealthy",
+                "mode": mode,
                 "assistant_name": self.assistant_name,
                 "assistant_id": self.assistant_id,
-                "api_connected": False,
-                "error": str(e)
+                "api_connected": None,
+                "checks": {},
+                "cached": False
             }
+        if mode not in ("ready", "deep"):
+            raise ValueError(f"Unknown health check mode: {mode}")
+        
+        if max_age is None:
+            max_age = Config.HEALTH_CHECK_INTERVAL if mode == "ready" else 0
+        
+        with self._health_lock:
+            cached = self._health_results.get(mode)
+        if cached is not None and time.monotonic() - cached[1] <= max_age:
+            return dict(cached[0], cached=True)
+        
+        # Concurrent probes (e.g. from several load balancers) share one check
+        return self._health_flights.do(mode, lambda: self._run_health_check(mode))
+
+    def _run_health_check(self, mode: str) -> Dict[str, Any]:
+        """
+        Probe each dependency, timing it, and cache the combined result.
+        
+        Args:
+            mode (str): "ready" or "deep", see health_check
+            
+        Returns:
+            Dict containing health status and per-dependency results
+        """
+        checks = {}
+        
+        def probe(name, call):
+            started = time.perf_counter()
+            try:
+                value = call()
+                checks[name] = {"ok": True, "latency_ms": (time.perf_counter() - started) * 1000}
+                return value
+            except Exception as e:
+                checks[name] = {"ok": False, "latency_ms": (time.perf_counter() - started) * 1000, "error": str(e)}
+                return None
+        
+        if mode == "deep":
+            # Test basic API connection with a real completion
+            probe("api", lambda: self.client.chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": "Hello"}],
+                max_tokens=10
+            ))
+            # Test assistant access, bypassing the metadata cache
+            assistant = probe("assistant", lambda: self.client.beta.assistants.retrieve(self.assistant_id))
+        else:
+            # Retrieving a model proves credentials and connectivity without generating tokens
+            probe("api", lambda: self.client.models.retrieve(Config.DEFAULT_MODEL))
+            assistant = probe("assistant", lambda: self._retrieve_assistant(self.assistant_id))
+        
+        healthy = all(check["ok"] for check in checks.values())
+        result = {
+            "status": "healthy" if healthy else "unhealthy",
+            "mode": mode,
+            "assistant_name": assistant.name if assistant is not None else self.assistant_name,
+            "assistant_id": self.assistant_id,
+            "api_connected": checks["api"]["ok"],
+            "checks": checks,
+            "cached": False
+        }
+        if assistant is not None:
+            result["model"] = assistant.model
+        if not healthy:
+            result["error"] = "; ".join(
+                f"{name}: {check['error']}" for name, check in checks.items() if not check["ok"]
+            )
+        
+        with self._health_lock:
+            self._health_results[mode] = (result, time.monotonic())
+        return result
 
     def get_or_create_assistant(self) -> str:
         """
@@ -92,7 +479,7 @@ class NovaClient:
         """
         try:
             # Try to retrieve the existing assistant
-            assistant = self.client.beta.assistants.retrieve(self.assistant_id)
+            assistant = self._retrieve_assistant(self.assistant_id)
             return assistant.id
         except Exception:
             # If assistant doesn't exist, create a new one
@@ -102,18 +489,106 @@ class NovaClient:
                 model="gpt-4o-mini",
                 tools=[{"type": "code_interpreter"}]
             )
+            self.metadata_cache.invalidate(("assistants",))
             return assistant.id
 
-    def create_thread(self) -> str:
+    def _retrieve_assistant(self, assistant_id: str):
+        """
+        Retrieve an assistant through the metadata cache.
+        
+        Concurrent lookups of the same ID share a single upstream request.
+        
+        Args:
+            assistant_id (str): The assistant ID
+            
+        Returns:
+            The assistant object
+        """
+        return self.metadata_cache.get_or_load(
+            ("assistant", assistant_id),
+            lambda: self.client.beta.assistants.retrieve(assistant_id)
+        )
+
+    def invalidate_assistant_cache(self, assistant_id: Optional[str] = None):
+        """
+        Forget cached assistant metadata so the next lookup refetches it.
+        
+        Args:
+            assistant_id (str, optional): Assistant to forget; all cached metadata when omitted
+        """
+        if assistant_id is None:
+            self.metadata_cache.invalidate()
+        else:
+            self.metadata_cache.invalidate(("assistant", assistant_id))
+            self.metadata_cache.invalidate(("assistants",))
+
+    def create_thread(self, session: Optional[NovaSession] = None, deadline: Optional[Deadline] = None) -> str:
         """
-        Create a new conversation thread.
+        Create a new conversation thread, taking a pre-created one from the pool when available.
         
+        Args:
+            session (NovaSession, optional): Session to attach the thread to instead of this client
+            deadline (Deadline, optional): Time budget of the request creating the thread
+            
         Returns:
             str: The thread ID
         """
-        thread = self.client.beta.threads.create()
-        self.thread_id = thread.id
-        return thread.id
+        thread_id = self.thread_pool.take() if self.thread_pool is not None else None
+        if thread_id is None:
+            with self.instrumentation.span("threads.create") as span:
+                thread_id = self.client.beta.threads.create(**(deadline.options() if deadline is not None else {})).id
+                span.set(thread_id=thread_id)
+        (session or self).thread_id = thread_id
+        return thread_id
+
+    def _create_pooled_thread(self) -> str:
+        """Create a thread for the pool, behind interactive requests in the scheduler."""
+        with self.scheduler.priority(PRIORITY_LOW):
+            with self.instrumentation.span("threads.create", mode="pool") as span:
+                thread_id = self.client.beta.threads.create().id
+                span.set(thread_id=thread_id)
+        return thread_id
+
+    def _delete_thread(self, thread_id: str):
+        with self.scheduler.priority(PRIORITY_LOW):
+            self.client.beta.threads.delete(thread_id, timeout=Config.RUN_CANCEL_TIMEOUT)
+
+    def warm_up(self, background: bool = False, timeout: float = Config.TIMEOUT) -> Optional[Dict[str, Any]]:
+        """
+        Prepare the client so the first reply is as fast as later ones.
+        
+        Adopts threads handed over by the launcher (NOVA_PREWARMED_THREADS), opens
+        a connection to the API (also caching the assistant definition) and fills
+        the thread pool.
+        
+        Args:
+            background (bool): Run in a daemon thread and return immediately
+            timeout (float): Longest time to wait for the pool to fill
+            
+        Returns:
+            Dict with the connection time, threads ready and any error, or None in the background
+        """
+        if background:
+            threading.Thread(target=self.warm_up, kwargs={"timeout": timeout},
+                             name="nova-warm-up", daemon=True).start()
+            return None
+        
+        report: Dict[str, Any] = {"error": None}
+        handed_over = [thread_id for thread_id in os.environ.pop("NOVA_PREWARMED_THREADS", "").split(",") if thread_id]
+        if self.thread_pool is not None and handed_over:
+            self.thread_pool.adopt(handed_over)
+        
+        started = time.perf_counter()
+        try:
+            self._retrieve_assistant(self.assistant_id)
+        except Exception as e:
+            report["error"] = str(e)
+        report["connect_time"] = time.perf_counter() - started
+        
+        report["threads_ready"] = 0
+        if self.thread_pool is not None and report["error"] is None:
+            report["threads_ready"] = self.thread_pool.fill(timeout)
+        return report
 
     def list_assistants(self) -> List[Dict[str, Any]]:
         """
@@ -123,7 +598,10 @@ class NovaClient:
             List of assistant information
         """
         try:
-            assistants = self.client.beta.assistants.list()
+            assistants = self.metadata_cache.get_or_load(
+                ("assistants",),
+                lambda: self.client.beta.assistants.list().data
+            )
             return [
                 {
                     "id": assistant.id,
@@ -131,7 +609,7 @@ class NovaClient:
                     "model": assistant.model,
                     "created_at": assistant.created_at
                 }
-                for assistant in assistants.data
+                for assistant in assistants
             ]
         except Exception as e:
             print(f"Error listing assistants: {e}")
@@ -148,7 +626,7 @@ class NovaClient:
             bool: True if successful, False otherwise
         """
         try:
-            assistant = self.client.beta.assistants.retrieve(assistant_id)
+            self._retrieve_assistant(assistant_id)
             self.assistant_id = assistant_id
             return True
         except Exception as e:
@@ -163,7 +641,7 @@ class NovaClient:
             Dict containing assistant information or None if error
         """
         try:
-            assistant = self.client.beta.assistants.retrieve(self.assistant_id)
+            assistant = self._retrieve_assistant(self.assistant_id)
             return {
                 "id": assistant.id,
                 "name": assistant.name,
@@ -175,61 +653,282 @@ class NovaClient:
             print(f"Error getting assistant info: {e}")
             return None
 
-    def _send_message_to_assistant(self, message: str) -> str:
+    def _run_assistant(self, thread_id: str, session: Optional[NovaSession] = None,
+                       response_format: Optional[Dict[str, Any]] = None, deadline: Optional[Deadline] = None):
         """
-        Send a message to the specific assistant using the Assistants API.
+        Start a run on a thread and wait until it reaches a terminal status.
+        
+        The run event stream is used when available so the call returns as soon
+        as the run completes; otherwise the run is polled with adaptive backoff.
+        If the deadline passes, or the caller goes away while waiting, the run
+        is cancelled upstream so it stops consuming tokens and releases the thread.
+        Timing details are stored in ``last_run_stats`` of the session (or client).
         
         Args:
-            message (str): The message to send
+            thread_id (str): The thread to run the assistant on
+            session (NovaSession, optional): Session that receives the run statistics
+            response_format (dict, optional): ``response_format`` constraining the reply, e.g. NOVA_RESPONSE_FORMAT
+            deadline (Deadline, optional): Time budget of the request; Config.TIMEOUT from now by default
             
         Returns:
-            str: The assistant's response
+            The final run object
+            
+        Raises:
+            RunTimeoutError: If the deadline passes before the run finishes
         """
+        deadline = deadline or Deadline()
+        started = time.perf_counter()
+        mode = "poll"
+        run = None
+        options = {"response_format": response_format} if response_format is not None else {}
+        
         try:
-            # Ensure we have a thread
-            if not self.thread_id:
-                self.create_thread()
+            if self.use_streaming_runs:
+                try:
+                    with self.instrumentation.span("runs.create", mode="stream", thread_id=thread_id):
+                        stream = self.client.beta.threads.runs.create(
+                            thread_id=thread_id,
+                            assistant_id=self.assistant_id,
+                            stream=True,
+                            **options,
+                            **deadline.options()
+                        )
+                    mode = "stream"
+                except TypeError:
+                    # Older SDKs without run streaming support
+                    stream = None
+                
+                if stream is not None:
+                    with self.instrumentation.span("runs.stream", mode="stream", thread_id=thread_id) as span:
+                        for kind, value in self._iter_run_stream(stream, deadline):
+                            if kind == "run":
+                                run = value
+                        if run is not None:
+                            span.set(run_id=run.id)
             
-            # Add message to thread
-            self.client.beta.threads.messages.create(
-                thread_id=self.thread_id,
-                role="user",
-                content=message
-            )
+            if run is None:
+                with self.instrumentation.span("runs.create", mode="poll", thread_id=thread_id) as span:
+                    run = self.client.beta.threads.runs.create(
+                        thread_id=thread_id,
+                        assistant_id=self.assistant_id,
+                        **options,
+                        **deadline.options()
+                    )
+                    span.set(run_id=run.id)
             
-            # Run the assistant
-            run = self.client.beta.threads.runs.create(
-                thread_id=self.thread_id,
-                assistant_id=self.assistant_id
-            )
+            # Poll if the run is not finished yet (no stream, or the stream ended early)
+            run, polls = self._poll_run(thread_id, run, mode, deadline)
+        except timeout_errors() as e:
+            result = self._abandon_run(thread_id, run, deadline)
+            (session or self).last_run_stats = {
+                "mode": mode,
+                "wall_time": time.perf_counter() - started,
+                "status": "timed_out",
+                "run_id": result.run_id,
+                "timeout": result
+            }
+            raise RunTimeoutError(result) from e
+        except BaseException:
+            # Failed, or the caller went away: do not leave the run going upstream
+            self._abandon_run(thread_id, run, deadline)
+            raise
+        
+        self._record_usage(session, run.model, run.usage)
+        
+        (session or self).last_run_stats = {
+            "mode": mode,
+            "polls": polls,
+            "wall_time": time.perf_counter() - started,
+            "status": run.status,
+            "run_id": run.id
+        }
+        return run
+
+    def _abandon_run(self, thread_id: Optional[str], run, deadline: Deadline) -> TimeoutResult:
+        """
+        Cancel a run that is still queued or in progress and describe how far it got.
+        
+        Args:
+            thread_id (str): The thread the run belongs to
+            run: The last run object seen, or None if the run was not started
+            deadline (Deadline): The request's deadline
+            
+        Returns:
+            TimeoutResult: Run details and whether it was cancelled
+        """
+        cancelled = False
+        if run is not None and run.status in ('queued', 'in_progress'):
+            try:
+                with self.instrumentation.span("runs.cancel", thread_id=thread_id, run_id=run.id):
+                    self.client.beta.threads.runs.cancel(
+                        thread_id=thread_id,
+                        run_id=run.id,
+                        timeout=Config.RUN_CANCEL_TIMEOUT
+                    )
+                cancelled = True
+            except Exception as e:
+                print(f"Error cancelling run: {e}")
+        return TimeoutResult(
+            thread_id=thread_id,
+            run_id=run.id if run is not None else None,
+            status=run.status if run is not None else None,
+            elapsed=deadline.elapsed(),
+            timeout=deadline.timeout,
+            cancelled=cancelled
+        )
+
+    def _iter_run_stream(self, stream, deadline: Optional[Deadline] = None) -> Iterator[tuple]:
+        """
+        Translate a run event stream into ``("delta", text)`` and ``("run", run)`` items.
+        
+        Iteration stops once a run event with a terminal status has been yielded,
+        and the stream is closed when the generator finishes or is discarded.
+        
+        Args:
+            stream: The event stream returned by ``runs.create(stream=True)``
+            deadline (Deadline, optional): Stop with DeadlineExceeded once it has passed
+        """
+        try:
+            for event in stream:
+                if deadline is not None and deadline.expired:
+                    raise DeadlineExceeded(f"Deadline of {deadline.timeout:g}s exceeded")
+                name = getattr(event, "event", "")
+                if name == "thread.message.delta":
+                    for part in event.data.delta.content or []:
+                        text = getattr(part, "text", None)
+                        if text is not None and text.value:
+                            yield "delta", text.value
+                elif name.startswith("thread.run.") and not name.startswith("thread.run.step."):
+                    yield "run", event.data
+                    if event.data.status in self.TERMINAL_RUN_STATUSES:
+                        break
+        finally:
+            stream.close()
+
+    def _poll_run(self, thread_id: str, run, mode: str = "poll", deadline: Optional[Deadline] = None):
+        """
+        Poll a run until it leaves the queued/in-progress states.
+        
+        The interval starts at ``Config.RUN_POLL_INITIAL_INTERVAL`` and grows by
+        ``Config.RUN_POLL_BACKOFF`` up to ``Config.RUN_POLL_MAX_INTERVAL``.
+        
+        Args:
+            thread_id (str): The thread the run belongs to
+            run: The run object to poll
+            mode (str): How the run was started ("poll" or "stream"), for instrumentation
+            deadline (Deadline, optional): Time budget of the request; Config.TIMEOUT from now by default
             
-            # Wait for completion
+        Returns:
+            Tuple of (final run object, number of polls made)
+            
+        Raises:
+            DeadlineExceeded: If the run is still going when the deadline passes
+        """
+        deadline = deadline or Deadline()
+        polls = 0
+        if run.status not in ['queued', 'in_progress', 'cancelling']:
+            return run, polls
+        
+        interval = Config.RUN_POLL_INITIAL_INTERVAL
+        with self.instrumentation.span("runs.poll", mode=mode, thread_id=thread_id, run_id=run.id) as span:
             while run.status in ['queued', 'in_progress', 'cancelling']:
-                time.sleep(1)
+                time.sleep(min(interval, deadline.remaining()))
+                interval = min(interval * Config.RUN_POLL_BACKOFF, Config.RUN_POLL_MAX_INTERVAL)
                 run = self.client.beta.threads.runs.retrieve(
-                    thread_id=self.thread_id,
-                    run_id=run.id
+                    thread_id=thread_id,
+                    run_id=run.id,
+                    **deadline.options()
                 )
+                polls += 1
+            span.set(polls=polls, status=run.status)
+        return run, polls
+
+    def _ask_assistant(self, message: str, thread_id: str, session: Optional[NovaSession] = None,
+                       response_format: Optional[Dict[str, Any]] = None, deadline: Optional[Deadline] = None) -> str:
+        """
+        Post a message to a thread, run the assistant and return its reply.
+        
+        Args:
+            message (str): The message to send
+            thread_id (str): The thread to post the message to
+            session (NovaSession, optional): Session that receives the run statistics
+            response_format (dict, optional): ``response_format`` constraining the reply, e.g. NOVA_RESPONSE_FORMAT
+            deadline (Deadline, optional): Time budget of the request; Config.TIMEOUT from now by default
             
-            if run.status == 'completed':
-                # Get the response
+        Returns:
+            str: The assistant's response
+            
+        Raises:
+            RunFailedError: If the run does not complete
+            RunTimeoutError: If the deadline passes first
+        """
+        deadline = deadline or Deadline()
+        run = None
+        try:
+            # Add message to thread
+            with self.instrumentation.span("messages.create", thread_id=thread_id):
+                self.client.beta.threads.messages.create(
+                    thread_id=thread_id,
+                    role="user",
+                    content=message,
+                    **deadline.options()
+                )
+            
+            # Run the assistant and wait for it to finish
+            run = self._run_assistant(thread_id, session, response_format, deadline)
+            if run.status != 'completed':
+                raise RunFailedError(run.status)
+            
+            # Get the latest assistant message
+            with self.instrumentation.span("messages.list", thread_id=thread_id, run_id=run.id):
                 messages = self.client.beta.threads.messages.list(
-                    thread_id=self.thread_id
+                    thread_id=thread_id,
+                    **deadline.options()
                 )
+        except timeout_errors() as e:
+            raise RunTimeoutError(self._abandon_run(thread_id, run, deadline)) from e
+        
+        for msg in messages.data:
+            if msg.role == "assistant":
+                return msg.content[0].text.value
+        
+        return "No response received from assistant."
+
+    def _send_message_to_assistant(self, message: str, session: Optional[NovaSession] = None) -> Any:
+        """
+        Send a message to the specific assistant using the Assistants API.
+        
+        Args:
+            message (str): The message to send
+            session (NovaSession, optional): Conversation to use instead of this client's thread
+            
+        Returns:
+            str: The assistant's response, or a TimeoutResult if the deadline passed
+        """
+        conversation = session or self
+        deadline = Deadline()
+        try:
+            with self.instrumentation.span("send_message", mode="assistant") as span:
+                # Ensure we have a thread
+                if not conversation.thread_id:
+                    self.create_thread(session, deadline)
+                span.set(thread_id=conversation.thread_id)
                 
-                # Get the latest assistant message
-                for msg in messages.data:
-                    if msg.role == "assistant":
-                        return msg.content[0].text.value
-                
-                return "No response received from assistant."
-            else:
-                return f"Assistant run failed with status: {run.status}"
-                
+                reply = self._ask_assistant(message, conversation.thread_id, session, deadline=deadline)
+                span.set(run_id=conversation.last_run_stats.get("run_id"))
+                return reply
+            
+        except RunTimeoutError as e:
+            return e.result
+        except timeout_errors():
+            return self._abandon_run(conversation.thread_id, None, deadline)
+        except RunFailedError as e:
+            return str(e)
         except Exception as e:
             return f"Error communicating with assistant: {str(e)}"
 
-    def _send_message_to_chat(self, message: str, model: str = "gpt-4o-mini", temperature: float = 0.7) -> str:
+    def _send_message_to_chat(self, message: str, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                              session: Optional[NovaSession] = None, use_memory: bool = False) -> str:
         """
         Send a message using the Chat Completions API.
         
@@ -237,26 +936,422 @@ class NovaClient:
             message (str): The message to send
             model (str): The model to use
             temperature (float): The temperature setting
+            session (NovaSession, optional): Session whose usage counters (and memory) are used
+            use_memory (bool): Carry the conversation's local chat history
             
         Returns:
             str: The assistant's response
         """
+        memory = (session or self).chat_memory if use_memory else None
         try:
+            with self.instrumentation.span("send_message", mode="chat", model=model):
+                return self._ask_chat(message, model, temperature, session, memory=memory)
+        except Exception as e:
+            return f"Error communicating with chat API: {str(e)}"
+
+    def _ask_chat(self, message: str, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                  session: Optional[NovaSession] = None, response_format: Optional[Dict[str, Any]] = None,
+                  memory: Optional[ChatMemory] = None) -> str:
+        """
+        Call the Chat Completions API and return the reply, raising on errors.
+        
+        Args:
+            message (str): The message to send
+            model (str): The model to use
+            temperature (float): The temperature setting
+            session (NovaSession, optional): Session whose usage counters are updated
+            response_format (dict, optional): ``response_format`` constraining the reply, e.g. NOVA_RESPONSE_FORMAT
+            memory (ChatMemory, optional): Local history sent before the message and extended with the reply
+            
+        Returns:
+            str: The assistant's response
+        """
+        cache_key = None
+        # Replies that depend on history are neither cached nor shared
+        if memory is None:
+            cache_key = ResponseCache.make_key(model, temperature, self.prompt_builder.prefix_key, message, response_format)
+            if self.response_cache is not None:
+                cached = self.response_cache.get(cache_key)
+                if cached is not None:
+                    self._record_usage(session, model, None)
+                    return cached
+        
+        if cache_key is None or not self.coalesce_requests:
+            return self._complete_chat(message, model, temperature, session, response_format, memory, cache_key)
+        
+        led = False
+        
+        def fetch():
+            nonlocal led
+            led = True
+            return self._complete_chat(message, model, temperature, session, response_format, None, cache_key)
+        
+        # Identical stateless requests in flight (e.g. from other sessions) share one upstream call
+        reply = self._chat_flights.do(("send", cache_key), fetch)
+        if not led:
+            # The tokens were counted once, for the session that made the call
+            self._record_usage(session, model, None)
+        return reply
+
+    def _complete_chat(self, message: str, model: str, temperature: float, session: Optional[NovaSession],
+                       response_format: Optional[Dict[str, Any]], memory: Optional[ChatMemory],
+                       cache_key: Optional[str]) -> str:
+        """Make one Chat Completions request and record, cache and remember its reply."""
+        options = {"response_format": response_format} if response_format is not None else {}
+        options.update(self.prompt_builder.request_options())
+        with self.instrumentation.span("chat.completions.create", mode="chat", model=model):
             response = self.client.chat.completions.create(
                 model=model,
-                messages=[
-                    {"role": "system", "content": f"You are {self.assistant_name}, a helpful AI assistant."},
-                    {"role": "user", "content": message}
-                ],
-                temperature=temperature
+                messages=self._chat_messages(message, memory),
+                temperature=temperature,
+                **options
             )
+        
+        self._record_usage(session, response.model or model, response.usage)
+        reply = response.choices[0].message.content
+        if self.response_cache is not None and cache_key is not None and self._cacheable(reply, response.choices[0].finish_reason):
+            self.response_cache.set(cache_key, reply)
+        if memory is not None and reply is not None:
+            memory.add("user", message)
+            memory.add("assistant", reply)
+        return reply
+
+    @staticmethod
+    def _cacheable(reply: Optional[str], finish_reason: Optional[str]) -> bool:
+        """Whether a reply is complete enough to serve again: non-empty and not cut off."""
+        return finish_reason == "stop" and bool(reply and reply.strip())
+
+    def _chat_messages(self, message: str, memory: Optional[ChatMemory] = None) -> List[Dict[str, str]]:
+        """
+        Build the messages of a chat request: static prefix, history within budget, then the message.
+        
+        Args:
+            message (str): The message to send
+            memory (ChatMemory, optional): Local history to include
             
-            return response.choices[0].message.content
+        Returns:
+            List of chat messages
+        """
+        history = None
+        if memory is not None:
+            history = memory.messages(reserve_tokens=estimate_message_tokens(message))
+        return self.prompt_builder.build(message, history)
+
+    def new_chat_memory(self) -> ChatMemory:
+        """
+        Create an empty chat-mode memory whose summaries are written by this client.
+        
+        Returns:
+            ChatMemory using Config.CHAT_MEMORY_* settings
+        """
+        return ChatMemory(summarizer=self._summarize_history)
+
+    def _summarize_history(self, summary: str, turns: List[Dict[str, str]]) -> str:
+        """
+        Fold old turns into the running summary of a chat-mode conversation.
+        
+        Args:
+            summary (str): The current summary (may be empty)
+            turns (list): The oldest turns being removed from the history
             
+        Returns:
+            str: The new summary
+        """
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        prompt = (
+            f"Current summary:\n{summary or '(none)'}\n\n"
+            f"New conversation turns:\n{transcript}\n\n"
+            "Write an updated summary of the conversation so far. Keep names, facts, decisions and "
+            "requests the assistant must remember. Be concise."
+        )
+        with self.instrumentation.span("chat.summarize", mode="chat", turns=len(turns)):
+            response = self.client.chat.completions.create(
+                model=Config.CHAT_MEMORY_SUMMARY_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=Config.CHAT_MEMORY_SUMMARY_TOKENS,
+                temperature=0
+            )
+        process_usage.record(response.model or Config.CHAT_MEMORY_SUMMARY_MODEL, response.usage)
+        return response.choices[0].message.content or summary
+
+    def _stream_message_to_assistant(self, message: str, session: Optional[NovaSession] = None,
+                                     response_format: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """
+        Send a message to the assistant and yield the reply as it is generated.
+        
+        The whole request is bounded by one Deadline (Config.TIMEOUT). If it
+        passes, or the caller stops reading, the run is cancelled upstream; a
+        timeout is reported under "timeout" in ``last_stream_stats``.
+        
+        Args:
+            message (str): The message to send
+            session (NovaSession, optional): Conversation to use instead of this client's thread
+            response_format (dict, optional): ``response_format`` constraining the reply, e.g. NOVA_RESPONSE_FORMAT
+            
+        Yields:
+            str: Text deltas of the assistant's response
+        """
+        conversation = session or self
+        deadline = Deadline()
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        error = None
+        timeout = None
+        run = None
+        options = {"response_format": response_format} if response_format is not None else {}
+        try:
+            # Ensure we have a thread
+            if not conversation.thread_id:
+                self.create_thread(session, deadline)
+            
+            with self.instrumentation.span("messages.create", thread_id=conversation.thread_id):
+                self.client.beta.threads.messages.create(
+                    thread_id=conversation.thread_id,
+                    role="user",
+                    content=message,
+                    **deadline.options()
+                )
+            
+            with self.instrumentation.span("runs.create", mode="stream", thread_id=conversation.thread_id):
+                stream = self.client.beta.threads.runs.create(
+                    thread_id=conversation.thread_id,
+                    assistant_id=self.assistant_id,
+                    stream=True,
+                    **options,
+                    **deadline.options()
+                )
+            
+            # Spans cannot enclose yields, so the stream is timed by hand
+            stream_started = time.perf_counter()
+            for kind, value in self._iter_run_stream(stream, deadline):
+                if kind == "run":
+                    run = value
+                    continue
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunks += 1
+                yield value
+            self.instrumentation.observe(
+                "runs.stream", stream_started, time.perf_counter(), mode="stream",
+                thread_id=conversation.thread_id, run_id=run.id if run is not None else None
+            )
+            
+            if run is None:
+                error = "No response received from assistant."
+                yield error
+                return
+            
+            # The stream can end before the run does; finish by polling
+            run, _ = self._poll_run(conversation.thread_id, run, "stream", deadline)
+            self._record_usage(session, run.model, run.usage)
+            if run.status != 'completed':
+                error = f"Assistant run failed with status: {run.status}"
+                yield error
+            elif first_token_at is None:
+                # Nothing was streamed, fall back to the stored reply
+                messages = self.client.beta.threads.messages.list(
+                    thread_id=conversation.thread_id,
+                    **deadline.options()
+                )
+                for msg in messages.data:
+                    if msg.role == "assistant":
+                        first_token_at = time.perf_counter()
+                        yield msg.content[0].text.value
+                        break
+                
+        except timeout_errors():
+            timeout = self._abandon_run(conversation.thread_id, run, deadline)
+            error = str(timeout)
+            yield error
+        except GeneratorExit:
+            # The caller stopped reading (e.g. a Streamlit rerun); stop the run as well
+            self._abandon_run(conversation.thread_id, run, deadline)
+            raise
         except Exception as e:
-            return f"Error communicating with chat API: {str(e)}"
+            self._abandon_run(conversation.thread_id, run, deadline)
+            error = f"Error communicating with assistant: {str(e)}"
+            yield error
+        finally:
+            finished = time.perf_counter()
+            conversation.last_stream_stats = {
+                "mode": "assistant",
+                "ttft": first_token_at - started if first_token_at else None,
+                "total_time": finished - started,
+                "chunks": chunks,
+                "error": error,
+                "timeout": timeout
+            }
+            self.instrumentation.observe(
+                "stream_message", started, finished, mode="assistant",
+                thread_id=conversation.thread_id, ttft=conversation.last_stream_stats["ttft"]
+            )
+
+    def _stream_message_to_chat(self, message: str, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                                session: Optional[NovaSession] = None,
+                                response_format: Optional[Dict[str, Any]] = None,
+                                memory: Optional[ChatMemory] = None) -> Iterator[str]:
+        """
+        Send a message using the Chat Completions API and yield the reply as it is generated.
+        
+        Args:
+            message (str): The message to send
+            model (str): The model to use
+            temperature (float): The temperature setting
+            session (NovaSession, optional): Session that receives the stream statistics
+            response_format (dict, optional): ``response_format`` constraining the reply, e.g. NOVA_RESPONSE_FORMAT
+            memory (ChatMemory, optional): Local history sent before the message and extended with the reply
+            
+        Yields:
+            str: Text deltas of the assistant's response
+        """
+        started = time.perf_counter()
+        first_token_at = None
+        chunks = 0
+        error = None
+        try:
+            cache_key = None
+            if memory is None:
+                cache_key = ResponseCache.make_key(model, temperature, self.prompt_builder.prefix_key, message, response_format)
+                cached = self.response_cache.get(cache_key) if self.response_cache is not None else None
+                if cached is not None:
+                    self._record_usage(session, model, None)
+                    first_token_at = time.perf_counter()
+                    chunks = 1
+                    yield cached
+                    return
+            
+            led = cache_key is None or not self.coalesce_requests
+            
+            def upstream():
+                nonlocal led
+                led = True
+                return self._chat_deltas(message, model, temperature, session, response_format, memory, cache_key)
+            
+            if led:
+                deltas = upstream()
+            else:
+                # Identical stateless streams in flight share one upstream call; joiners replay it
+                deltas = self._chat_flights.stream(("stream", cache_key), upstream)
+            
+            for text in deltas:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                chunks += 1
+                yield text
+            
+            if not led:
+                # The tokens were counted once, for the session that made the call
+                self._record_usage(session, model, None)
+                
+        except Exception as e:
+            error = f"Error communicating with chat API: {str(e)}"
+            yield error
+        finally:
+            finished = time.perf_counter()
+            stats = (session or self).last_stream_stats = {
+                "mode": "chat",
+                "ttft": first_token_at - started if first_token_at else None,
+                "total_time": finished - started,
+                "chunks": chunks,
+                "error": error
+            }
+            self.instrumentation.observe(
+                "stream_message", started, finished, mode="chat", model=model, ttft=stats["ttft"]
+            )
 
-    def send_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7) -> str:
+    def _chat_deltas(self, message: str, model: str, temperature: float, session: Optional[NovaSession],
+                     response_format: Optional[Dict[str, Any]], memory: Optional[ChatMemory],
+                     cache_key: Optional[str]) -> Iterator[str]:
+        """Stream one Chat Completions request and record, cache and remember its reply."""
+        options = {"response_format": response_format} if response_format is not None else {}
+        options.update(self.prompt_builder.request_options())
+        stream = self.client.chat.completions.create(
+            model=model,
+            messages=self._chat_messages(message, memory),
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+            **options
+        )
+        
+        parts = []
+        usage = None
+        finish_reason = None
+        try:
+            for chunk in stream:
+                # The final chunk carries usage and no choices
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                finish_reason = chunk.choices[0].finish_reason or finish_reason
+                text = chunk.choices[0].delta.content
+                if text:
+                    parts.append(text)
+                    yield text
+        finally:
+            stream.close()
+        
+        self._record_usage(session, model, usage)
+        reply = "".join(parts)
+        if self.response_cache is not None and cache_key is not None and self._cacheable(reply, finish_reason):
+            self.response_cache.set(cache_key, reply)
+        if memory is not None:
+            memory.add("user", message)
+            memory.add("assistant", reply)
+
+    def stream_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                       session: Optional[NovaSession] = None, structured: bool = False,
+                       use_memory: bool = False) -> Iterator[str]:
+        """
+        Send a message to NOVA and yield the response token by token.
+        
+        Time-to-first-token and total time of the reply are stored in
+        ``last_stream_stats`` once the generator is exhausted. In structured
+        mode the parsed NovaPayload is stored there under "payload".
+        
+        Args:
+            message (str): The message to send
+            use_assistant (bool): Whether to use the specific assistant or general chat
+            model (str): The model to use (for chat completions)
+            temperature (float): The temperature setting (for chat completions)
+            session (NovaSession, optional): Conversation to use instead of this client's thread
+            structured (bool): Constrain the reply to NOVA's messages/cta JSON schema
+            use_memory (bool): In chat mode, carry the conversation's local history (see send_message)
+            
+        Yields:
+            str: Text deltas of the assistant's response
+        """
+        response_format = NOVA_RESPONSE_FORMAT if structured else None
+        if use_assistant:
+            chunks = self._stream_message_to_assistant(message, session, response_format)
+        else:
+            memory = (session or self).chat_memory if use_memory else None
+            chunks = self._stream_message_to_chat(message, model, temperature, session, response_format, memory)
+        return self._parse_stream(chunks, session) if structured else chunks
+
+    def _parse_stream(self, chunks: Iterator[str], session: Optional[NovaSession] = None) -> Iterator[str]:
+        """Pass a structured reply through while parsing it into ``last_stream_stats["payload"]``."""
+        parser = StreamingPayloadParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+            yield chunk
+        
+        stats = (session or self).last_stream_stats
+        if stats.get("error"):
+            stats["payload"] = NovaPayload.invalid(stats["error"], [stats["error"]])
+            return
+        data = parser.close()
+        if data is None:
+            payload = NovaPayload.invalid(parser.text, parser.errors or ["$: reply is not a JSON payload"])
+        else:
+            payload = NovaPayload.from_dict(data, raw=parser.text)
+        self._record_structured(payload)
+        stats["payload"] = payload
+
+    def send_message(self, message: str, use_assistant: bool = True, model: str = "gpt-4o-mini", temperature: float = 0.7,
+                     session: Optional[NovaSession] = None, structured: bool = False, use_memory: bool = False) -> Any:
         """
         Send a message to NOVA.
         
@@ -265,102 +1360,324 @@ class NovaClient:
             use_assistant (bool): Whether to use the specific assistant or general chat
             model (str): The model to use (for chat completions)
             temperature (float): The temperature setting (for chat completions)
+            session (NovaSession, optional): Conversation to use instead of this client's thread
+            structured (bool): Constrain the reply to NOVA's messages/cta JSON schema
+                               and return it parsed
+            use_memory (bool): In chat mode, send the conversation's earlier turns from local
+                               memory (bounded by Config.CHAT_MEMORY_TOKEN_BUDGET) so chat
+                               completions carry context without the Assistants API
             
         Returns:
-            str: The assistant's response
+            str: The assistant's response, or a NovaPayload in structured mode. An assistant
+                 run that misses its deadline (Config.TIMEOUT) is cancelled and reported as a
+                 TimeoutResult (in structured mode, as an invalid NovaPayload).
         """
+        if structured:
+            return self._send_structured_message(message, use_assistant, model, temperature, session, use_memory)
         if use_assistant:
-            return self._send_message_to_assistant(message)
+            return self._send_message_to_assistant(message, session)
         else:
-            return self._send_message_to_chat(message, model, temperature)
+            return self._send_message_to_chat(message, model, temperature, session, use_memory)
+
+    def _send_structured_message(self, message: str, use_assistant: bool, model: str, temperature: float,
+                                 session: Optional[NovaSession] = None, use_memory: bool = False) -> NovaPayload:
+        """
+        Send a message with the reply constrained to NOVA_RESPONSE_FORMAT.
+        
+        Returns:
+            NovaPayload: The parsed reply; API errors and schema violations are
+                         reported in its ``errors``
+        """
+        conversation = session or self
+        mode = "assistant" if use_assistant else "chat"
+        try:
+            with self.instrumentation.span("send_message", mode=mode, structured=True) as span:
+                if use_assistant:
+                    deadline = Deadline()
+                    if not conversation.thread_id:
+                        self.create_thread(session, deadline)
+                    span.set(thread_id=conversation.thread_id)
+                    reply = self._ask_assistant(message, conversation.thread_id, session, NOVA_RESPONSE_FORMAT, deadline)
+                else:
+                    memory = conversation.chat_memory if use_memory else None
+                    reply = self._ask_chat(message, model, temperature, session, NOVA_RESPONSE_FORMAT, memory)
+        except RunFailedError as e:
+            return NovaPayload.invalid(str(e), [str(e)])
+        except Exception as e:
+            api = "assistant" if use_assistant else "chat API"
+            error = f"Error communicating with {api}: {str(e)}"
+            return NovaPayload.invalid(error, [error])
+        
+        payload = NovaPayload.from_text(reply or "")
+        self._record_structured(payload)
+        return payload
+
+    def _record_structured(self, payload: NovaPayload):
+        """Count a structured reply and whether it violated the schema."""
+        with self._structured_lock:
+            self._structured_counters["replies"] += 1
+            if not payload.valid:
+                self._structured_counters["schema_violations"] += 1
+
+    def get_structured_output_stats(self) -> Dict[str, Any]:
+        """
+        Get counters of structured-mode replies.
+        
+        Returns:
+            Dict with replies, schema_violations and violation_rate
+        """
+        with self._structured_lock:
+            stats = dict(self._structured_counters)
+        stats["violation_rate"] = stats["schema_violations"] / stats["replies"] if stats["replies"] else 0.0
+        return stats
+
+    def send_many(self, prompts: Iterable[str], use_assistant: bool = False, model: str = "gpt-4o-mini",
+                  temperature: float = 0.7, max_workers: int = Config.BULK_MAX_WORKERS,
+                  ordered: bool = True, structured: bool = False,
+                  priority: int = PRIORITY_LOW,
+                  on_close: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Send many prompts concurrently over a bounded worker pool.
+        
+        Every prompt is isolated: in assistant mode each one gets its own new
+        thread, in chat mode each one is a stateless completion. The client's
+        own ``thread_id`` is never touched. Prompts are consumed lazily, so
+        very large iterables can be streamed through.
+        
+        Args:
+            prompts (Iterable[str]): The prompts to send
+            use_assistant (bool): Whether to use the specific assistant or general chat
+            model (str): The model to use (for chat completions)
+            temperature (float): The temperature setting (for chat completions)
+            max_workers (int): Maximum number of requests in flight at once
+            ordered (bool): Yield results in input order instead of as they complete
+            structured (bool): Constrain replies to NOVA's JSON schema; responses are NovaPayload objects
+            priority (int): Scheduler priority of the requests. Low by default, so interactive
+                            requests go first when the rate limit is reached.
+            on_close (callable, optional): Called with each result that finished but was not yielded
+                                           when iteration stops early (the generator is closed or
+                                           interrupted), e.g. to save it instead of sending it again
+            
+        Yields:
+            Dict with index, prompt, response, error, thread_id, timeout (a TimeoutResult if the
+            assistant run timed out) and elapsed seconds
+        """
+        response_format = NOVA_RESPONSE_FORMAT if structured else None
+        
+        def work(index: int, prompt: str) -> Dict[str, Any]:
+            started = time.perf_counter()
+            result = {"index": index, "prompt": prompt, "response": None, "error": None, "thread_id": None,
+                      "timeout": None}
+            try:
+                with self.scheduler.priority(priority):
+                    if use_assistant:
+                        deadline = Deadline()
+                        result["thread_id"] = self.client.beta.threads.create(**deadline.options()).id
+                        reply = self._ask_assistant(prompt, result["thread_id"], response_format=response_format,
+                                                    deadline=deadline)
+                    else:
+                        reply = self._ask_chat(prompt, model, temperature, response_format=response_format)
+                if structured:
+                    reply = NovaPayload.from_text(reply or "")
+                    self._record_structured(reply)
+                    if not reply.valid:
+                        result["error"] = "; ".join(reply.errors)
+                result["response"] = reply
+            except RunTimeoutError as e:
+                result["error"] = str(e)
+                result["timeout"] = e.result
+            except Exception as e:
+                result["error"] = str(e)
+            result["elapsed"] = time.perf_counter() - started
+            return result
+        
+        # Keep at most two batches in flight so huge inputs are not all queued at once
+        window = max(1, max_workers) * 2
+        executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="nova-send-many")
+        pending = deque()
+        try:
+            for index, prompt in enumerate(prompts):
+                pending.append(executor.submit(work, index, prompt))
+                while len(pending) >= window:
+                    yield from self._drain_results(pending, ordered)
+            while pending:
+                yield from self._drain_results(pending, ordered)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            if on_close is not None:
+                # Requests that were already running have finished by now
+                for future in pending:
+                    if not future.cancelled() and future.exception() is None:
+                        on_close(future.result())
+
+    @staticmethod
+    def _drain_results(pending: deque, ordered: bool) -> Iterator[Dict[str, Any]]:
+        """Yield at least one finished result from the pending futures."""
+        if ordered:
+            yield pending.popleft().result()
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+            yield future.result()
 
     def clear_conversation(self):
-        """Clear the current conversation thread."""
+        """Clear the current conversation thread and chat-mode memory."""
         self.thread_id = None
+        self.chat_memory.clear()
 
-    def get_conversation_history(self) -> List[Dict[str, str]]:
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get hit/miss counters of the client's caches.
+        
+        Returns:
+            Dict of cache name to its statistics (empty for disabled caches)
+        """
+        return {
+            "responses": self.response_cache.stats() if self.response_cache is not None else {},
+            "metadata": self.metadata_cache.stats(),
+            "threads": self.thread_pool.stats() if self.thread_pool is not None else {},
+            "coalescing": self._chat_flights.stats()
+        }
+
+    def get_conversation_history(self, session: Optional[NovaSession] = None, incremental: bool = True) -> List[Dict[str, str]]:
         """
         Get the conversation history from the current thread.
         
+        The full thread is read once with cursor-based pagination and kept
+        locally; later calls only fetch messages newer than the last one seen.
+        
+        Args:
+            session (NovaSession, optional): Conversation to read instead of this client's thread
+            incremental (bool): Reuse the locally held history; False re-reads the whole thread
+            
         Returns:
-            List of conversation messages
+            List of conversation messages, newest first
         """
-        if not self.thread_id:
+        conversation = session or self
+        thread_id = conversation.thread_id
+        if not thread_id:
             return []
         
         try:
-            messages = self.client.beta.threads.messages.list(
-                thread_id=self.thread_id
-            )
+            history = conversation.history_sync
+            if history is None or history.thread_id != thread_id or not incremental:
+                history = HistorySync(thread_id)
             
-            history = []
-            for msg in messages.data:
-                if msg.role in ["user", "assistant"]:
-                    content = msg.content[0].text.value if msg.content else ""
-                    history.append({
-                        "role": msg.role,
-                        "content": content,
-                        "timestamp": msg.created_at
-                    })
+            for msg in self.iter_thread_messages(thread_id, after=history.last_id):
+                # Messages still being written may change; fetch them again next time
+                if getattr(msg, "status", None) == "in_progress":
+                    break
+                history.add(msg)
             
-            return history
+            conversation.history_sync = history
+            return list(reversed(history.messages))
             
         except Exception as e:
             print(f"Error getting conversation history: {e}")
             return []
 
-    def export_conversation(self, filename: str = None) -> str:
+    def iter_thread_messages(self, thread_id: str, after: Optional[str] = None) -> Iterator[Any]:
+        """
+        Iterate over every message of a thread, oldest first, following pagination cursors.
+        
+        Args:
+            thread_id (str): The thread to read
+            after (str, optional): Only return messages created after this message ID
+            
+        Yields:
+            Message objects from the Assistants API
         """
-        Export the conversation history to a JSON file.
+        while True:
+            params = {"thread_id": thread_id, "order": "asc", "limit": Config.HISTORY_PAGE_SIZE}
+            if after:
+                params["after"] = after
+            page = self.client.beta.threads.messages.list(**params)
+            
+            for msg in page.data:
+                yield msg
+            
+            if not page.has_more or not page.data:
+                return
+            after = page.data[-1].id
+
+    def export_conversation(self, filename: str = None, session: Optional[NovaSession] = None) -> str:
+        """
+        Export the conversation history to a file.
+        
+        ``.jsonl`` files (optionally ``.jsonl.gz``) are written one message per
+        line, oldest first, while pages are still being fetched, so memory use
+        does not grow with the thread length. ``.json`` files keep the legacy
+        single-document format.
         
         Args:
-            filename (str): The filename to save to (optional)
+            filename (str): The filename to save to (optional, defaults to a timestamped .jsonl)
+            session (NovaSession, optional): Conversation to export instead of this client's thread
             
         Returns:
             str: The filename where the conversation was saved
         """
         if not filename:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"nova_conversation_{timestamp}.json"
+            filename = f"nova_conversation_{timestamp}.jsonl"
         
-        history = self.get_conversation_history()
+        if not self._is_jsonl(filename):
+            history = self.get_conversation_history(session)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(history, f, indent=2, ensure_ascii=False)
+            return filename
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(history, f, indent=2, ensure_ascii=False)
+        thread_id = (session or self).thread_id
+        with self._open_text(filename, 'w') as f:
+            if thread_id:
+                for msg in self.iter_thread_messages(thread_id):
+                    if msg.role in ["user", "assistant"]:
+                        content = msg.content[0].text.value if msg.content else ""
+                        f.write(json.dumps({
+                            "role": msg.role,
+                            "content": content,
+                            "timestamp": msg.created_at
+                        }, ensure_ascii=False))
+                        f.write("\n")
         
         return filename
 
-    def import_conversation(self, filename: str) -> bool:
+    def import_conversation(self, filename: str, session: Optional[NovaSession] = None,
+                            overflow: str = "append") -> bool:
         """
-        Import a conversation history from a JSON file.
+        Import a conversation history from a JSON or JSONL file.
+        
+        The new thread is created together with its messages in a single
+        request. The API accepts at most ``Config.THREAD_SEED_MESSAGE_LIMIT``
+        messages that way; longer histories are handled according to
+        ``overflow``.
         
         Args:
             filename (str): The filename to load from
+            session (NovaSession, optional): Conversation to import into instead of this client
+            overflow (str): "append" (the default) keeps every message as-is and adds the ones
+                            beyond the limit one request at a time, so the import round-trips;
+                            "pack" folds the oldest messages into transcript messages so the
+                            import stays a single request, at the cost of rewriting them
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                history = json.load(f)
-            
-            # Create a new thread
-            self.create_thread()
-            
-            # Add messages to the thread
-            for msg in history:
-                if msg["role"] == "user":
-                    self.client.beta.threads.messages.create(
-                        thread_id=self.thread_id,
-                        role="user",
-                        content=msg["content"]
-                    )
-                elif msg["role"] == "assistant":
-                    self.client.beta.threads.messages.create(
-                        thread_id=self.thread_id,
-                        role="assistant",
-                        content=msg["content"]
-                    )
+            messages, remaining = self._seed_messages(self._load_history(filename), overflow)
+            
+            # Create the thread already seeded with the history
+            thread = self.client.beta.threads.create(messages=messages)
+            conversation = session or self
+            conversation.thread_id = thread.id
+            conversation.history_sync = None
+            
+            for msg in remaining:
+                self.client.beta.threads.messages.create(
+                    thread_id=thread.id,
+                    role=msg["role"],
+                    content=msg["content"]
+                )
             
             return True
             
@@ -368,24 +1685,160 @@ class NovaClient:
             print(f"Error importing conversation: {e}")
             return False
 
-    def get_usage_stats(self) -> Dict[str, Any]:
+    @classmethod
+    def _load_history(cls, filename: str) -> List[Dict[str, Any]]:
+        """Read an exported history, oldest message first."""
+        if cls._is_jsonl(filename):
+            with cls._open_text(filename, 'r') as f:
+                return [json.loads(line) for line in f if line.strip()]
+        with open(filename, 'r', encoding='utf-8') as f:
+            history = json.load(f)
+        # Legacy exports list the newest message first
+        if len(history) > 1 and history[0].get("timestamp", 0) > history[-1].get("timestamp", 0):
+            history.reverse()
+        return history
+
+    @classmethod
+    def _seed_messages(cls, history: List[Dict[str, Any]], overflow: str) -> tuple:
+        """
+        Split a history into the messages a new thread is created with and the rest.
+        
+        Returns:
+            Tuple of (seed messages, messages to append one by one), see import_conversation
+        """
+        messages = [
+            {"role": msg["role"], "content": msg["content"]}
+            for msg in history
+            if msg["role"] in ("user", "assistant") and msg["content"]
+        ]
+        
+        limit = Config.THREAD_SEED_MESSAGE_LIMIT
+        if len(messages) <= limit:
+            return messages, []
+        if overflow == "pack":
+            return cls._pack_messages(messages, limit), []
+        if overflow == "append":
+            return messages[:limit], messages[limit:]
+        raise ValueError(f"Unknown overflow mode: {overflow}")
+
+    @staticmethod
+    def _pack_messages(messages: List[Dict[str, str]], limit: int) -> List[Dict[str, str]]:
+        """
+        Fit a history into ``limit`` messages by folding the oldest ones into transcripts.
+        
+        The most recent messages are kept verbatim; everything before them is
+        rendered as "User:/NOVA:" transcript text in as few user messages as
+        the per-message size limit allows.
+        
+        Raises:
+            ValueError: If the history cannot be packed without cutting text, i.e. a single
+                        message exceeds ``Config.THREAD_MESSAGE_MAX_CHARS`` or the transcripts
+                        alone need more than ``limit`` messages
+        """
+        max_chars = Config.THREAD_MESSAGE_MAX_CHARS
+        packed_count = 1
+        while True:
+            keep = max(0, limit - packed_count)
+            older = messages[:len(messages) - keep]
+            recent = messages[len(messages) - keep:] if keep else []
+            
+            transcripts, current = [], "Earlier conversation:\n"
+            for msg in older:
+                speaker = "User" if msg["role"] == "user" else "NOVA"
+                line = f"{speaker}: {msg['content']}\n"
+                if len(current) + len(line) > max_chars and current.strip() != "Earlier conversation:":
+                    transcripts.append(current)
+                    current = "Earlier conversation (continued):\n"
+                current += line
+            transcripts.append(current)
+            
+            if any(len(text) > max_chars for text in transcripts):
+                raise ValueError(f"A message is longer than {max_chars} characters and cannot be packed")
+            if len(transcripts) <= packed_count:
+                return [{"role": "user", "content": text} for text in transcripts] + recent
+            if keep == 0:
+                raise ValueError(f"History does not fit in {limit} packed messages")
+            packed_count = len(transcripts)
+
+    @staticmethod
+    def _is_jsonl(filename: str) -> bool:
+        return filename.endswith((".jsonl", ".jsonl.gz"))
+
+    @staticmethod
+    def _open_text(filename: str, mode: str):
+        """Open a text file, transparently gzip-compressed when it ends with .gz."""
+        if filename.endswith(".gz"):
+            return gzip.open(filename, mode + 't', encoding='utf-8')
+        return open(filename, mode, encoding='utf-8')
+
+    def _record_usage(self, session: Optional[NovaSession], model: Optional[str], usage: Any):
+        """Add one request to the conversation's and the process-wide usage counters."""
+        (session or self).usage.record(model, usage)
+        process_usage.record(model, usage)
+
+    def get_usage_stats(self, session: Optional[NovaSession] = None) -> Dict[str, Any]:
         """
         Get usage statistics for the current session.
         
+        Token counts come from the ``usage`` reported by chat completions and
+        completed runs; costs are estimated from ``Config.MODEL_PRICES``.
+        
+        Args:
+            session (NovaSession, optional): Session to report instead of this client's conversation
+            
         Returns:
-            Dict containing usage statistics
+            Dict containing usage statistics, with process-wide totals under "process"
         """
         try:
-            # This is a placeholder - OpenAI doesn't provide real-time usage stats
-            # You would need to track this yourself or use the usage API
-            return {
-                "messages_sent": 0,  # Placeholder
-                "tokens_used": 0,    # Placeholder
-                "cost_estimate": 0.0  # Placeholder
-            }
+            stats = (session or self).usage.snapshot()
+            stats["process"] = process_usage.snapshot()
+            return stats
         except Exception as e:
             return {"error": str(e)}
 
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """
+        Get counters of the request scheduler shared by this client.
+        
+        Returns:
+            Dict with requests, throttled requests, wait time, retries, 429s, failures and queue length
+        """
+        return self.scheduler.stats()
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles of each request stage.
+        
+        Stages are the API calls behind a reply (``threads.create``,
+        ``messages.create``, ``runs.create``, ``runs.stream``, ``runs.poll``,
+        ``messages.list``, ``chat.completions.create``) plus the end-to-end
+        ``send_message`` and ``stream_message`` spans, split by mode.
+        
+        Returns:
+            Dict keyed by "stage[mode]" with count, errors, mean, p50, p95, p99 and max in seconds
+        """
+        return self.instrumentation.latency_stats()
+
+    def export_metrics(self, format: str = "prometheus") -> Any:
+        """
+        Export process-wide usage counters and stage latencies in a machine-readable format.
+        
+        Args:
+            format (str): "prometheus" for the text exposition format, "json" for a dict
+            
+        Returns:
+            str or dict with the metrics
+        """
+        usage = process_usage.snapshot()
+        latency = self.get_latency_stats()
+        if format == "json":
+            return {"usage": usage, "latency": latency, "caches": self.get_cache_stats(),
+                    "structured_output": self.get_structured_output_stats(),
+                    "scheduler": self.get_scheduler_stats()}
+        return (render_prometheus(usage) + render_prometheus_latency(latency)
+                + render_prometheus_coalescing(self._chat_flights.stats())
+                + render_prometheus_scheduler(self.get_scheduler_stats()))
+
     def __str__(self) -> str:
         """String representation of the NOVA client."""
         return f"NovaClient(assistant_id={self.assistant_id}, thread_id={self.thread_id})"
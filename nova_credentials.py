@@ -0,0 +1,97 @@
+import os
+import sys
+from typing import Callable, List, Optional
+from config import Config
+
+# A credential source maps a setting name (e.g. "OPENAI_API_KEY") to its value, or None
+CredentialSource = Callable[[str], Optional[str]]
+
+# Where Streamlit looks for secrets.toml, relative to the working directory and home
+STREAMLIT_SECRETS_PATHS = (
+    os.path.join(".streamlit", "secrets.toml"),
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+)
+
+
+def environment_source(name: str) -> Optional[str]:
+    """Read a credential from the environment (including a loaded .env file)."""
+    return os.getenv(name)
+
+
+def streamlit_secrets_source(name: str) -> Optional[str]:
+    """
+    Read a credential from Streamlit secrets.
+
+    Streamlit is only imported when it is already loaded (the app is running)
+    or a secrets.toml exists, so headless workers never pay for importing it.
+
+    Args:
+        name (str): The secret's name
+
+    Returns:
+        str or None: The secret, if it is set
+    """
+    if "streamlit" not in sys.modules and not any(os.path.exists(path) for path in STREAMLIT_SECRETS_PATHS):
+        return None
+    try:
+        import streamlit as st
+        return st.secrets.get(name)
+    except Exception:
+        # Streamlit not installed or no secrets file
+        return None
+
+
+# Consulted in order after an explicitly passed value
+credential_sources: List[CredentialSource] = [environment_source, streamlit_secrets_source]
+
+
+def register_credential_source(source: CredentialSource, first: bool = False):
+    """
+    Add a place credentials are looked up, e.g. a secrets manager.
+
+    Args:
+        source: Callable taking a setting name and returning its value or None
+        first (bool): Consult it before the built-in sources
+    """
+    if first:
+        credential_sources.insert(0, source)
+    else:
+        credential_sources.append(source)
+
+
+def resolve_credential(name: str, value: Optional[str] = None) -> Optional[str]:
+    """
+    Resolve a setting from an explicit value or the registered sources.
+
+    Args:
+        name (str): The setting's name
+        value (str, optional): Explicitly passed value, used when given
+
+    Returns:
+        str or None: The first value found
+    """
+    if value:
+        return value
+    for source in credential_sources:
+        found = source(name)
+        if found:
+            return found
+    return None
+
+
+def resolve_api_key(api_key: Optional[str] = None) -> str:
+    """
+    Resolve the OpenAI API key from the argument or the credential sources.
+
+    Raises:
+        ValueError: If no API key can be found
+    """
+    api_key = resolve_credential('OPENAI_API_KEY', api_key)
+    if not api_key:
+        raise ValueError("OpenAI API key is required. Set OPENAI_API_KEY environment variable or pass it directly.")
+    return api_key
+
+
+def resolve_assistant_id(assistant_id: Optional[str] = None) -> str:
+    """Resolve the assistant ID from the argument or the credential sources."""
+    return resolve_credential('OPENAI_ASSISTANT_ID', assistant_id) or Config.ASSISTANT_ID
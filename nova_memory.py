@@ -0,0 +1,204 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+from config import Config
+
+# Tokens the API adds around every chat message (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text without a tokenizer.
+
+    BPE tokenizers average about four bytes of UTF-8 per token, so the byte
+    length is a fast estimate that also accounts for non-English text.
+
+    Args:
+        text (str): The text to measure
+
+    Returns:
+        int: Estimated token count
+    """
+    return len(text.encode("utf-8")) // 4 + 1
+
+
+def estimate_message_tokens(content: str) -> int:
+    """Estimate the tokens of one chat message, including its overhead."""
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ChatMemory:
+    """
+    Local conversation history for chat-completions mode with a token budget.
+
+    Turns are kept in order with their estimated token counts. When the
+    total exceeds ``token_budget`` the oldest turns are either dropped
+    ("truncate") or folded into a running summary ("summarize"), so the
+    history sent with each request stays bounded.
+    """
+
+    def __init__(self, token_budget: int = Config.CHAT_MEMORY_TOKEN_BUDGET,
+                 strategy: str = Config.CHAT_MEMORY_STRATEGY,
+                 summarizer: Optional[Callable[[str, List[Dict[str, str]]], str]] = None,
+                 summary_tokens: int = Config.CHAT_MEMORY_SUMMARY_TOKENS):
+        """
+        Initialize the memory.
+
+        Args:
+            token_budget (int): Maximum estimated tokens of history (summary included)
+            strategy (str): "truncate" to drop the oldest turns, "summarize" to fold them into a summary
+            summarizer: Callable taking (previous summary, turns to fold) and returning the new summary.
+                        Required for "summarize"; without it the memory truncates.
+            summary_tokens (int): Maximum estimated tokens kept of a summary
+        """
+        if strategy not in ("truncate", "summarize"):
+            raise ValueError(f"Unknown chat memory strategy: {strategy}")
+        self.token_budget = token_budget
+        self.strategy = strategy
+        self.summarizer = summarizer
+        self.summary_tokens = summary_tokens
+        self.summary = ""
+        self._summary_cost = 0
+        self._turns: deque = deque()
+        self._tokens = 0
+        self._lock = threading.Lock()
+        # A summary is being made outside the lock; bumped by clear() to invalidate it
+        self._summarizing = False
+        self._generation = 0
+        self._counters = {"dropped_turns": 0, "summarized_turns": 0, "summaries": 0}
+
+    @property
+    def tokens(self) -> int:
+        """Estimated tokens of the history that would be sent."""
+        return self._tokens + self._summary_cost
+
+    def add(self, role: str, content: str):
+        """
+        Append a turn and compact the history if it exceeds the budget.
+
+        A summarizer call runs without holding the memory's lock, so other
+        readers and writers of the conversation are not blocked by it.
+
+        Args:
+            role (str): "user" or "assistant"
+            content (str): The message text
+        """
+        with self._lock:
+            cost = estimate_message_tokens(content)
+            self._turns.append((role, content, cost))
+            self._tokens += cost
+            if self.tokens <= self.token_budget:
+                return
+            fold = self._turns_to_fold()
+            if not fold:
+                self._truncate()
+                return
+            self._summarizing = True
+            summary, generation = self.summary, self._generation
+
+        try:
+            new_summary = self.summarizer(summary, [{"role": turn[0], "content": turn[1]} for turn in fold])
+        except Exception as e:
+            print(f"Error summarizing chat history: {e}")
+            new_summary = None
+
+        with self._lock:
+            self._summarizing = False
+            # Splice the summary in only if the folded turns are still the oldest ones
+            unchanged = (generation == self._generation and self.summary == summary
+                         and len(self._turns) >= len(fold)
+                         and all(self._turns[i] is turn for i, turn in enumerate(fold)))
+            if new_summary is not None and unchanged:
+                for _ in fold:
+                    self._tokens -= self._turns.popleft()[2]
+                self._set_summary(new_summary)
+                self._counters["summarized_turns"] += len(fold)
+                self._counters["summaries"] += 1
+            self._truncate()
+
+    def _turns_to_fold(self) -> list:
+        """The oldest turns to summarize so half the budget is free (empty when not summarizing)."""
+        if self.strategy != "summarize" or self.summarizer is None or self._summarizing:
+            return []
+        fold, tokens = [], self.tokens
+        # Fold until half the budget is free, so summaries stay infrequent
+        for turn in list(self._turns)[:-1]:
+            if tokens <= self.token_budget // 2:
+                break
+            fold.append(turn)
+            tokens -= turn[2]
+        return fold
+
+    def _truncate(self):
+        """Drop the oldest turns until the history fits the budget."""
+        # While a summary is being made the turns it folds must stay; messages() still respects the budget
+        if self._summarizing:
+            return
+        while self._turns and self.tokens > self.token_budget:
+            _, _, cost = self._turns.popleft()
+            self._tokens -= cost
+            self._counters["dropped_turns"] += 1
+
+    def _set_summary(self, summary: str):
+        summary = (summary or "").strip()
+        # Keep the summary itself within its share of the budget
+        max_bytes = min(self.summary_tokens, self.token_budget // 4) * 4
+        encoded = summary.encode("utf-8")
+        if len(encoded) > max_bytes:
+            summary = encoded[:max_bytes].decode("utf-8", errors="ignore")
+        self.summary = summary
+        self._summary_cost = estimate_message_tokens(self._summary_message()["content"]) if summary else 0
+
+    def _summary_message(self) -> Dict[str, str]:
+        return {"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"}
+
+    def messages(self, reserve_tokens: int = 0) -> List[Dict[str, str]]:
+        """
+        Get the history to send before the next message, oldest first.
+
+        Args:
+            reserve_tokens (int): Budget to leave free, e.g. for the next message
+
+        Returns:
+            List of chat messages: the summary (if any) followed by the most recent turns
+        """
+        with self._lock:
+            available = self.token_budget - reserve_tokens - self._summary_cost
+            recent = []
+            for role, content, cost in reversed(self._turns):
+                if cost > available:
+                    break
+                available -= cost
+                recent.append({"role": role, "content": content})
+            recent.reverse()
+            if self.summary:
+                recent.insert(0, self._summary_message())
+            return recent
+
+    def clear(self):
+        """Forget every turn and the summary."""
+        with self._lock:
+            self._turns.clear()
+            self._tokens = 0
+            self.summary = ""
+            self._summary_cost = 0
+            self._generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get memory counters.
+
+        Returns:
+            Dict with turns kept, estimated tokens, budget and compaction counters
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["turns"] = len(self._turns)
+            stats["tokens"] = self.tokens
+            stats["token_budget"] = self.token_budget
+            stats["has_summary"] = bool(self.summary)
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._turns)
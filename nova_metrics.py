@@ -0,0 +1,414 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+
+
+def model_price(model: Optional[str], prices: Dict[str, Tuple[float, float]]) -> Optional[Tuple[float, float]]:
+    """
+    Find the (input, output) price per million tokens for a model.
+
+    Dated snapshots such as "gpt-4o-mini-2024-07-18" match the longest
+    configured prefix.
+
+    Returns:
+        Tuple of prices, or None when the model is not in the table
+    """
+    if not model:
+        return None
+    if model in prices:
+        return prices[model]
+    matches = [name for name in prices if model.startswith(name)]
+    return prices[max(matches, key=len)] if matches else None
+
+
+class UsageTracker:
+    """
+    Thread-safe counters for messages, tokens and estimated cost.
+
+    One tracker exists per conversation and one for the whole process
+    (``process_usage``).
+    """
+
+    def __init__(self, prices: Optional[Dict[str, Tuple[float, float]]] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            prices (dict, optional): Model name to (input, output) USD per million tokens.
+                                     Defaults to Config.MODEL_PRICES.
+        """
+        self.prices = prices if prices is not None else Config.MODEL_PRICES
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Zero every counter."""
+        with self._lock:
+            self._totals = self._empty()
+            self._by_model: Dict[str, Dict[str, Any]] = {}
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {
+            "messages_sent": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "tokens_used": 0,
+            "cost_estimate": 0.0,
+            "unpriced_tokens": 0
+        }
+
+    def record(self, model: Optional[str], usage: Any = None, messages: int = 1):
+        """
+        Add one request to the counters.
+
+        Args:
+            model (str): Model that served the request
+            usage: ``usage`` object from a chat completion or run (may be None)
+            messages (int): Number of messages sent by the request
+        """
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+
+        price = model_price(model, self.prices)
+        cost = 0.0
+        if price is not None:
+            cost = (prompt_tokens * price[0] + completion_tokens * price[1]) / 1_000_000
+
+        with self._lock:
+            per_model = self._by_model.setdefault(model or "unknown", self._empty())
+            for counters in (self._totals, per_model):
+                counters["messages_sent"] += messages
+                counters["prompt_tokens"] += prompt_tokens
+                counters["completion_tokens"] += completion_tokens
+                counters["cached_tokens"] += cached_tokens
+                counters["tokens_used"] += prompt_tokens + completion_tokens
+                counters["cost_estimate"] += cost
+                if price is None:
+                    counters["unpriced_tokens"] += prompt_tokens + completion_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the counters.
+
+        Returns:
+            Dict with totals and a per-model breakdown under "by_model", each with
+            "prompt_cache_hit_rate" (share of prompt tokens served from the upstream cache)
+        """
+        with self._lock:
+            snapshot = self._with_hit_rate(self._totals)
+            snapshot["by_model"] = {model: self._with_hit_rate(counters) for model, counters in self._by_model.items()}
+        return snapshot
+
+    @staticmethod
+    def _with_hit_rate(counters: Dict[str, Any]) -> Dict[str, Any]:
+        counters = dict(counters)
+        prompt_tokens = counters["prompt_tokens"]
+        counters["prompt_cache_hit_rate"] = counters["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+        return counters
+
+
+# Counters for every NovaClient in this process
+process_usage = UsageTracker()
+
+
+def _prometheus_name(name: str) -> str:
+    return "nova_" + name
+
+
+def render_prometheus(usage: Dict[str, Any]) -> str:
+    """
+    Render a UsageTracker snapshot in the Prometheus text exposition format.
+
+    Args:
+        usage (dict): Result of ``UsageTracker.snapshot()``
+
+    Returns:
+        str: Metrics text, one sample per model and counter
+    """
+    lines = []
+    for counter in ("messages_sent", "prompt_tokens", "completion_tokens", "cached_tokens", "cost_estimate"):
+        name = _prometheus_name(counter + ("_usd" if counter == "cost_estimate" else "") + "_total")
+        lines.append(f"# TYPE {name} counter")
+        for model, counters in sorted(usage.get("by_model", {}).items()):
+            lines.append(f'{name}{{model="{model}"}} {counters[counter]}')
+    return "\n".join(lines) + "\n"
+
+
+class Span:
+    """
+    Timing of one stage of a request, e.g. ``runs.create`` or ``runs.poll``.
+
+    Used as a context manager; attributes such as ``thread_id``, ``run_id``
+    and ``mode`` can be added while the stage is running with ``set``.
+    """
+
+    __slots__ = ("name", "attributes", "parent", "start", "end", "error", "_instrumentation", "_previous")
+
+    def __init__(self, instrumentation: "Instrumentation", name: str, attributes: Dict[str, Any]):
+        self.name = name
+        self.attributes = attributes
+        self.parent: Optional["Span"] = None
+        self.start = 0.0
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+        self._instrumentation = instrumentation
+        self._previous: Optional["Span"] = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Seconds the stage took, or None while it is running."""
+        return None if self.end is None else self.end - self.start
+
+    def set(self, **attributes):
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        local = self._instrumentation._local
+        self._previous = getattr(local, "span", None)
+        self.parent = self._previous
+        local.span = self
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self._instrumentation._local.span = self._previous
+        self._instrumentation._finish(self)
+        return False
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, duration={self.duration}, attributes={self.attributes})"
+
+
+class _NoopSpan:
+    """Stand-in returned by ``Instrumentation.span`` when instrumentation is off."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class Instrumentation:
+    """
+    Span timing with pluggable hooks and per-stage latency histograms.
+
+    Every finished span is added to a histogram keyed by span name and its
+    ``mode`` attribute, then passed to each registered hook (for logging or
+    forwarding to a tracing backend). When disabled, ``span`` returns a shared
+    no-op object so instrumented code pays only an attribute check.
+    """
+
+    def __init__(self, enabled: bool = Config.INSTRUMENTATION_ENABLED, max_samples: int = Config.LATENCY_SAMPLE_SIZE):
+        """
+        Initialize the instrumentation.
+
+        Args:
+            enabled (bool): Whether spans are recorded
+            max_samples (int): Most recent durations kept per histogram
+        """
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self._hooks: List[Callable[[Span], None]] = []
+        self._histograms: Dict[Tuple[str, Optional[str]], deque] = {}
+        self._counts: Dict[Tuple[str, Optional[str]], int] = {}
+        self._errors: Dict[Tuple[str, Optional[str]], int] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def span(self, name: str, **attributes) -> Any:
+        """
+        Start timing a stage.
+
+        Args:
+            name (str): Stage name, e.g. "messages.create"
+            **attributes: Initial attributes such as thread_id or mode
+
+        Returns:
+            A Span (or a no-op stand-in) to use as a context manager
+        """
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def observe(self, name: str, start: float, end: float, **attributes):
+        """
+        Record a stage timed by the caller.
+
+        Used where a ``with`` block cannot be, e.g. across the yields of a
+        streaming generator.
+
+        Args:
+            name (str): Stage name
+            start (float): ``time.perf_counter()`` when the stage began
+            end (float): ``time.perf_counter()`` when the stage ended
+            **attributes: Span attributes such as thread_id or mode
+        """
+        if not self.enabled:
+            return
+        span = Span(self, name, attributes)
+        span.parent = self.current_span()
+        span.start = start
+        span.end = end
+        self._finish(span)
+
+    def current_span(self) -> Optional[Span]:
+        """Get the innermost running span of the calling thread."""
+        return getattr(self._local, "span", None)
+
+    def add_hook(self, hook: Callable[[Span], None]):
+        """
+        Register a callable that receives every finished span.
+
+        Args:
+            hook: Callable taking a Span; exceptions it raises are printed and ignored
+        """
+        with self._lock:
+            self._hooks = self._hooks + [hook]
+
+    def remove_hook(self, hook: Callable[[Span], None]):
+        """Unregister a hook added with ``add_hook``."""
+        with self._lock:
+            self._hooks = [h for h in self._hooks if h is not hook]
+
+    def _finish(self, span: Span):
+        key = (span.name, span.attributes.get("mode"))
+        with self._lock:
+            samples = self._histograms.get(key)
+            if samples is None:
+                samples = self._histograms[key] = deque(maxlen=self.max_samples)
+            samples.append(span.duration)
+            self._counts[key] = self._counts.get(key, 0) + 1
+            if span.error is not None:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            hooks = self._hooks
+
+        for hook in hooks:
+            try:
+                hook(span)
+            except Exception as e:
+                print(f"Error in instrumentation hook: {e}")
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get latency percentiles per stage and mode.
+
+        Returns:
+            Dict keyed by "name" or "name[mode]" with count, errors, mean, p50, p95, p99
+            and max in seconds (percentiles cover the most recent samples)
+        """
+        with self._lock:
+            snapshot = {key: (sorted(samples), self._counts[key], self._errors.get(key, 0))
+                        for key, samples in self._histograms.items()}
+
+        stats = {}
+        for (name, mode), (ordered, count, errors) in sorted(snapshot.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            label = f"{name}[{mode}]" if mode else name
+            stats[label] = {
+                "name": name,
+                "mode": mode,
+                "count": count,
+                "errors": errors,
+                "mean": sum(ordered) / len(ordered),
+                "p50": _percentile(ordered, 0.50),
+                "p95": _percentile(ordered, 0.95),
+                "p99": _percentile(ordered, 0.99),
+                "max": ordered[-1]
+            }
+        return stats
+
+    def reset(self):
+        """Drop every recorded sample."""
+        with self._lock:
+            self._histograms.clear()
+            self._counts.clear()
+            self._errors.clear()
+
+
+# Spans and latency histograms for every NovaClient in this process
+process_instrumentation = Instrumentation()
+
+
+def render_prometheus_latency(latency: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Render ``Instrumentation.latency_stats()`` as a Prometheus summary.
+
+    Args:
+        latency (dict): Result of ``Instrumentation.latency_stats()``
+
+    Returns:
+        str: Metrics text with p50/p95/p99 quantiles per stage and mode
+    """
+    name = _prometheus_name("stage_latency_seconds")
+    lines = [f"# TYPE {name} summary"]
+    for stats in latency.values():
+        labels = f'stage="{stats["name"]}",mode="{stats["mode"] or ""}"'
+        for quantile in ("p50", "p95", "p99"):
+            lines.append(f'{name}{{{labels},quantile="0.{quantile[1:]}"}} {stats[quantile]}')
+        lines.append(f"{name}_count{{{labels}}} {stats['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def render_prometheus_coalescing(stats: Dict[str, Any]) -> str:
+    """
+    Render ``SingleFlight.stats()`` of the chat request coalescer as Prometheus counters.
+
+    Args:
+        stats (dict): Result of ``SingleFlight.stats()``
+
+    Returns:
+        str: Metrics text with upstream (leader) and coalesced request counts
+    """
+    lines = []
+    for counter, metric in (("leaders", "upstream_chat_requests_total"), ("coalesced", "coalesced_chat_requests_total")):
+        name = _prometheus_name(metric)
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {stats.get(counter, 0)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_prometheus_scheduler(stats: Dict[str, Any]) -> str:
+    """
+    Render ``RequestScheduler.stats()`` in the Prometheus text exposition format.
+
+    Args:
+        stats (dict): Result of ``RequestScheduler.stats()``
+
+    Returns:
+        str: Metrics text with scheduler counters and the current queue length
+    """
+    lines = []
+    for counter, metric in (("requests", "scheduled_requests_total"), ("throttled", "throttled_requests_total"),
+                            ("wait_time", "scheduler_wait_seconds_total"), ("retries", "request_retries_total"),
+                            ("rate_limited", "rate_limited_responses_total"), ("failures", "failed_requests_total"),
+                            ("timeouts", "scheduler_timeouts_total")):
+        name = _prometheus_name(metric)
+        lines.append(f"# TYPE {name} counter")
+        lines.append(f"{name} {stats.get(counter, 0)}")
+    name = _prometheus_name("scheduler_queued_requests")
+    lines.append(f"# TYPE {name} gauge")
+    lines.append(f"{name} {stats.get('queued', 0)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,469 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+# Schema of NOVA's crafted-message payload:
+# {"messages": [{"message": "..."}, ...], "cta": "..."}
+NOVA_PAYLOAD_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "messages": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "message": {"type": "string"}
+                },
+                "required": ["message"]
+            }
+        },
+        # Saved replies may carry a null or empty CTA, which is simply not shown
+        "cta": {"type": ["string", "null"]}
+    },
+    "required": ["messages", "cta"]
+}
+
+# Strict variant sent as ``response_format`` so the model is constrained to
+# the payload shape (strict mode needs every field required and no extras)
+NOVA_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "nova_payload",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "messages": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "message": {"type": "string"}
+                        },
+                        "required": ["message"],
+                        "additionalProperties": False
+                    }
+                },
+                "cta": {"type": "string"}
+            },
+            "required": ["messages", "cta"],
+            "additionalProperties": False
+        }
+    }
+}
+
+_JSON_TYPES = {
+    "object": dict,
+    "array": list,
+    "string": str,
+    "integer": int,
+    "number": (int, float),
+    "boolean": bool,
+    "null": type(None)
+}
+
+
+def validate(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
+    """
+    Check a decoded JSON value against a schema.
+
+    Supports the JSON Schema keywords NOVA payloads use: ``type``,
+    ``properties``, ``required``, ``items``, ``enum`` and
+    ``additionalProperties: false``.
+
+    Args:
+        value: The decoded JSON value
+        schema (dict): The schema to check against
+        path (str): Location of ``value`` used in error messages
+
+    Returns:
+        List of error messages, empty when the value is valid
+    """
+    expected = schema.get("type")
+    if expected is not None:
+        types = expected if isinstance(expected, list) else [expected]
+        matches = any(
+            isinstance(value, _JSON_TYPES[name]) and not (isinstance(value, bool) and name in ("integer", "number"))
+            for name in types
+        )
+        if not matches:
+            return [f"{path}: expected {' or '.join(types)}, got {type(value).__name__}"]
+
+    errors = []
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} is not one of {schema['enum']}")
+
+    if isinstance(value, dict):
+        properties = schema.get("properties", {})
+        for name in schema.get("required", []):
+            if name not in value:
+                errors.append(f"{path}: missing required field '{name}'")
+        for name, item in value.items():
+            if name in properties:
+                errors.extend(validate(item, properties[name], f"{path}.{name}"))
+            elif schema.get("additionalProperties") is False:
+                errors.append(f"{path}: unexpected field '{name}'")
+    elif isinstance(value, list) and "items" in schema:
+        for index, item in enumerate(value):
+            errors.extend(validate(item, schema["items"], f"{path}[{index}]"))
+    return errors
+
+
+class StreamingPayloadParser:
+    """
+    Incremental parser for NOVA's ``{"messages": [...], "cta": ...}`` payload.
+
+    Chunks of a streamed reply are fed in as they arrive. Each crafted
+    message is decoded and validated as soon as its JSON object closes, and
+    the CTA as soon as its string closes, so the UI can show them long before
+    the whole document has arrived. Every character is scanned once.
+
+    Replies that do not start with ``{`` (after an optional code fence) are
+    treated as plain text as soon as that is certain and no further scanning
+    is done (a leading backtick waits until it cannot open a fence); a
+    structural error stops scanning at the offending character.
+    """
+
+    def __init__(self, schema: Dict[str, Any] = NOVA_PAYLOAD_SCHEMA):
+        """
+        Initialize the parser.
+
+        Args:
+            schema (dict): Schema the complete payload is validated against
+        """
+        self.schema = schema
+        self.messages: List[Dict[str, Any]] = []
+        self.cta: Optional[str] = None
+        self.fields: Dict[str, Any] = {}
+        self.errors: List[str] = []
+        # None until the first significant character decides it
+        self.is_structured: Optional[bool] = None
+        self.complete = False
+
+        self._buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """The reply text fed so far."""
+        return self._buffer
+
+    @property
+    def failed(self) -> bool:
+        """Whether the reply looked like a payload but turned out malformed."""
+        return self.is_structured is True and bool(self.errors)
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add the next chunk of the reply.
+
+        Args:
+            chunk (str): Text delta of the streamed reply
+
+        Returns:
+            List of ("message", item) and ("cta", text) events completed by this chunk
+        """
+        self._buffer += chunk
+        # A complete payload is still scanned, so text after it is rejected
+        if self.is_structured is False or self.errors:
+            return []
+        if self.is_structured is None and not self._detect():
+            return []
+
+        events: List[Tuple[str, Any]] = []
+        try:
+            self._scan(events)
+        except ValueError as e:
+            self.errors.append(str(e))
+        return events
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """
+        Finish parsing once the reply is complete.
+
+        Returns:
+            The payload dict when the reply was a complete, schema-valid payload, else None
+        """
+        if self.is_structured is None:
+            self._detect()
+        if self.is_structured is not True or self.errors:
+            return None
+        if not self.complete:
+            self.errors.append("$: payload is incomplete")
+            return None
+
+        payload = dict(self.fields)
+        self.errors.extend(validate(payload, self.schema))
+        return payload if not self.errors else None
+
+    def _detect(self) -> bool:
+        """Decide from the first significant characters whether the reply is JSON."""
+        text = self._buffer.lstrip()
+        if not text or "```".startswith(text):
+            # Nothing yet, or possibly the start of a code fence
+            return False
+        if text.startswith("```"):
+            # Skip a ```json fence once its first line is complete
+            newline = text.find("\n")
+            if newline == -1:
+                return False
+            body = text[newline + 1:].lstrip()
+            if not body:
+                return False
+            self.is_structured = body.startswith("{")
+            if self.is_structured:
+                fence = self._buffer.index("```")
+                self._pos = self._buffer.index("{", self._buffer.index("\n", fence))
+            return self.is_structured
+        self.is_structured = text.startswith("{")
+        if self.is_structured:
+            self._pos = self._buffer.index("{")
+        return self.is_structured
+
+    def _scan(self, events: List[Tuple[str, Any]]):
+        buffer = self._buffer
+        stack = self._stack
+        pos = self._pos
+        end = len(buffer)
+        while pos < end:
+            char = buffer[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close_string(pos, events)
+                pos += 1
+                continue
+
+            if self.complete:
+                if not char.isspace() and char != "`":
+                    raise ValueError(f"unexpected {char!r} after the payload")
+                pos += 1
+                continue
+
+            depth = len(stack)
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._expect_key:
+                    self._key_start = pos
+                else:
+                    self._start_value(pos, depth)
+            elif char in "{[":
+                self._start_value(pos, depth)
+                stack.append(char)
+            elif char in "}]":
+                if not stack or (char == "}") != (stack[-1] == "{"):
+                    raise ValueError(f"unbalanced {char!r} at offset {pos}")
+                if char == "]" and depth == 2 and self._item_start is not None:
+                    self._finish_item(pos, events)
+                stack.pop()
+                if len(stack) == 2 and self._in_messages():
+                    self._finish_item(pos + 1, events)
+                elif len(stack) == 1:
+                    self._finish_value(pos + 1, events)
+                elif not stack:
+                    if self._value_start is not None:
+                        self._finish_value(pos, events)
+                    self.complete = True
+            elif char == ",":
+                if depth == 1:
+                    if self._value_start is not None:
+                        self._finish_value(pos, events)
+                    self._expect_key = True
+                elif depth == 2 and self._item_start is not None:
+                    self._finish_item(pos, events)
+            elif char == ":":
+                if depth == 1:
+                    if self._key is None:
+                        raise ValueError(f"unexpected ':' at offset {pos}")
+                    self._expect_key = False
+            elif not char.isspace():
+                if depth == 0:
+                    raise ValueError(f"unexpected {char!r} at offset {pos}")
+                self._start_value(pos, depth)
+            pos += 1
+
+            if not stack and not self.complete:
+                raise ValueError("payload is not a JSON object")
+        self._pos = pos
+
+    def _in_messages(self) -> bool:
+        return self._key == "messages" and self._stack[1] == "["
+
+    def _start_value(self, pos: int, depth: int):
+        if depth == 0:
+            # The opening brace of the payload itself
+            self._expect_key = True
+            return
+        if depth == 1 and self._value_start is None:
+            if self._expect_key:
+                raise ValueError(f"expected a field name at offset {pos}")
+            self._value_start = pos
+        elif depth == 2 and self._in_messages() and self._item_start is None:
+            self._item_start = pos
+
+    def _close_string(self, pos: int, events: List[Tuple[str, Any]]):
+        depth = len(self._stack)
+        if depth == 1 and self._key_start is not None:
+            self._key = json.loads(self._buffer[self._key_start:pos + 1])
+            self._key_start = None
+        elif depth == 1 and self._value_start is not None:
+            self._finish_value(pos + 1, events)
+
+    def _finish_value(self, end: int, events: List[Tuple[str, Any]]):
+        text = self._buffer[self._value_start:end].strip()
+        self._value_start = None
+        key, self._key = self._key, None
+        if key == "messages" and text.startswith("["):
+            # Items were decoded one by one as they closed
+            self.fields["messages"] = self.messages
+            return
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"$.{key}: invalid JSON ({e.msg})")
+        self.fields[key] = value
+        if key == "cta":
+            self.cta = value
+            events.append(("cta", value))
+
+    def _finish_item(self, end: int, events: List[Tuple[str, Any]]):
+        if self._item_start is None:
+            return
+        text = self._buffer[self._item_start:end].strip()
+        self._item_start = None
+        path = f"$.messages[{len(self.messages)}]"
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{path}: invalid JSON ({e.msg})")
+        item_schema = self.schema.get("properties", {}).get("messages", {}).get("items", {})
+        item_errors = validate(item, item_schema, path)
+        if item_errors:
+            raise ValueError(item_errors[0])
+        self.messages.append(item)
+        events.append(("message", item))
+
+
+def parse_payload(text: str, schema: Dict[str, Any] = NOVA_PAYLOAD_SCHEMA) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Parse a complete reply as a NOVA payload.
+
+    Args:
+        text (str): The full reply
+        schema (dict): Schema the payload is validated against
+
+    Returns:
+        Tuple of (payload dict or None, list of errors)
+    """
+    parser = StreamingPayloadParser(schema)
+    parser.feed(text)
+    payload = parser.close()
+    return payload, parser.errors
+
+
+def format_payload(messages: List[Dict[str, Any]], cta: Optional[str] = None) -> str:
+    """
+    Format crafted messages and the CTA as markdown for display.
+
+    Args:
+        messages (list): Items of the payload's "messages" array
+        cta (str, optional): The call-to-action
+
+    Returns:
+        str: Markdown text
+    """
+    result = ""
+    for msg in messages:
+        if 'message' in msg:
+            result += f"**{msg['message']}**\n\n"
+
+    if cta:
+        result += f"**Call-to-Action:** {cta}"
+
+    return result
+
+
+@dataclass
+class CraftedMessage:
+    """One message variant crafted by NOVA."""
+    message: str
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"message": self.message, **self.extra}
+
+
+@dataclass
+class NovaPayload:
+    """
+    A structured NOVA reply.
+
+    ``errors`` lists schema violations (or the API error) when the reply
+    could not be parsed; ``raw`` always holds the reply text.
+    """
+    messages: List[CraftedMessage]
+    cta: Optional[str]
+    raw: str = ""
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        """Whether the reply matched the payload schema."""
+        return not self.errors
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], raw: str = "") -> "NovaPayload":
+        """Build a payload from a decoded, schema-valid dict."""
+        messages = [
+            CraftedMessage(item["message"], {key: value for key, value in item.items() if key != "message"})
+            for item in data.get("messages", [])
+        ]
+        return cls(messages=messages, cta=data.get("cta"), raw=raw)
+
+    @classmethod
+    def from_text(cls, text: str, schema: Dict[str, Any] = NOVA_PAYLOAD_SCHEMA) -> "NovaPayload":
+        """
+        Parse and validate a complete reply.
+
+        Args:
+            text (str): The reply text
+            schema (dict): Schema the payload is validated against
+
+        Returns:
+            NovaPayload, with ``errors`` set when the reply is not a valid payload
+        """
+        data, errors = parse_payload(text, schema)
+        if data is None:
+            return cls.invalid(text, errors or ["$: reply is not a JSON payload"])
+        return cls.from_dict(data, raw=text)
+
+    @classmethod
+    def invalid(cls, raw: str, errors: List[str]) -> "NovaPayload":
+        """Build the payload for a reply that could not be parsed."""
+        return cls(messages=[], cta=None, raw=raw, errors=list(errors))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert back to the JSON payload shape."""
+        return {"messages": [message.to_dict() for message in self.messages], "cta": self.cta}
+
+    def to_markdown(self) -> str:
+        """Format for display; invalid replies fall back to their raw text."""
+        if not self.valid:
+            return self.raw
+        return format_payload([message.to_dict() for message in self.messages], self.cta)
+
+    def __str__(self) -> str:
+        return self.to_markdown()
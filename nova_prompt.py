@@ -0,0 +1,105 @@
+import hashlib
+import json
+from typing import Any, Dict, List, Optional
+from config import Config
+from nova_memory import estimate_message_tokens
+
+
+def load_examples(path: Optional[str]) -> List[Dict[str, str]]:
+    """
+    Load few-shot examples from a JSON file.
+
+    The file holds a list of ``{"user": ..., "assistant": ...}`` objects.
+
+    Args:
+        path (str, optional): The JSON file; no examples when omitted
+
+    Returns:
+        List of example pairs
+    """
+    if not path:
+        return []
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            examples = json.load(f)
+        return [{"user": str(item["user"]), "assistant": str(item["assistant"])} for item in examples]
+    except Exception as e:
+        print(f"Error loading prompt examples: {e}")
+        return []
+
+
+class PromptBuilder:
+    """
+    Assembles chat requests so their static prefix is byte-identical.
+
+    The system prompt, instructions and few-shot examples are built into a
+    message prefix once; every request reuses it unchanged and appends the
+    variable parts (history, then the new message) after it. Upstream prompt
+    caching matches on exact prefixes, so this keeps long static prompts
+    cacheable across requests.
+    """
+
+    def __init__(self, system_prompt: str, instructions: Optional[str] = None,
+                 examples: Optional[List[Dict[str, str]]] = None):
+        """
+        Initialize the builder.
+
+        Args:
+            system_prompt (str): The system prompt
+            instructions (str, optional): Further static instructions appended to the system message
+            examples (list, optional): Few-shot ``{"user", "assistant"}`` pairs sent after the system message
+        """
+        self.system_prompt = system_prompt
+        self.instructions = instructions or ""
+        self.examples = list(examples or [])
+
+        system = system_prompt if not self.instructions else f"{system_prompt}\n\n{self.instructions}"
+        prefix = [{"role": "system", "content": system}]
+        for example in self.examples:
+            prefix.append({"role": "user", "content": example["user"]})
+            prefix.append({"role": "assistant", "content": example["assistant"]})
+        self._prefix = tuple(prefix)
+
+        serialized = json.dumps(prefix, ensure_ascii=False, separators=(",", ":"))
+        # Identifies the prefix, e.g. for cache keys and prompt_cache_key
+        self.prefix_key = hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:32]
+        self.prefix_tokens = sum(estimate_message_tokens(message["content"]) for message in prefix)
+
+    @classmethod
+    def from_config(cls, system_prompt: str) -> "PromptBuilder":
+        """Build with instructions and examples from Config.CHAT_INSTRUCTIONS / CHAT_EXAMPLES_PATH."""
+        return cls(system_prompt, Config.CHAT_INSTRUCTIONS, load_examples(Config.CHAT_EXAMPLES_PATH))
+
+    @property
+    def prefix(self) -> List[Dict[str, str]]:
+        """The static messages every request starts with."""
+        return list(self._prefix)
+
+    def build(self, message: str, history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        Assemble the messages of one request.
+
+        Args:
+            message (str): The new user message
+            history (list, optional): Earlier turns (and summary), oldest first
+
+        Returns:
+            List of chat messages: static prefix, history, then the message
+        """
+        messages = list(self._prefix)
+        if history:
+            messages.extend(history)
+        messages.append({"role": "user", "content": message})
+        return messages
+
+    def request_options(self) -> Dict[str, Any]:
+        """
+        Extra request parameters that help upstream prompt caching.
+
+        Returns:
+            Dict of keyword arguments for ``chat.completions.create``
+        """
+        if not Config.PROMPT_CACHE_KEY_ENABLED:
+            return {}
+        # Routes requests sharing this prefix to the same cache
+        return {"extra_body": {"prompt_cache_key": f"nova-{self.prefix_key}"}}
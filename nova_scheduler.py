@@ -0,0 +1,413 @@
+import asyncio
+import heapq
+import itertools
+import json
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterator, Optional
+from config import Config
+from nova_memory import estimate_tokens
+
+# Request priorities; lower values are dispatched first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# Longest sleep of an async request between checks of the queue and budgets
+ASYNC_POLL_INTERVAL = 0.05
+
+# Responses worth retrying: timeouts, conflicts, rate limits and server errors
+RETRYABLE_STATUS_CODES = (408, 409, 429, 500, 502, 503, 504)
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget of requests or tokens per minute.
+
+    The bucket holds up to ``burst_seconds`` worth of budget. A single take
+    larger than the capacity is allowed once the bucket is full and leaves it
+    in debt, so oversized requests are delayed rather than refused.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = Config.RATE_LIMIT_BURST_SECONDS):
+        """
+        Initialize the bucket, full.
+
+        Args:
+            per_minute (float): Budget per minute; 0 or less disables the limit
+            burst_seconds (float): Seconds of budget that can be spent at once
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until ``amount`` can be taken (0 when it can be taken now)."""
+        if not self.enabled or amount <= 0:
+            return 0.0
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return max(0.0, (needed - self.level) / self.rate)
+
+    def take(self, amount: float, now: float):
+        if self.enabled:
+            self._refill(now)
+            self.level -= amount
+
+    def drain(self, now: float):
+        """Spend whatever budget is left."""
+        if self.enabled:
+            self._refill(now)
+            self.level = min(self.level, 0.0)
+
+    def give(self, amount: float, now: float):
+        """Return unused budget, e.g. when a request used fewer tokens than estimated."""
+        if self.enabled:
+            self._refill(now)
+            self.level = min(self.capacity, self.level + amount)
+
+
+class RequestScheduler:
+    """
+    Shared admission control for upstream API requests.
+
+    Requests wait for both the requests-per-minute and the tokens-per-minute
+    bucket and are dispatched strictly by priority, first come first served
+    within a priority. A 429 pauses every request until its ``Retry-After``
+    has passed, since the quota is shared by the whole process, and failed
+    requests are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, requests_per_minute: float = Config.RATE_LIMIT_RPM,
+                 tokens_per_minute: float = Config.RATE_LIMIT_TPM,
+                 max_retries: int = Config.RATE_LIMIT_MAX_RETRIES,
+                 backoff_base: float = Config.RATE_LIMIT_BACKOFF_BASE,
+                 backoff_max: float = Config.RATE_LIMIT_BACKOFF_MAX,
+                 retry_after_max: float = Config.RATE_LIMIT_RETRY_AFTER_MAX):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute (float): Request budget; 0 disables the limit
+            tokens_per_minute (float): Token budget; 0 disables the limit
+            max_retries (int): Retries of a failed request before its error is returned
+            backoff_base (float): First retry delay in seconds, doubled on every further attempt
+            backoff_max (float): Largest retry delay in seconds
+            retry_after_max (float): Longest server-requested delay worth waiting for before retrying
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_after_max = retry_after_max
+        self._condition = threading.Condition()
+        self._waiting: list = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._local = threading.local()
+        self._counters = {
+            "requests": 0,
+            "throttled": 0,
+            "wait_time": 0.0,
+            "retries": 0,
+            "rate_limited": 0,
+            "failures": 0,
+            "timeouts": 0
+        }
+
+    @contextmanager
+    def priority(self, priority: int) -> Iterator[None]:
+        """
+        Run the requests made by this thread inside the block at ``priority``.
+
+        Args:
+            priority (int): PRIORITY_HIGH, PRIORITY_NORMAL or PRIORITY_LOW
+        """
+        previous = getattr(self._local, "priority", PRIORITY_NORMAL)
+        self._local.priority = priority
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def acquire(self, tokens: int = 0, priority: Optional[int] = None, timeout: Optional[float] = None) -> float:
+        """
+        Block until a request of ``tokens`` estimated tokens may be sent.
+
+        Args:
+            tokens (int): Estimated tokens the request consumes
+            priority (int, optional): Defaults to the priority set with ``priority()``
+            timeout (float, optional): Longest time to wait
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the request cannot be admitted within ``timeout``
+        """
+        started = time.monotonic()
+        give_up_at = started + timeout if timeout is not None else None
+        with self._condition:
+            entry = self._enqueue(priority)
+            try:
+                while True:
+                    now = time.monotonic()
+                    delay = self._try_admit(entry, tokens, now)
+                    if delay == 0:
+                        break
+                    self._condition.wait(self._bounded_delay(delay, started, give_up_at, now))
+            finally:
+                self._dequeue(entry)
+            return self._admitted(started)
+
+    async def acquire_async(self, tokens: int = 0, priority: Optional[int] = None,
+                            timeout: Optional[float] = None) -> float:
+        """
+        Wait, without blocking the event loop, until a request may be sent.
+
+        Async requests share the queue and budgets of ``acquire``. Since they
+        cannot wait on the scheduler's condition, they re-check the budget at
+        most every ``ASYNC_POLL_INTERVAL`` seconds.
+
+        Args:
+            tokens (int): Estimated tokens the request consumes
+            priority (int, optional): Defaults to the priority set with ``priority()``
+            timeout (float, optional): Longest time to wait
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            TimeoutError: If the request cannot be admitted within ``timeout``
+        """
+        started = time.monotonic()
+        give_up_at = started + timeout if timeout is not None else None
+        with self._condition:
+            entry = self._enqueue(priority)
+        try:
+            while True:
+                with self._condition:
+                    now = time.monotonic()
+                    delay = self._try_admit(entry, tokens, now)
+                    if delay == 0:
+                        break
+                    delay = self._bounded_delay(delay, started, give_up_at, now)
+                await asyncio.sleep(min(delay, ASYNC_POLL_INTERVAL) if delay is not None else ASYNC_POLL_INTERVAL)
+        finally:
+            with self._condition:
+                self._dequeue(entry)
+        with self._condition:
+            return self._admitted(started)
+
+    def _enqueue(self, priority: Optional[int]) -> tuple:
+        if priority is None:
+            priority = getattr(self._local, "priority", PRIORITY_NORMAL)
+        entry = (priority, next(self._sequence))
+        heapq.heappush(self._waiting, entry)
+        # A new head of the queue must re-check the budget
+        self._condition.notify_all()
+        return entry
+
+    def _dequeue(self, entry: tuple):
+        self._waiting.remove(entry)
+        heapq.heapify(self._waiting)
+        self._condition.notify_all()
+
+    def _try_admit(self, entry: tuple, tokens: int, now: float) -> Optional[float]:
+        """
+        Take the budget if ``entry`` heads the queue and it is available.
+
+        Returns:
+            0 once admitted, else the seconds until the budget allows it (None if not at the head)
+        """
+        if self._waiting[0] != entry:
+            return None
+        delay = max(
+            self._paused_until - now,
+            self.requests.wait_time(1, now),
+            self.tokens.wait_time(tokens, now)
+        )
+        if delay > 0:
+            return delay
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+        return 0
+
+    def _bounded_delay(self, delay: Optional[float], started: float, give_up_at: Optional[float],
+                       now: float) -> Optional[float]:
+        """Cap a wait at the caller's timeout, raising TimeoutError once it has passed."""
+        if give_up_at is None:
+            return delay
+        if now >= give_up_at:
+            self._counters["timeouts"] += 1
+            raise TimeoutError(f"Timed out after {now - started:.1f}s waiting for the rate limit")
+        return give_up_at - now if delay is None else min(delay, give_up_at - now)
+
+    def _admitted(self, started: float) -> float:
+        waited = time.monotonic() - started
+        self._counters["requests"] += 1
+        self._counters["wait_time"] += waited
+        if waited > 0.001:
+            self._counters["throttled"] += 1
+        return waited
+
+    def settle(self, estimated: int, actual: int):
+        """
+        Correct the token budget once a request's actual usage is known.
+
+        Args:
+            estimated (int): Tokens taken when the request was admitted
+            actual (int): Tokens the request actually used
+        """
+        with self._condition:
+            now = time.monotonic()
+            if actual < estimated:
+                self.tokens.give(estimated - actual, now)
+            else:
+                self.tokens.take(actual - estimated, now)
+            self._condition.notify_all()
+
+    def rate_limited(self, retry_after: Optional[float]):
+        """
+        Record a 429 and hold every request until ``retry_after`` seconds have passed.
+
+        Args:
+            retry_after (float, optional): Delay requested by the server
+        """
+        with self._condition:
+            self._counters["rate_limited"] += 1
+            if retry_after:
+                pause = min(retry_after, self.retry_after_max)
+                self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            # The buckets were too optimistic; drain them so requests spread out again
+            now = time.monotonic()
+            self.requests.drain(now)
+            self.tokens.drain(now)
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None,
+                    time_left: Optional[float] = None) -> Optional[float]:
+        """
+        Delay before retry number ``attempt`` (starting at 0), with full jitter.
+
+        The delay never exceeds ``retry_after_max`` or the caller's time left.
+        When the server asks for a longer wait than that, there is no retry.
+
+        Args:
+            attempt (int): Retries already made
+            retry_after (float, optional): Minimum delay requested by the server
+            time_left (float, optional): Seconds the caller can still wait
+
+        Returns:
+            float or None: Seconds to wait, or None if the request should not be retried
+        """
+        limit = self.retry_after_max if time_left is None else min(self.retry_after_max, time_left)
+        if retry_after is not None and retry_after > limit:
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            # Spread the requests released together when the server's delay ends
+            delay = retry_after + delay / 2
+        with self._condition:
+            self._counters["retries"] += 1
+        return min(delay, limit)
+
+    def failed(self):
+        """Record a request that still failed after its last retry."""
+        with self._condition:
+            self._counters["failures"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get scheduler counters.
+
+        Returns:
+            Dict with requests, throttled requests, total wait time, retries, 429s,
+            failures, admission timeouts, queued requests and the configured limits
+        """
+        with self._condition:
+            stats = dict(self._counters)
+            stats["queued"] = len(self._waiting)
+            stats["paused_for"] = max(0.0, self._paused_until - time.monotonic())
+        stats["requests_per_minute"] = self.requests.rate * 60
+        stats["tokens_per_minute"] = self.tokens.rate * 60
+        return stats
+
+
+# Scheduler shared by every NovaClient in this process, since quotas are per API key
+process_scheduler = RequestScheduler()
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Read the delay requested by a response's retry headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+
+    Returns:
+        float or None: Seconds to wait, if the server asked for a delay
+    """
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def estimate_request_tokens(method: str, path: str, body: bytes) -> int:
+    """
+    Estimate the tokens an API request will consume.
+
+    Chat completions count their messages plus the completion allowance;
+    run creation counts the allowance only, since the thread is not known
+    here. Every other request consumes no tokens.
+
+    Args:
+        method (str): HTTP method
+        path (str): URL path
+        body (bytes): JSON request body
+
+    Returns:
+        int: Estimated tokens
+    """
+    if method != "POST":
+        return 0
+    is_chat = path.endswith("/chat/completions")
+    if not is_chat and not path.endswith("/runs"):
+        return 0
+    try:
+        payload = json.loads(body or b"{}")
+    except ValueError:
+        payload = {}
+    tokens = payload.get("max_completion_tokens") or payload.get("max_tokens") or Config.RATE_LIMIT_COMPLETION_TOKENS
+    if is_chat:
+        for message in payload.get("messages", []):
+            content = message.get("content")
+            tokens += estimate_tokens(content if isinstance(content, str) else json.dumps(content))
+    return tokens
+
@@ -0,0 +1,193 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from config import Config
+
+
+class WarmThreadPool:
+    """
+    Assistant threads created ahead of time, so a new conversation does not
+    wait for ``threads.create``.
+
+    A background worker keeps up to ``size`` empty threads ready and tops the
+    pool up whenever it drops below ``low_water``. Threads left unused for
+    ``max_age`` seconds are deleted, as are those still pooled when ``close``
+    is called. Nothing is deleted at interpreter exit, so exiting never waits
+    on the network; threads left behind are empty and expire upstream.
+    """
+
+    def __init__(self, create: Callable[[], str], delete: Callable[[str], Any],
+                 size: int = Config.THREAD_POOL_SIZE, low_water: int = Config.THREAD_POOL_LOW_WATER,
+                 max_age: float = Config.THREAD_POOL_MAX_AGE):
+        """
+        Initialize the pool, empty; the worker starts on first use.
+
+        Args:
+            create: Callable creating a thread and returning its ID
+            delete: Callable deleting a thread by ID
+            size (int): Threads to keep ready
+            low_water (int): Refill once fewer than this many are ready
+            max_age (float): Seconds an unused thread is kept before it is deleted and replaced
+        """
+        self.create = create
+        self.delete = delete
+        self.size = size
+        self.low_water = min(low_water, size)
+        self.max_age = max_age
+        self._ready: deque = deque()
+        self._stale: List[str] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self._closed = False
+        self._counters = {"hits": 0, "misses": 0, "created": 0, "adopted": 0, "deleted": 0, "errors": 0}
+
+    def start(self):
+        """Start the refill worker if it is not running."""
+        with self._lock:
+            if self._worker is not None or self._closed:
+                return
+            self._worker = threading.Thread(target=self._run, name="nova-thread-pool", daemon=True)
+            self._worker.start()
+
+    def adopt(self, thread_ids: Iterable[str]):
+        """
+        Add threads created elsewhere, e.g. by the launcher's warm-up.
+
+        Args:
+            thread_ids: IDs of empty threads
+        """
+        now = time.monotonic()
+        with self._lock:
+            for thread_id in thread_ids:
+                self._ready.append((thread_id, now))
+                self._counters["adopted"] += 1
+            self._changed.notify_all()
+
+    def take(self) -> Optional[str]:
+        """
+        Get a ready thread, triggering a refill when the pool runs low.
+
+        Returns:
+            str or None: A thread ID, or None if none is ready (create one inline)
+        """
+        now = time.monotonic()
+        thread_id = None
+        with self._lock:
+            while self._ready:
+                candidate, created_at = self._ready.popleft()
+                if now - created_at <= self.max_age:
+                    thread_id = candidate
+                    break
+                # Too old; the worker deletes it
+                self._stale.append(candidate)
+            self._counters["hits" if thread_id is not None else "misses"] += 1
+            low = len(self._ready) < self.low_water or bool(self._stale)
+        if low:
+            self.start()
+            self._wake.set()
+        return thread_id
+
+    def fill(self, timeout: Optional[float] = None) -> int:
+        """
+        Start the worker and wait until the pool is full.
+
+        Args:
+            timeout (float, optional): Longest time to wait
+
+        Returns:
+            int: Threads ready when the wait ended
+        """
+        self.start()
+        self._wake.set()
+        with self._changed:
+            self._changed.wait_for(lambda: len(self._ready) >= self.size or self._closed, timeout)
+            return len(self._ready)
+
+    def release(self) -> List[str]:
+        """
+        Stop the pool and return its ready threads without deleting them, e.g.
+        to hand them over to another process.
+
+        Returns:
+            List of thread IDs
+        """
+        with self._lock:
+            self._closed = True
+            self._changed.notify_all()
+            thread_ids = [thread_id for thread_id, _ in self._ready]
+            self._ready.clear()
+        self._wake.set()
+        return thread_ids
+
+    def close(self):
+        """Stop the worker and delete the threads that were never used."""
+        for thread_id in self.release():
+            self._delete(thread_id)
+
+    def _delete(self, thread_id: str):
+        try:
+            self.delete(thread_id)
+            with self._lock:
+                self._counters["deleted"] += 1
+        except Exception as e:
+            print(f"Error deleting pooled thread: {e}")
+
+    def _run(self):
+        failures = 0
+        while not self._closed:
+            # Cleared before the work, so a take() during it triggers another round
+            self._wake.clear()
+            self._prune()
+            while not self._closed and len(self._ready) < self.size:
+                try:
+                    thread_id = self.create()
+                except Exception as e:
+                    print(f"Error creating pooled thread: {e}")
+                    with self._lock:
+                        self._counters["errors"] += 1
+                    failures += 1
+                    break
+                failures = 0
+                with self._lock:
+                    self._counters["created"] += 1
+                    if not self._closed:
+                        self._ready.append((thread_id, time.monotonic()))
+                        self._changed.notify_all()
+                        continue
+                # Closed while the thread was being created
+                self._delete(thread_id)
+
+            # Sleep until the pool runs low, expiry is due, or after a failure with backoff
+            timeout = min(self.max_age / 2, 2 ** failures) if failures else self.max_age / 2
+            self._wake.wait(timeout)
+
+    def _prune(self):
+        """Delete threads that sat unused for longer than ``max_age``."""
+        now = time.monotonic()
+        with self._lock:
+            expired = self._stale + [thread_id for thread_id, created_at in self._ready if now - created_at > self.max_age]
+            self._stale = []
+            self._ready = deque(item for item in self._ready if now - item[1] <= self.max_age)
+        for thread_id in expired:
+            self._delete(thread_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dict with hits, misses, hit ratio, created/adopted/deleted threads, errors and threads ready
+        """
+        with self._lock:
+            stats = dict(self._counters)
+            stats["ready"] = len(self._ready)
+            stats["size"] = self.size
+        total = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / total if total else 0.0
+        return stats
+
+    def __len__(self) -> int:
+        return len(self._ready)
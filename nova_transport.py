@@ -0,0 +1,207 @@
+import asyncio
+import json
+import time
+from typing import Optional
+import httpx
+from nova_scheduler import RETRYABLE_STATUS_CODES, RequestScheduler, estimate_request_tokens, parse_retry_after
+
+
+class _Attempts:
+    """
+    Retry state of one request, shared by the sync and async transports.
+
+    The request's pool timeout (the time left of its deadline) fixes an
+    absolute deadline when the request first enters; queueing, every attempt
+    and every retry sleep must fit before it.
+    """
+
+    def __init__(self, scheduler: RequestScheduler, request: httpx.Request):
+        self.scheduler = scheduler
+        self.request = request
+        try:
+            body = request.content
+        except httpx.RequestNotRead:
+            body = b""
+        self.tokens = estimate_request_tokens(request.method, request.url.path, body)
+        self.timeouts = dict(request.extensions.get("timeout", {}))
+        pool = self.timeouts.get("pool")
+        self.deadline = time.monotonic() + pool if pool is not None else None
+        self.attempt = 0
+
+    def time_left(self) -> Optional[float]:
+        """
+        Seconds left before the deadline, with the request's timeouts shrunk to fit.
+
+        Raises:
+            httpx.PoolTimeout: If the deadline has passed
+        """
+        if self.deadline is None:
+            return None
+        time_left = self.deadline - time.monotonic()
+        if time_left <= 0:
+            raise httpx.PoolTimeout("Request timeout exceeded", request=self.request)
+        self.request.extensions["timeout"] = {
+            key: min(value, time_left) if value is not None else None for key, value in self.timeouts.items()
+        }
+        return time_left
+
+    def admission_timeout(self, error: TimeoutError) -> httpx.PoolTimeout:
+        return httpx.PoolTimeout(str(error), request=self.request)
+
+    def retry_after_error(self, error: httpx.TransportError) -> Optional[float]:
+        """
+        Delay before retrying a request that failed to connect or read.
+
+        Returns:
+            Seconds to wait, or None when out of retries (re-raise ``error``)
+
+        Raises:
+            httpx.PoolTimeout: If the retry would pass the deadline
+        """
+        if self.attempt >= self.scheduler.max_retries:
+            self.scheduler.failed()
+            return None
+        time_left = self.time_left()
+        delay = self.scheduler.retry_delay(self.attempt, time_left=time_left)
+        if time_left is not None and delay >= time_left:
+            self.scheduler.failed()
+            raise httpx.PoolTimeout("No time left to retry the request", request=self.request) from error
+        self.attempt += 1
+        return delay
+
+    def retry_after_response(self, response: httpx.Response) -> Optional[float]:
+        """
+        Delay before retrying a response with a retryable status.
+
+        Returns:
+            Seconds to wait, or None to return the response as it is
+
+        Raises:
+            httpx.PoolTimeout: If waiting would pass the deadline (close the response first)
+        """
+        if self.attempt >= self.scheduler.max_retries:
+            self.scheduler.failed()
+            return None
+        retry_after = parse_retry_after(response.headers)
+        if response.status_code == 429:
+            self.scheduler.rate_limited(retry_after)
+        if retry_after is not None and retry_after > self.scheduler.retry_after_max:
+            # The server wants a longer pause than is ever worth waiting for
+            self.scheduler.failed()
+            return None
+        time_left = self.time_left()
+        delay = self.scheduler.retry_delay(self.attempt, retry_after, time_left=time_left)
+        if delay is None or (time_left is not None and delay >= time_left):
+            # Waiting would pass the deadline; fail as a timeout so the caller cleans up
+            self.scheduler.failed()
+            raise httpx.PoolTimeout(
+                f"Retrying after HTTP {response.status_code} would exceed the request timeout",
+                request=self.request
+            )
+        self.attempt += 1
+        return delay
+
+    def reports_usage(self, response: httpx.Response) -> bool:
+        # Only non-streamed chat completions report their usage in the response body
+        return (bool(self.tokens) and self.request.url.path.endswith("/chat/completions")
+                and response.status_code == 200
+                and response.headers.get("content-type", "").startswith("application/json"))
+
+    def settle(self, body: bytes):
+        try:
+            usage = json.loads(body).get("usage") or {}
+        except ValueError:
+            return
+        if usage.get("total_tokens") is not None:
+            self.scheduler.settle(self.tokens, usage["total_tokens"])
+
+
+class SchedulingTransport(httpx.BaseTransport):
+    """
+    httpx transport that sends every request through a RequestScheduler.
+
+    Admission, Retry-After handling and retries happen here, below the
+    OpenAI SDK, so all endpoints (including streams) are covered.
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, scheduler: RequestScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempts = _Attempts(self.scheduler, request)
+        while True:
+            try:
+                self.scheduler.acquire(attempts.tokens, timeout=attempts.time_left())
+            except TimeoutError as e:
+                raise attempts.admission_timeout(e) from e
+            # Queueing used part of the deadline; the attempt gets what is left
+            attempts.time_left()
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError as e:
+                delay = attempts.retry_after_error(e)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    if attempts.reports_usage(response):
+                        attempts.settle(response.read())
+                    return response
+                try:
+                    delay = attempts.retry_after_response(response)
+                except httpx.PoolTimeout:
+                    response.close()
+                    raise
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncSchedulingTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of SchedulingTransport, used by AsyncNovaClient.
+
+    Requests wait in the same scheduler queue without blocking the event loop.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, scheduler: RequestScheduler):
+        self.transport = transport
+        self.scheduler = scheduler
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempts = _Attempts(self.scheduler, request)
+        while True:
+            try:
+                await self.scheduler.acquire_async(attempts.tokens, timeout=attempts.time_left())
+            except TimeoutError as e:
+                raise attempts.admission_timeout(e) from e
+            # Queueing used part of the deadline; the attempt gets what is left
+            attempts.time_left()
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                delay = attempts.retry_after_error(e)
+                if delay is None:
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    if attempts.reports_usage(response):
+                        attempts.settle(await response.aread())
+                    return response
+                try:
+                    delay = attempts.retry_after_response(response)
+                except httpx.PoolTimeout:
+                    await response.aclose()
+                    raise
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self):
+        await self.transport.aclose()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Batch entry point for NOVA.
+Runs every prompt of a JSONL or CSV file through NovaClient.send_many and
+appends the results to a JSONL file as they finish. The output doubles as
+the checkpoint: rerunning the same command skips prompts that already
+succeeded, so an interrupted job picks up where it stopped.
+
+Usage:
+    python run_batch.py prompts.jsonl
+    python run_batch.py prompts.csv --output variants.jsonl --workers 16 --structured
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterator, Set
+from dotenv import load_dotenv
+from config import Config
+
+def read_items(path: str, input_format: str, prompt_field: str, id_field: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the prompts of an input file.
+
+    JSONL lines are objects or bare strings; CSV files need a header row.
+    Items without an ID field are identified by their line (or row) number.
+
+    Args:
+        path (str): The input file
+        input_format (str): "jsonl" or "csv"
+        prompt_field (str): Field holding the prompt
+        id_field (str): Field holding the item's ID
+
+    Yields:
+        Dict with id, prompt (None if the item has none) and error (why an item cannot be sent)
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if input_format == "csv":
+            records = ((number, row) for number, row in enumerate(csv.DictReader(f), start=1))
+        else:
+            records = ((number, line) for number, line in enumerate(f, start=1) if line.strip())
+        for number, record in records:
+            if input_format == "jsonl":
+                try:
+                    record = json.loads(record)
+                except ValueError:
+                    yield {"id": str(number), "prompt": None, "error": f"Invalid JSON on line {number}"}
+                    continue
+            if isinstance(record, str):
+                record = {prompt_field: record}
+            prompt = record.get(prompt_field) if isinstance(record, dict) else None
+            item_id = record.get(id_field) if isinstance(record, dict) else None
+            yield {
+                "id": str(item_id) if item_id not in (None, "") else str(number),
+                "prompt": prompt if isinstance(prompt, str) and prompt.strip() else None,
+                "error": None if isinstance(prompt, str) and prompt.strip() else f"No '{prompt_field}' in item {number}"
+            }
+
+def load_checkpoint(path: str) -> Set[str]:
+    """
+    Read the IDs that already succeeded from an earlier run's output.
+
+    A line cut short by a crash is removed, so appending continues on a
+    clean line. Failed items are not counted and are sent again.
+
+    Args:
+        path (str): The output file
+
+    Returns:
+        Set of completed item IDs
+    """
+    completed = set()
+    if not os.path.exists(path):
+        return completed
+    with open(path, 'rb+') as f:
+        offset = 0
+        for line in f:
+            if not line.endswith(b"\n"):
+                f.truncate(offset)
+                print(f"⚠️ Removed an incomplete result at the end of {path}", file=sys.stderr)
+                break
+            offset += len(line)
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("error") is None:
+                completed.add(result["id"])
+            else:
+                completed.discard(result["id"])
+    return completed
+
+class Progress:
+    """Throughput and ETA of a batch run, reported at most every ``interval`` seconds."""
+
+    def __init__(self, total: int, skipped: int, interval: float = 5.0):
+        """
+        Start tracking.
+
+        Args:
+            total (int): Items to process in this run
+            skipped (int): Items completed by earlier runs
+            interval (float): Seconds between progress reports
+        """
+        self.total = total
+        self.skipped = skipped
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+    def update(self, failed: bool):
+        """Count a finished item and report if the interval has passed."""
+        self.done += 1
+        if failed:
+            self.failed += 1
+        if time.monotonic() - self.last_report >= self.interval:
+            self.report()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the progress so far.
+
+        Returns:
+            Dict with done, failed, remaining, elapsed seconds, items per second and ETA seconds
+        """
+        elapsed = time.monotonic() - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.done)
+        return {
+            "done": self.done,
+            "failed": self.failed,
+            "remaining": remaining,
+            "skipped": self.skipped,
+            "elapsed": elapsed,
+            "rate": rate,
+            "eta": remaining / rate if rate else None
+        }
+
+    def report(self):
+        """Print a progress line to stderr."""
+        self.last_report = time.monotonic()
+        stats = self.stats()
+        eta = f"{stats['eta']:.0f}s" if stats["eta"] is not None else "?"
+        print(f"⏳ {stats['done']}/{self.total} done ({stats['failed']} failed), "
+              f"{stats['rate']:.2f} prompts/s, ETA {eta}", file=sys.stderr)
+
+def result_record(item: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a send_many result into the JSON written to the output."""
+    response = result["response"]
+    return {
+        "id": item["id"],
+        "prompt": item["prompt"],
+        "response": response.to_dict() if hasattr(response, "to_dict") else response,
+        "error": result["error"],
+        "thread_id": result["thread_id"],
+        "timeout": asdict(result["timeout"]) if result["timeout"] is not None else None,
+        "elapsed": result["elapsed"]
+    }
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Process the input file.
+
+    Returns:
+        int: Exit code: 0 if every item succeeded, 1 if some failed, 130 if interrupted
+    """
+    from nova_client import NovaClient
+
+    input_format = args.format or ("csv" if args.input.lower().endswith(".csv") else "jsonl")
+    output = args.output or f"{args.input}.results.jsonl"
+    completed = load_checkpoint(output)
+
+    def pending_items() -> Iterator[Dict[str, Any]]:
+        for item in read_items(args.input, input_format, args.prompt_field, args.id_field):
+            if item["id"] not in completed:
+                yield item
+
+    total = sum(1 for _ in pending_items())
+    print(f"📄 {total} prompts to run, {len(completed)} already done (results in {output}).", file=sys.stderr)
+    if not total:
+        return 0
+
+    nova = NovaClient()
+    progress = Progress(total, len(completed), args.progress_interval)
+    # Items handed to send_many, by the index it reports them with
+    in_flight: Dict[int, Dict[str, Any]] = {}
+
+    with open(output, 'a', encoding='utf-8') as out:
+        def write(record: Dict[str, Any]):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            progress.update(record["error"] is not None)
+
+        def prompts() -> Iterator[str]:
+            index = 0
+            for item in pending_items():
+                if item["prompt"] is None:
+                    write({"id": item["id"], "prompt": None, "response": None, "error": item["error"],
+                           "thread_id": None, "timeout": None, "elapsed": 0.0})
+                    continue
+                in_flight[index] = item
+                index += 1
+                yield item["prompt"]
+
+        def save(result: Dict[str, Any]):
+            write(result_record(in_flight.pop(result["index"]), result))
+
+        # Results finished but not yet yielded when interrupted are saved too, so they are not sent again
+        results = nova.send_many(prompts(), use_assistant=args.assistant, model=args.model,
+                                 temperature=args.temperature, max_workers=args.workers,
+                                 ordered=False, structured=args.structured, on_close=save)
+        try:
+            for result in results:
+                save(result)
+        except KeyboardInterrupt:
+            print("\n👋 Interrupted; waiting for requests in flight to stop. Rerun the same command to resume.",
+                  file=sys.stderr)
+            results.close()
+            return 130
+        finally:
+            progress.report()
+
+    stats = progress.stats()
+    print(f"✅ Finished {stats['done']} prompts in {stats['elapsed']:.1f}s "
+          f"({stats['rate']:.2f}/s), {stats['failed']} failed.", file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+def main():
+    """Parse arguments and run the batch."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run NOVA over a JSONL or CSV file of prompts, resumably.")
+    parser.add_argument("input", help="JSONL (objects or strings per line) or CSV file of prompts")
+    parser.add_argument("--output", help="JSONL results file, also the checkpoint (default: <input file>.results.jsonl)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the file extension)")
+    parser.add_argument("--prompt-field", default="prompt", help="Field or column holding the prompt")
+    parser.add_argument("--id-field", default="id", help="Field or column identifying an item (default: its line number)")
+    parser.add_argument("--workers", type=int, default=Config.BULK_MAX_WORKERS, help="Prompts in flight at once")
+    parser.add_argument("--assistant", action="store_true", help="Use the NOVA assistant instead of chat completions")
+    parser.add_argument("--model", default=Config.DEFAULT_MODEL, help="Model for chat completions")
+    parser.add_argument("--temperature", type=float, default=Config.DEFAULT_TEMPERATURE)
+    parser.add_argument("--structured", action="store_true", help="Constrain replies to NOVA's JSON schema")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress reports")
+    args = parser.parse_args()
+
+    try:
+        sys.exit(run(args))
+    except (OSError, ValueError) as e:
+        print(f"❌ Error running batch: {e}", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
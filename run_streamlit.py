@@ -9,6 +9,30 @@ import subprocess
 import sys
 from dotenv import load_dotenv
 
+def warm_up(env):
+    """
+    Check the API and create assistant threads before the app starts.
+    
+    The thread IDs are handed to the app process in NOVA_PREWARMED_THREADS,
+    so the first conversations do not wait for thread creation.
+    """
+    try:
+        from config import Config
+        from nova_client import NovaClient
+        
+        nova = NovaClient(thread_pool_size=Config.THREAD_POOL_SIZE)
+        report = nova.warm_up()
+        if report["error"]:
+            print(f"⚠️ Warm-up could not reach the API: {report['error']}")
+            return
+        thread_ids = nova.thread_pool.release() if nova.thread_pool is not None else []
+        if thread_ids:
+            env["NOVA_PREWARMED_THREADS"] = ",".join(thread_ids)
+        print(f"✅ Warm-up done: API reachable in {report['connect_time'] * 1000:.0f} ms, "
+              f"{len(thread_ids)} conversation threads ready.")
+    except Exception as e:
+        print(f"⚠️ Warm-up skipped: {e}")
+
 def main():
     """Load .env and launch the Streamlit app with the correct environment."""
     # Load environment variables from your .env file
@@ -28,6 +52,8 @@ def main():
     # Force the correct API key into this new environment
     env["OPENAI_API_KEY"] = api_key
     print("✅ API Key has been forced into the app's environment.")
+    
+    warm_up(env)
 
     print("🚀 Starting NOVA Assistant...")
     try:
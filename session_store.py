@@ -0,0 +1,172 @@
+import json
+import sqlite3
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from config import Config
+
+
+class SessionStore(ABC):
+    """
+    Interface for persisting chat sessions.
+
+    Implementations keep session previews separate from message bodies so
+    the sidebar can list sessions without loading their messages.
+    """
+
+    @abstractmethod
+    def create_session(self, owner: str, messages: List[Dict[str, Any]], thread_id: Optional[str] = None) -> str:
+        """Create a session seeded with ``messages`` and return its ID."""
+
+    @abstractmethod
+    def append_message(self, session_id: str, message: Dict[str, Any]):
+        """Append one message to an existing session."""
+
+    @abstractmethod
+    def list_sessions(self, owner: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """List the most recently updated sessions of an owner, previews only."""
+
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get the preview record of one session."""
+
+    @abstractmethod
+    def load_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        """Load the messages of one session in order, with the parsed payload of structured replies."""
+
+    @abstractmethod
+    def delete_session(self, session_id: str):
+        """Delete a session and its messages."""
+
+
+class SQLiteSessionStore(SessionStore):
+    """SessionStore backed by an indexed SQLite database."""
+
+    def __init__(self, path: str = Config.SESSION_STORE_PATH):
+        """
+        Initialize the store, creating the schema if needed.
+
+        Args:
+            path (str): Database file, or ":memory:" for a throwaway store
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                id TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                preview TEXT NOT NULL,
+                message_count INTEGER NOT NULL DEFAULT 0,
+                thread_id TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_owner_updated ON sessions(owner, updated_at DESC);
+            CREATE TABLE IF NOT EXISTS messages (
+                session_id TEXT NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+                seq INTEGER NOT NULL,
+                role TEXT NOT NULL,
+                content TEXT NOT NULL,
+                timestamp TEXT,
+                payload TEXT,
+                PRIMARY KEY (session_id, seq)
+            );
+        """)
+        # Databases created before structured payloads were stored lack the column
+        columns = {row["name"] for row in self._db.execute("PRAGMA table_info(messages)")}
+        if "payload" not in columns:
+            self._db.execute("ALTER TABLE messages ADD COLUMN payload TEXT")
+        self._db.commit()
+
+    @staticmethod
+    def _message_row(session_id: str, seq: int, message: Dict[str, Any]) -> tuple:
+        payload = message.get("payload")
+        return (session_id, seq, message["role"], message["content"], message.get("timestamp"),
+                json.dumps(payload, ensure_ascii=False) if payload is not None else None)
+
+    @staticmethod
+    def _preview(messages: List[Dict[str, Any]]) -> str:
+        return messages[0]["content"][:50] + "..." if messages else "New Chat"
+
+    def create_session(self, owner: str, messages: List[Dict[str, Any]], thread_id: Optional[str] = None) -> str:
+        session_id = f"session_{uuid.uuid4().hex[:12]}"
+        now = datetime.now()
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO sessions (id, owner, created_at, updated_at, preview, message_count, thread_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (session_id, owner, now.strftime("%Y-%m-%d %H:%M:%S"), now.timestamp(),
+                 self._preview(messages), len(messages), thread_id)
+            )
+            self._db.executemany(
+                "INSERT INTO messages (session_id, seq, role, content, timestamp, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                [self._message_row(session_id, seq, msg) for seq, msg in enumerate(messages)]
+            )
+        return session_id
+
+    def append_message(self, session_id: str, message: Dict[str, Any]):
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT message_count FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return
+            seq = row["message_count"]
+            self._db.execute(
+                "INSERT INTO messages (session_id, seq, role, content, timestamp, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                self._message_row(session_id, seq, message)
+            )
+            self._db.execute(
+                "UPDATE sessions SET message_count = ?, updated_at = ? WHERE id = ?",
+                (seq + 1, datetime.now().timestamp(), session_id)
+            )
+
+    def list_sessions(self, owner: str, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT id, created_at AS timestamp, preview, message_count, thread_id FROM sessions "
+                "WHERE owner = ? ORDER BY updated_at DESC LIMIT ?",
+                (owner, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT id, owner, created_at AS timestamp, preview, message_count, thread_id "
+                "FROM sessions WHERE id = ?",
+                (session_id,)
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    def load_messages(self, session_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT role, content, timestamp, payload FROM messages WHERE session_id = ? ORDER BY seq",
+                (session_id,)
+            ).fetchall()
+        messages = []
+        for row in rows:
+            message = dict(row)
+            payload = message.pop("payload")
+            if payload is not None:
+                # Structured replies come back parsed, as they were when stored
+                message["payload"] = json.loads(payload)
+            messages.append(message)
+        return messages
+
+    def delete_session(self, session_id: str):
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
@@ -1,8 +1,14 @@
 import streamlit as st
+import hashlib
 import json
+import threading
 import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime
 from nova_client import NovaClient
+from nova_output import StreamingPayloadParser, format_payload, parse_payload
+from session_store import SQLiteSessionStore
 from config import Config
 
 # Page configuration
@@ -139,48 +145,139 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "conversation_history" not in st.session_state:
     st.session_state.conversation_history = []
-if "nova_client" not in st.session_state:
-    st.session_state.nova_client = None
-if "chat_sessions" not in st.session_state:
-    st.session_state.chat_sessions = []
+if "nova_session" not in st.session_state:
+    st.session_state.nova_session = None
 if "current_session_id" not in st.session_state:
     st.session_state.current_session_id = None
 if "selected_history_item" not in st.session_state:
     st.session_state.selected_history_item = None
+if "transcript_window" not in st.session_state:
+    st.session_state.transcript_window = Config.TRANSCRIPT_WINDOW
+
+@st.cache_resource
+def get_session_store():
+    """Get the process-wide chat session store."""
+    return SQLiteSessionStore(Config.SESSION_STORE_PATH)
+
+@st.cache_resource
+def get_nova_client():
+    """Get the process-wide NOVA client, warming it up in the background on first use."""
+    nova = NovaClient.shared(thread_pool_size=Config.THREAD_POOL_SIZE)
+    nova.warm_up(background=True)
+    return nova
+
+class RenderCache:
+    """Small LRU of rendered message HTML, keyed by (role, content hash)."""
+    
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get_or_build(self, key, build):
+        """Return the HTML stored under ``key``, calling ``build()`` to fill it on a miss."""
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return html
+        html = build()
+        with self._lock:
+            self._entries[key] = html
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+@st.cache_resource
+def get_render_cache():
+    """Get the process-wide cache of rendered message HTML."""
+    return RenderCache(Config.RENDER_CACHE_SIZE)
+
+def get_owner_id():
+    """Identify this browser across reloads via the ``sid`` query parameter."""
+    if "owner_id" not in st.session_state:
+        if hasattr(st, "query_params"):
+            owner_id = st.query_params.get("sid")
+            if not owner_id:
+                owner_id = uuid.uuid4().hex
+                st.query_params["sid"] = owner_id
+        else:
+            owner_id = st.experimental_get_query_params().get("sid", [None])[0]
+            if not owner_id:
+                owner_id = uuid.uuid4().hex
+                st.experimental_set_query_params(sid=owner_id)
+        st.session_state.owner_id = owner_id
+    return st.session_state.owner_id
 
 def initialize_nova_client():
-    """Initialize NOVA client with error handling."""
+    """Attach this browser session to the process-wide NOVA client."""
     try:
-        if st.session_state.nova_client is None:
-            st.session_state.nova_client = NovaClient()
+        if st.session_state.nova_session is None:
+            st.session_state.nova_session = get_nova_client().session()
         return True
     except Exception as e:
         st.error(f"Failed to initialize NOVA client: {str(e)}")
         return False
 
-def display_chat_message(role, content, timestamp=None):
-    """Display a chat message with simple ChatGPT-like styling."""
+def build_message_html(role, content, formatted=False):
+    """Build the HTML of a chat message with simple ChatGPT-like styling."""
     if role == "user":
-        st.markdown(f"""
+        return f"""
         <div class="chat-message user-message">
             <strong>You</strong><br>
             {content}
         </div>
-        """, unsafe_allow_html=True)
+        """
     else:
         # Clean up JSON responses to make them readable
-        clean_content = clean_response(content)
-        st.markdown(f"""
+        clean_content = content if formatted else clean_response(content)
+        return f"""
         <div class="chat-message assistant-message">
             <strong>NOVA</strong><br>
             {clean_content}
         </div>
-        """, unsafe_allow_html=True)
+        """
+
+def render_message_html(message):
+    """Get the HTML of a stored message, memoized by role and content hash."""
+    # The hash is kept on the message so later reruns skip rehashing the content
+    if "content_hash" not in message:
+        message["content_hash"] = hashlib.sha256(message["content"].encode("utf-8")).hexdigest()
+    key = (message["role"], message["content_hash"])
+    return get_render_cache().get_or_build(key, lambda: build_stored_message_html(message))
+
+def build_stored_message_html(message):
+    """Build the HTML of a stored message, using its parsed payload when it has one."""
+    payload = message.get("payload")
+    if payload is not None:
+        # Structured replies arrive parsed; no JSON decoding needed
+        return build_message_html(message["role"], format_payload(payload["messages"], payload["cta"]), formatted=True)
+    return build_message_html(message["role"], message["content"])
+
+def display_chat_message(role, content, timestamp=None, container=None, formatted=False):
+    """Display a chat message with simple ChatGPT-like styling."""
+    container = container or st
+    container.markdown(build_message_html(role, content, formatted), unsafe_allow_html=True)
+
+def display_transcript(messages):
+    """Display the most recent window of messages, with a control to load older ones."""
+    window = st.session_state.transcript_window
+    hidden = max(0, len(messages) - window)
+    if hidden:
+        if st.button(f"⬆️ Load {min(hidden, Config.TRANSCRIPT_WINDOW)} older messages ({hidden} hidden)",
+                     key="load_older_messages", use_container_width=True):
+            st.session_state.transcript_window = window + Config.TRANSCRIPT_WINDOW
+            st.rerun()
+    visible = messages[hidden:]
+    if visible:
+        st.markdown("".join(render_message_html(message) for message in visible), unsafe_allow_html=True)
 
 def clean_response(response):
     """Clean up JSON responses to make them readable for users."""
-    import json
-    import re
+    # NOVA's messages/cta payload (validated against its schema)
+    payload, _ = parse_payload(response)
+    if payload is not None:
+        return format_payload(payload['messages'], payload.get('cta', ''))
     
     # Try to parse as JSON first
     try:
@@ -188,23 +285,13 @@ def clean_response(response):
         
         # If it's a JSON object, format it nicely
         if isinstance(data, dict):
-            if 'messages' in data and 'cta' in data:
-                # This looks like the specific format you mentioned
-                messages = data.get('messages', [])
-                cta = data.get('cta', '')
-                
-                result = ""
-                for msg in messages:
-                    if 'message' in msg:
-                        result += f"**{msg['message']}**\n\n"
-                
-                if cta:
-                    result += f"**Call-to-Action:** {cta}"
-                
-                return result
-            else:
-                # Generic JSON formatting
-                return json.dumps(data, indent=2)
+            if 'messages' in data and 'cta' in data and isinstance(data['messages'], list):
+                # Near-miss of the NOVA payload (e.g. an item without "message"):
+                # show the messages that are there and skip the rest
+                messages = [msg for msg in data['messages'] if isinstance(msg, dict)]
+                return format_payload(messages, data['cta'])
+            # Generic JSON formatting
+            return json.dumps(data, indent=2)
         else:
             return str(data)
     
@@ -212,26 +299,70 @@ def clean_response(response):
         # If it's not JSON, return as is
         return response
 
+def stream_chat_message(chunks, render_interval=0.05):
+    """
+    Render a streamed assistant reply progressively and return the full text.
+    
+    NOVA payloads are parsed as they arrive, so each crafted message shows up
+    as soon as its JSON object is complete instead of as raw JSON.
+    """
+    placeholder = st.empty()
+    parser = StreamingPayloadParser()
+    response = ""
+    last_render = 0.0
+    pending = False
+    for chunk in chunks:
+        response += chunk
+        events = parser.feed(chunk)
+        now = time.perf_counter()
+        if parser.is_structured and not parser.failed:
+            # Only re-render when a message or the CTA has completed
+            pending = pending or bool(events)
+            if pending and now - last_render >= render_interval:
+                display_chat_message("assistant", format_payload(parser.messages, parser.cta) + "…",
+                                     container=placeholder, formatted=True)
+                last_render = now
+                pending = False
+        elif now - last_render >= render_interval:
+            display_chat_message("assistant", response, container=placeholder)
+            last_render = now
+    payload = parser.close()
+    if payload is not None:
+        display_chat_message("assistant", format_payload(payload["messages"], payload.get("cta")),
+                             container=placeholder, formatted=True)
+    else:
+        display_chat_message("assistant", response, container=placeholder)
+    return response
+
+def add_chat_message(role, content, timestamp, **extra):
+    """Append a message to the current chat and persist it if the chat is saved."""
+    message = {"role": role, "content": content, "timestamp": timestamp, **extra}
+    st.session_state.messages.append(message)
+    if st.session_state.current_session_id is not None:
+        get_session_store().append_message(st.session_state.current_session_id, message)
+
 def save_chat_session():
     """Save current chat session to history."""
     if st.session_state.messages:
-        session_id = f"session_{len(st.session_state.chat_sessions) + 1}"
-        session_data = {
-            "id": session_id,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "messages": st.session_state.messages.copy(),
-            "preview": st.session_state.messages[0]["content"][:50] + "..." if st.session_state.messages else "New Chat"
-        }
-        st.session_state.chat_sessions.append(session_data)
+        nova = st.session_state.nova_session
+        session_id = get_session_store().create_session(
+            get_owner_id(),
+            st.session_state.messages,
+            thread_id=nova.thread_id if nova is not None else None
+        )
         st.session_state.current_session_id = session_id
 
 def load_chat_session(session_id):
     """Load a specific chat session."""
-    for session in st.session_state.chat_sessions:
-        if session["id"] == session_id:
-            st.session_state.messages = session["messages"].copy()
-            st.session_state.current_session_id = session_id
-            break
+    store = get_session_store()
+    session = store.get_session(session_id)
+    if session is not None:
+        st.session_state.messages = store.load_messages(session_id)
+        st.session_state.current_session_id = session_id
+        st.session_state.transcript_window = Config.TRANSCRIPT_WINDOW
+        # Continue the assistant thread the session was using
+        if initialize_nova_client():
+            st.session_state.nova_session.thread_id = session["thread_id"]
 
 def main():
     # Simple header
@@ -251,13 +382,17 @@ def main():
             st.session_state.messages = []
             st.session_state.conversation_history = []
             st.session_state.current_session_id = None
+            st.session_state.transcript_window = Config.TRANSCRIPT_WINDOW
+            if st.session_state.nova_session is not None:
+                st.session_state.nova_session.clear_conversation()
             st.rerun()
         
         st.markdown("---")
         
-        # Display chat history
-        if st.session_state.chat_sessions:
-            for session in reversed(st.session_state.chat_sessions[-10:]):  # Show last 10
+        # Display chat history (previews only; messages load on demand)
+        chat_sessions = get_session_store().list_sessions(get_owner_id(), limit=10)
+        if chat_sessions:
+            for session in chat_sessions:  # Show last 10
                 is_selected = session["id"] == st.session_state.current_session_id
                 selected_class = "selected" if is_selected else ""
                 
@@ -275,7 +410,7 @@ def main():
                         st.rerun()
                 with col2:
                     if st.button("🗑️", key=f"delete_{session['id']}"):
-                        st.session_state.chat_sessions = [s for s in st.session_state.chat_sessions if s["id"] != session["id"]]
+                        get_session_store().delete_session(session["id"])
                         if st.session_state.current_session_id == session["id"]:
                             st.session_state.messages = []
                             st.session_state.current_session_id = None
@@ -296,23 +431,14 @@ def main():
         </div>
         """, unsafe_allow_html=True)
     
-    # Display chat messages
-    for message in st.session_state.messages:
-        display_chat_message(
-            message["role"], 
-            message["content"], 
-            message.get("timestamp")
-        )
+    # Display chat messages (recent window only; rendered HTML is cached)
+    display_transcript(st.session_state.messages)
     
     # Chat input
     if prompt := st.chat_input("Type your message here..."):
         # Add user message to chat
         timestamp = datetime.now().strftime("%H:%M:%S")
-        st.session_state.messages.append({
-            "role": "user", 
-            "content": prompt, 
-            "timestamp": timestamp
-        })
+        add_chat_message("user", prompt, timestamp)
         
         # Add to conversation history
         st.session_state.conversation_history.append({
@@ -327,18 +453,22 @@ def main():
         if initialize_nova_client():
             with st.spinner("NOVA is thinking..."):
                 try:
-                    response = st.session_state.nova_client.send_message(
-                        prompt, 
-                        use_assistant=True
+                    nova = st.session_state.nova_session
+                    response = stream_chat_message(
+                        nova.stream_message(prompt, use_assistant=True, structured=Config.STRUCTURED_OUTPUT)
                     )
                     
                     # Add assistant response to chat
                     response_timestamp = datetime.now().strftime("%H:%M:%S")
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": response, 
-                        "timestamp": response_timestamp
-                    })
+                    payload = nova.last_stream_stats.get("payload")
+                    extra = {"payload": payload.to_dict()} if payload is not None and payload.valid else {}
+                    add_chat_message(
+                        "assistant",
+                        response,
+                        response_timestamp,
+                        ttft=nova.last_stream_stats.get("ttft"),
+                        **extra
+                    )
                     
                     # Add to conversation history
                     st.session_state.conversation_history.append({
@@ -346,16 +476,9 @@ def main():
                         "content": response
                     })
                     
-                    # Display assistant response
-                    display_chat_message("assistant", response, response_timestamp)
-                    
                 except Exception as e:
                     error_msg = f"Sorry, I encountered an error: {str(e)}"
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": error_msg, 
-                        "timestamp": datetime.now().strftime("%H:%M:%S")
-                    })
+                    add_chat_message("assistant", error_msg, datetime.now().strftime("%H:%M:%S"))
                     display_chat_message("assistant", error_msg)
         else:
             st.error("Please check your API configuration.")
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from async_nova_client import AsyncNovaClient
+from mock_openai_server import MockOpenAIServer
+
+
+def test_ready_health_check_spends_no_tokens_and_is_cached():
+    with MockOpenAIServer() as server:
+        async def check():
+            async with AsyncNovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url) as client:
+                first, second = await asyncio.gather(client.health_check(), client.health_check())
+                third = await client.health_check()
+                return first, second, third
+
+        first, second, third = asyncio.run(check())
+        counts = dict(server.state.request_counts)
+
+    assert first["status"] == "healthy"
+    assert second == first
+    assert third["cached"] is True
+    assert "POST /chat/completions" not in counts
+    assert counts["GET /models/gpt-4o-mini"] == 1
+
+
+def test_export_and_import_round_trip(tmp_path):
+    with MockOpenAIServer() as server:
+        async def round_trip():
+            async with AsyncNovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url) as client:
+                await client.send_message("First prompt")
+                await client.send_message("Second prompt")
+                exported = await client.export_conversation(str(tmp_path / "history.jsonl.gz"))
+                before = dict(server.state.request_counts)
+                imported = client.new_conversation()
+                assert await imported.import_conversation(exported)
+                after = dict(server.state.request_counts)
+                return (await client.get_conversation_history(), await imported.get_conversation_history(),
+                        before, after)
+
+        original, copied, before, after = asyncio.run(round_trip())
+
+    assert [(m["role"], m["content"]) for m in copied] == [(m["role"], m["content"]) for m in original]
+    assert len(original) == 4
+    assert after.get("POST /threads", 0) - before.get("POST /threads", 0) == 1
+    assert after.get("POST /threads/{thread}/messages") == before.get("POST /threads/{thread}/messages")
+
+
+def test_run_past_deadline_is_cancelled_and_returns_timeout_result(monkeypatch):
+    from mock_openai_server import MockSettings
+    from nova_client import Deadline, TimeoutResult
+
+    monkeypatch.setattr(Deadline.__init__, "__defaults__", (1.0,))
+    with MockOpenAIServer(MockSettings(run_time=5.0)) as server:
+        async def ask():
+            async with AsyncNovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url,
+                                       use_streaming_runs=False) as client:
+                return await client.send_message("hello")
+
+        started = time.monotonic()
+        result = asyncio.run(ask())
+        elapsed = time.monotonic() - started
+        counts = dict(server.state.request_counts)
+
+    assert isinstance(result, TimeoutResult)
+    assert result.cancelled
+    assert elapsed < 2.0
+    assert any(key.endswith("/cancel") for key in counts)
+
+
+def test_import_of_long_history_round_trips(tmp_path):
+    import json
+    from config import Config
+
+    count = Config.THREAD_SEED_MESSAGE_LIMIT + 8
+    history = [{"role": "user" if i % 2 == 0 else "assistant", "content": f"Message {i}", "timestamp": i}
+               for i in range(count)]
+    path = tmp_path / "history.jsonl"
+    path.write_text("".join(json.dumps(msg) + "\n" for msg in history), encoding="utf-8")
+
+    with MockOpenAIServer() as server:
+        async def round_trip():
+            async with AsyncNovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url) as client:
+                assert await client.import_conversation(str(path))
+                return await client.get_conversation_history()
+
+        copied = asyncio.run(round_trip())
+
+    assert [(m["role"], m["content"]) for m in reversed(copied)] == [(m["role"], m["content"]) for m in history]
+
+
+def test_pack_refuses_to_cut_a_message(monkeypatch):
+    import pytest
+    from config import Config
+    from nova_client import NovaClient
+
+    monkeypatch.setattr(Config, "THREAD_MESSAGE_MAX_CHARS", 100)
+    messages = [{"role": "user", "content": "x" * 200}] + [{"role": "assistant", "content": "ok"}] * 4
+    with pytest.raises(ValueError):
+        NovaClient._pack_messages(messages, 3)
@@ -0,0 +1,18 @@
+import time
+from mock_openai_server import MockOpenAIServer, MockSettings
+from nova_client import NovaClient
+
+
+def test_results_finished_when_closed_are_handed_to_on_close():
+    with MockOpenAIServer(MockSettings(latency=0.05)) as server:
+        client = NovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url)
+        saved = []
+        results = client.send_many([f"prompt {index}" for index in range(4)], max_workers=4,
+                                   ordered=False, on_close=saved.append)
+        first = next(results)
+        time.sleep(0.5)
+        results.close()
+
+    indexes = {first["index"]} | {result["index"] for result in saved}
+    assert indexes == {0, 1, 2, 3}
+    assert all(result["error"] is None for result in saved)
@@ -0,0 +1,95 @@
+import threading
+import time
+from nova_cache import SingleFlight
+
+
+def wait_for_follower(flights, key):
+    for _ in range(200):
+        flight = flights._flights.get(key)
+        if flight is not None and flight.followers:
+            return
+        time.sleep(0.01)
+    raise AssertionError("follower never joined")
+
+
+def test_follower_receives_full_stream_when_leader_closes_early():
+    flights = SingleFlight()
+    resume = threading.Event()
+    closed = []
+
+    def upstream():
+        try:
+            yield "a"
+            resume.wait(2)
+            yield "b"
+            yield "c"
+        finally:
+            closed.append(True)
+
+    leader = flights.stream("key", upstream)
+    assert next(leader) == "a"
+
+    received = []
+    follower = threading.Thread(target=lambda: received.extend(flights.stream("key", upstream)))
+    follower.start()
+    wait_for_follower(flights, "key")
+    leader.close()
+    resume.set()
+    follower.join(2)
+
+    assert "".join(received) == "abc"
+    assert closed == [True]
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_abandoned_stream_without_followers_is_closed():
+    flights = SingleFlight()
+    closed = []
+
+    def upstream():
+        try:
+            yield "a"
+            yield "b"
+        finally:
+            closed.append(True)
+
+    leader = flights.stream("key", upstream)
+    next(leader)
+    leader.close()
+    assert closed == [True]
+    assert flights.stats()["in_flight"] == 0
+
+
+class Interrupted(BaseException):
+    pass
+
+
+def test_follower_retries_when_leader_abandons_before_first_item():
+    flights = SingleFlight()
+
+    def leader_upstream():
+        wait_for_follower(flights, "key")
+        raise Interrupted()
+        yield
+
+    def follower_upstream():
+        yield "own"
+        yield " reply"
+
+    received = []
+    follower = threading.Thread(target=lambda: received.extend(flights.stream("key", follower_upstream)))
+
+    def lead():
+        try:
+            list(flights.stream("key", leader_upstream))
+        except Interrupted:
+            pass
+
+    leader = threading.Thread(target=lead)
+    leader.start()
+    while "key" not in flights._flights:
+        time.sleep(0.001)
+    follower.start()
+    leader.join(2)
+    follower.join(2)
+    assert "".join(received) == "own reply"
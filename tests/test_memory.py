@@ -0,0 +1,44 @@
+import threading
+from nova_memory import ChatMemory
+
+
+def test_summarizer_runs_without_holding_the_lock():
+    started, release = threading.Event(), threading.Event()
+
+    def summarizer(summary, turns):
+        started.set()
+        release.wait(2)
+        return "summary of %d turns" % len(turns)
+
+    memory = ChatMemory(token_budget=100, strategy="summarize", summarizer=summarizer)
+    for index in range(4):
+        memory.add("user", "x" * 80 + str(index))
+    adder = threading.Thread(target=memory.add, args=("assistant", "y" * 80))
+    adder.start()
+    assert started.wait(2)
+
+    # Other readers and writers proceed while the summary is being made
+    reader = threading.Thread(target=lambda: (memory.messages(), memory.add("user", "hi")))
+    reader.start()
+    reader.join(1)
+    assert not reader.is_alive()
+
+    release.set()
+    adder.join(2)
+    assert memory.summary.startswith("summary of")
+    assert memory.tokens <= memory.token_budget
+    assert memory.messages()[-1] == {"role": "user", "content": "hi"}
+
+
+def test_summary_is_discarded_when_history_is_cleared_meanwhile():
+    memory = ChatMemory(token_budget=100, strategy="summarize")
+
+    def summarizer(summary, turns):
+        memory.clear()
+        return "stale"
+
+    memory.summarizer = summarizer
+    for index in range(5):
+        memory.add("user", "x" * 80 + str(index))
+    assert memory.summary == ""
+    assert memory.stats()["summaries"] == 0
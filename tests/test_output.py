@@ -0,0 +1,53 @@
+import json
+from nova_output import StreamingPayloadParser, parse_payload
+
+PAYLOAD = json.dumps({"messages": [{"message": "Hello there"}, {"message": "Say \"hi\""}], "cta": "Reply now"})
+
+
+def feed_in_pieces(text, size):
+    parser = StreamingPayloadParser()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events
+
+
+def test_fenced_payload_in_small_deltas_is_parsed():
+    text = f"```json\n{PAYLOAD}\n```"
+    for size in (1, 2):
+        parser, events = feed_in_pieces(text, size)
+        assert parser.is_structured is True
+        assert parser.close() == json.loads(PAYLOAD)
+        assert [kind for kind, _ in events] == ["message", "message", "cta"]
+
+
+def test_lone_backtick_reply_is_plain_text():
+    parser, _ = feed_in_pieces("`code` sample", 1)
+    assert parser.is_structured is False
+    assert parser.close() is None
+
+
+def test_split_at_every_offset_matches_parse_payload():
+    texts = [
+        PAYLOAD,
+        f"```json\n{PAYLOAD}\n```",
+        PAYLOAD + " trailing text",
+        PAYLOAD + "}",
+        f"```json\n{PAYLOAD}\n```\nanything else?",
+        PAYLOAD[:-5],
+        "Plain text reply",
+    ]
+    for text in texts:
+        expected = parse_payload(text)
+        for offset in range(len(text) + 1):
+            parser = StreamingPayloadParser()
+            parser.feed(text[:offset])
+            parser.feed(text[offset:])
+            assert (parser.close(), parser.errors) == expected, (text, offset)
+
+
+def test_null_or_empty_cta_is_accepted():
+    for cta in (None, ""):
+        payload, errors = parse_payload(json.dumps({"messages": [{"message": "Hi"}], "cta": cta}))
+        assert errors == []
+        assert payload["cta"] == cta
@@ -0,0 +1,22 @@
+from mock_openai_server import MockOpenAIServer
+from nova_cache import ResponseCache
+from nova_client import NovaClient
+
+
+def test_complete_streamed_reply_is_cached():
+    with MockOpenAIServer() as server:
+        client = NovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url,
+                            response_cache=ResponseCache())
+        first = "".join(client.stream_message("Launch email", use_assistant=False))
+        second = "".join(client.stream_message("Launch email", use_assistant=False))
+        counts = dict(server.state.request_counts)
+    assert first == second
+    assert counts["POST /chat/completions"] == 1
+
+
+def test_truncated_or_empty_replies_are_not_cached():
+    assert NovaClient._cacheable("Hello", "stop")
+    assert not NovaClient._cacheable("Hel", "length")
+    assert not NovaClient._cacheable("Hel", None)
+    assert not NovaClient._cacheable("  \n", "stop")
+    assert not NovaClient._cacheable(None, "stop")
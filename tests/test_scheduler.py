@@ -0,0 +1,161 @@
+import asyncio
+import time
+import httpx
+import pytest
+from nova_scheduler import RequestScheduler, TokenBucket
+from nova_transport import AsyncSchedulingTransport, SchedulingTransport
+
+
+def test_bucket_waits_for_refill():
+    bucket = TokenBucket(60, burst_seconds=1)
+    now = bucket._updated
+    bucket.take(1, now)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == 0.0
+
+
+def test_bucket_allows_oversized_take_when_full():
+    bucket = TokenBucket(60, burst_seconds=1)
+    now = bucket._updated
+    assert bucket.wait_time(5, now) == 0.0
+    bucket.take(5, now)
+    assert bucket.wait_time(1, now) == pytest.approx(5.0)
+
+
+def test_disabled_bucket_never_waits():
+    bucket = TokenBucket(0)
+    bucket.take(100, now=0.0)
+    assert bucket.wait_time(100, now=0.0) == 0.0
+
+
+def test_retry_delay_honours_retry_after_within_limits():
+    scheduler = RequestScheduler(backoff_base=0.5, retry_after_max=10)
+    delay = scheduler.retry_delay(0, retry_after=1.0, time_left=5.0)
+    assert 1.0 <= delay <= 1.25
+
+
+def test_retry_delay_skips_retry_past_time_left_or_maximum():
+    scheduler = RequestScheduler(retry_after_max=10)
+    assert scheduler.retry_delay(0, retry_after=2.0, time_left=1.0) is None
+    assert scheduler.retry_delay(0, retry_after=30.0) is None
+    assert scheduler.stats()["retries"] == 0
+
+
+def test_retry_delay_caps_backoff_at_time_left():
+    scheduler = RequestScheduler(backoff_base=5, backoff_max=30)
+    for attempt in range(5):
+        assert scheduler.retry_delay(attempt, time_left=0.2) <= 0.2
+
+
+def rate_limited_client(scheduler, retry_after, timeout, calls):
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": retry_after}, json={"error": {}})
+
+    return httpx.Client(transport=SchedulingTransport(httpx.MockTransport(handler), scheduler), timeout=timeout)
+
+
+def test_transport_returns_429_when_retry_after_exceeds_maximum():
+    calls = []
+    scheduler = RequestScheduler(max_retries=4, retry_after_max=2)
+    client = rate_limited_client(scheduler, "5", None, calls)
+    response = client.get("http://test/v1/models")
+    assert response.status_code == 429
+    assert len(calls) == 1
+    assert scheduler.stats()["failures"] == 1
+
+
+def test_transport_times_out_when_retry_after_passes_deadline():
+    calls = []
+    scheduler = RequestScheduler(max_retries=4)
+    client = rate_limited_client(scheduler, "1.5", 1.0, calls)
+    started = time.monotonic()
+    with pytest.raises(httpx.TimeoutException):
+        client.get("http://test/v1/models")
+    assert time.monotonic() - started < 1.0
+    assert len(calls) == 1
+
+
+def test_transport_retries_stay_within_deadline():
+    calls = []
+    scheduler = RequestScheduler(max_retries=10, backoff_base=0.1)
+    client = rate_limited_client(scheduler, "0.3", 1.0, calls)
+    started = time.monotonic()
+    with pytest.raises(httpx.TimeoutException):
+        client.get("http://test/v1/models")
+    assert time.monotonic() - started < 1.1
+    assert 2 <= len(calls) <= 4
+
+
+def test_async_transport_retries_after_429():
+    calls = []
+    scheduler = RequestScheduler(max_retries=4, backoff_base=0.01)
+
+    async def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0.1"}, json={"error": {}})
+        return httpx.Response(200, json={"data": []})
+
+    async def fetch():
+        transport = AsyncSchedulingTransport(httpx.MockTransport(handler), scheduler)
+        async with httpx.AsyncClient(transport=transport, timeout=5.0) as client:
+            return await client.get("http://test/v1/models")
+
+    response = asyncio.run(fetch())
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_async_transport_times_out_when_retry_after_passes_deadline():
+    calls = []
+    scheduler = RequestScheduler(max_retries=4)
+
+    async def handler(request):
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "1.5"}, json={"error": {}})
+
+    async def fetch():
+        transport = AsyncSchedulingTransport(httpx.MockTransport(handler), scheduler)
+        async with httpx.AsyncClient(transport=transport, timeout=1.0) as client:
+            await client.get("http://test/v1/models")
+
+    with pytest.raises(httpx.TimeoutException):
+        asyncio.run(fetch())
+    assert len(calls) == 1
+
+
+def test_async_client_shares_the_process_scheduler():
+    from async_nova_client import AsyncNovaClient
+    from nova_scheduler import process_scheduler
+
+    client = AsyncNovaClient(api_key="sk-test", assistant_id="asst_test")
+    assert client.scheduler is process_scheduler
+    assert client.new_conversation().scheduler is process_scheduler
+    assert client.client.max_retries == 0
+    asyncio.run(client.close())
+
+
+def test_rate_limited_assistant_request_returns_timeout_result(monkeypatch):
+    from mock_openai_server import MockOpenAIServer, MockSettings
+    from nova_client import Deadline, NovaClient, TimeoutResult
+
+    monkeypatch.setattr(Deadline.__init__, "__defaults__", (1.0,))
+    with MockOpenAIServer(MockSettings(rate_limit_rate=1.0, retry_after=1.5)) as server:
+        client = NovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url,
+                            scheduler=RequestScheduler(max_retries=4))
+        started = time.monotonic()
+        result = client.send_message("hello")
+        elapsed = time.monotonic() - started
+    assert isinstance(result, TimeoutResult)
+    assert elapsed < 1.5
+
+
+def test_assistant_deadline_is_not_a_client_wide_timeout():
+    from config import Config
+    from nova_client import NovaClient
+
+    client = NovaClient(api_key="test", assistant_id="asst_test", base_url="http://127.0.0.1:9/v1")
+    timeout = client.client.timeout
+    assert (timeout.read if isinstance(timeout, httpx.Timeout) else timeout) > Config.TIMEOUT
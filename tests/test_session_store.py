@@ -0,0 +1,33 @@
+import sqlite3
+from session_store import SQLiteSessionStore
+
+PAYLOAD = {"messages": [{"message": "Hi there"}], "cta": "Reply today"}
+
+
+def test_payload_round_trips():
+    store = SQLiteSessionStore(":memory:")
+    session_id = store.create_session("owner", [
+        {"role": "user", "content": "Write a message", "timestamp": "10:00"},
+        {"role": "assistant", "content": "{...}", "timestamp": "10:01", "payload": PAYLOAD}
+    ])
+    store.append_message(session_id, {"role": "assistant", "content": "{...}", "timestamp": "10:02",
+                                      "payload": PAYLOAD})
+
+    messages = store.load_messages(session_id)
+    assert "payload" not in messages[0]
+    assert messages[1]["payload"] == PAYLOAD
+    assert messages[2]["payload"] == PAYLOAD
+
+
+def test_existing_database_gains_payload_column(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    db = sqlite3.connect(path)
+    db.execute("CREATE TABLE messages (session_id TEXT NOT NULL, seq INTEGER NOT NULL, role TEXT NOT NULL, "
+               "content TEXT NOT NULL, timestamp TEXT, PRIMARY KEY (session_id, seq))")
+    db.commit()
+    db.close()
+
+    store = SQLiteSessionStore(path)
+    session_id = store.create_session("owner", [{"role": "assistant", "content": "{...}", "payload": PAYLOAD}])
+    assert store.load_messages(session_id)[0]["payload"] == PAYLOAD
+    store.close()
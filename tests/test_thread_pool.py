@@ -0,0 +1,25 @@
+from mock_openai_server import MockOpenAIServer
+from nova_client import NovaClient
+
+
+def test_clients_create_no_spare_threads_by_default():
+    with MockOpenAIServer() as server:
+        client = NovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url)
+        for _ in range(3):
+            client.session().send_message("hi")
+        counts = dict(server.state.request_counts)
+    assert client.thread_pool is None
+    assert counts["POST /threads"] == 3
+
+
+def test_pool_is_opt_in():
+    with MockOpenAIServer() as server:
+        client = NovaClient(api_key="test", assistant_id="asst_test", base_url=server.base_url, thread_pool_size=2)
+        assert client.thread_pool.fill(timeout=5) == 2
+        session = client.session()
+        session.send_message("hi")
+        client.thread_pool.close()
+        counts = dict(server.state.request_counts)
+    assert session.thread_id is not None
+    assert client.thread_pool.stats()["hits"] == 1
+    assert counts["DELETE /threads/{thread}"] >= 1